@@ -29,8 +29,9 @@ def build():
     # 定义需要排除的模块
     excludes = [
         'tkinter', 'unittest', 'email', 'html', 'http', 'xml',
-        'pydoc', 'doctest', 'argparse', 'datetime', 'zipfile',
-        'pickle', 'calendar'
+        'pydoc', 'doctest', 'argparse', 'zipfile',
+        'calendar'
+        # 不能排除 pickle：生成代理视频的子进程（multiprocessing）需要它
     ]
     
     # 添加一些其他可以安全排除的模块
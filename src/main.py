@@ -1,12 +1,14 @@
 import sys
 import logging
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QObject, Qt
-from PySide6.QtGui import QIcon
-from PySide6.QtMultimedia import QMediaPlayer
-from window import MainWindow
-import os
-import qtawesome as qta
+from utils.perf import startup_timer
+
+# 启动计时从导入界面模块之前开始
+startup = startup_timer()
+
+from utils.startup_profile import StartupProfile
+from utils.single_instance import parse_command, send_command
+
+profile, app_argv = StartupProfile.from_argv(sys.argv)
 
 # 配置日志
 logging.basicConfig(
@@ -14,32 +16,203 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# 已有实例在运行时只转发命令，不导入任何界面模块
+if __name__ == '__main__':
+    # 打包后生成代理视频的子进程从这里进入并直接退出
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    command = parse_command(app_argv)
+    reply = send_command(command)
+    if reply is not None:
+        print(reply)
+        startup.mark('forward_command')
+        logging.getLogger('Application').info(
+            f'Forwarded "{command}" to the running instance, exiting after {startup.elapsed_ms():.0f} ms'
+        )
+        sys.exit(0)
+    if command == 'status':
+        print('not running')
+        sys.exit(1)
+
+profile.start()
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, Qt, QEvent, QTimer
+from PySide6.QtGui import QIcon
+from screensaver.manager import ScreenSaverManager
+from widgets.tray import TrayIcon
+from utils.single_instance import InstanceServer
+from utils.config import Config
+from utils.style import StyleManager
+import time
+import os
+import qtawesome as qta
+
+startup.mark('imports')
+
+# 只显示托盘图标启动的命令行参数
+OPTION_MINIMIZED = '--minimized'
+
 class Application(QApplication):
     def __init__(self, argv):
         super().__init__(argv)
         self.logger = logging.getLogger('Application')
-        
-        # 初始化多媒体系统
-        try:
-            # 创建一个临时的 QMediaPlayer 来初始化多媒体系统
-            self._player = QMediaPlayer()
-            self.logger.info('Multimedia system initialized')
-        except Exception as e:
-            self.logger.error(f'Failed to initialize multimedia system: {e}')
-        
+        self.startup = startup
+        self.startup.mark('qapplication')
+
+        with self.startup.phase('config'):
+            self.config = Config()
+        with self.startup.phase('style_manager'):
+            StyleManager()
+
         # 设置应用程序属性
         self.setQuitOnLastWindowClosed(False)
-        
-        # 创建主窗口
-        self.window = MainWindow()
-        self.window.setWindowFlags(
-            Qt.Window |
-            Qt.FramelessWindowHint
-        )
-        
-        self.window.show()
+
+        # 监听之后启动的实例转发过来的命令；与另一个实例同时启动、对方已先开始监听时，
+        # 把命令转发给对方，不再创建托盘和计时
+        self.forwarded_reply = None
+        self.instance_server = InstanceServer(self.handle_command, self)
+        if not self.instance_server.listen() and self.instance_server.secondary:
+            self.forwarded_reply = send_command(parse_command(argv)) or ''
+            return
+
+        # 托盘、标题栏关闭按钮等所有退出方式都会经过 aboutToQuit
+        self.aboutToQuit.connect(self.on_about_to_quit)
+
+        # 计时和托盘由应用持有，主窗口按需创建
+        self.window = None
+        with self.startup.phase('manager'):
+            self.manager = ScreenSaverManager(self)
+        with self.startup.phase('tray'):
+            self.init_tray()
+
+        # 恢复上次未完成的计时
+        if self.config.get('session.resume', True):
+            QTimer.singleShot(0, self.manager.resume_session)
+
+        # 第一个实例也执行命令行中的 start/stop
+        command = parse_command(argv)
+        if command in ('start', 'stop'):
+            QTimer.singleShot(0, lambda: self.handle_command(command))
+
+        if OPTION_MINIMIZED in argv or self.config.get('window.start_minimized', False):
+            # 只有托盘图标，没有需要等待的首次绘制
+            QTimer.singleShot(0, self.on_startup_finished)
+        else:
+            self.show_main_window()
+        self.startup.mark('init')
         self.logger.info('Application started')
 
+    def init_tray(self):
+        """初始化系统托盘"""
+        self.tray = TrayIcon(self)
+        self.tray.clicked.connect(self.toggle_main_window)
+        self.tray.showRequested.connect(self.show_main_window)
+        self.tray.toggleRequested.connect(self.toggle_timer)
+        self.tray.settingsRequested.connect(self.show_settings)
+        self.tray.quitRequested.connect(self.quit_application)
+        self.manager.running_changed.connect(self.tray.set_running)
+        self.tray.show()
+
+    def ensure_main_window(self):
+        """第一次使用时创建主窗口"""
+        if self.window is None:
+            started = time.perf_counter()
+            from window import MainWindow
+            self.window = MainWindow(self.tray)
+            self.window.setWindowFlags(
+                Qt.Window |
+                Qt.FramelessWindowHint
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.startup.add('main_window', elapsed_ms)
+            self.logger.info(f'Main window created in {elapsed_ms:.0f} ms')
+
+            # 第一次绘制完成后再处理非必需的初始化
+            if not profile.finished:
+                self.window.installEventFilter(self)
+        return self.window
+
+    def show_main_window(self):
+        window = self.ensure_main_window()
+        window.show_from_tray()
+        window.raise_()
+
+    def toggle_main_window(self):
+        """单击托盘图标时显示或隐藏主窗口"""
+        if self.window is not None and self.window.isVisible():
+            self.window.hide()
+        else:
+            self.show_main_window()
+
+    def show_settings(self):
+        self.ensure_main_window().show_settings()
+
+    def toggle_timer(self):
+        if self.manager.is_running():
+            self.manager.stop()
+        else:
+            self.manager.start()
+
+    def quit_application(self):
+        """退出应用程序"""
+        if self.window is not None:
+            self.window.can_close = True
+            self.window.close()
+        self.quit()
+
+    def on_about_to_quit(self):
+        """退出前停止后台任务"""
+        self.manager.shutdown()
+        # 不依赖 multiprocessing 的 atexit 结束代理生成进程，避免留下未完成的文件
+        from media.proxy import stop_proxy_transcoder
+        stop_proxy_transcoder()
+        from media.library import close_media_library
+        close_media_library()
+
+    def handle_command(self, command):
+        """处理其他实例转发的命令"""
+        if command == 'show':
+            self.show_main_window()
+        elif command == 'start':
+            if not self.manager.is_running():
+                self.manager.start()
+        elif command == 'stop':
+            if self.manager.is_running():
+                self.manager.stop()
+        return self.manager.status()
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QEvent.Paint:
+            self.window.removeEventFilter(self)
+            # 等本次绘制结束、事件队列空闲时再执行
+            QTimer.singleShot(0, self.on_startup_finished)
+        return super().eventFilter(obj, event)
+
+    def on_startup_finished(self):
+        """主窗口第一次绘制完成（仅托盘启动时为托盘显示完成）"""
+        self.startup.mark('first_paint' if self.window is not None else 'ready')
+        self.logger.info(self.startup.summary())
+
+        # 只有使用视频屏保时才初始化多媒体后端，图片用户不需要承担这部分开销
+        if self.config.get('screensaver.media_type', 'image') == 'video':
+            QTimer.singleShot(0, self.warm_up_multimedia)
+        else:
+            profile.finish(self.startup)
+
+    def warm_up_multimedia(self):
+        """空闲时预热多媒体后端，单独记为一个启动阶段"""
+        from screensaver.screen_saver import warm_up_multimedia
+        elapsed_ms = warm_up_multimedia()
+        if elapsed_ms:
+            self.startup.add('multimedia_warmup', elapsed_ms)
+            self.logger.info(f'Multimedia system initialized in {elapsed_ms:.0f} ms')
+        profile.finish(self.startup)
+
 if __name__ == '__main__':
-    app = Application(sys.argv)
-    sys.exit(app.exec())
\ No newline at end of file
+    app = Application(app_argv)
+    if app.forwarded_reply is not None:
+        print(app.forwarded_reply)
+        sys.exit(0)
+    sys.exit(app.exec())
@@ -0,0 +1,5 @@
+from .thumbnails import ThumbnailLoader, thumbnail_loader
+
+# media.library（SQLite 媒体库）只在打开媒体库时导入，不在这里导出
+
+__all__ = ['ThumbnailLoader', 'thumbnail_loader']
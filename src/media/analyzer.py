@@ -0,0 +1,115 @@
+from utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+# 每个视频采样的帧数（也是胶片条的格数）
+SAMPLE_COUNT = 12
+# 相邻采样位置间隔小于该帧数时顺序 grab，比重新跳转更快
+SEQUENTIAL_GAP = 48
+# 胶片条每格的高度
+FILMSTRIP_HEIGHT = 90
+# 评分前缩小到的尺寸，评分只看整体分布，不需要细节
+SCORE_SIZE = (64, 36)
+# 直方图级数，用于计算信息熵
+ENTROPY_BINS = 32
+
+
+def sample_positions(frame_count, count=SAMPLE_COUNT):
+    """在视频中均匀取 count 个位置，取每段的中点，避开开头和结尾的淡入淡出"""
+    if frame_count <= 0:
+        return [0]
+    count = max(1, min(count, frame_count))
+    step = frame_count / count
+    return [int(step * (i + 0.5)) for i in range(count)]
+
+
+def sample_frames(path, max_width, max_height, count=SAMPLE_COUNT):
+    """采样视频帧并缩小到 max_width x max_height 范围内
+
+    跳转后解码器从前一个关键帧开始解码，每个位置最多解码一个 GOP；
+    间隔很近的位置改为顺序 grab。中间帧只 grab 不 retrieve，省去颜色转换
+
+    Returns:
+        list: BGR 帧（numpy 数组），无法打开时为空
+    """
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            return []
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        # 下一次 grab 得到的帧序号
+        current = 0
+        frames = []
+        for position in sample_positions(frame_count, count):
+            if position < current or position - current > SEQUENTIAL_GAP:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, position)
+                current = position
+            while current < position and capture.grab():
+                current += 1
+            if not capture.grab():
+                break
+            current += 1
+            ok, frame = capture.retrieve()
+            if not ok or frame is None:
+                continue
+            height, width = frame.shape[:2]
+            scale = min(max_width / width, max_height / height, 1.0)
+            if scale < 1.0:
+                size = (max(1, int(width * scale)), max(1, int(height * scale)))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            frames.append(frame)
+        return frames
+    finally:
+        capture.release()
+
+
+def score_frames(frames):
+    """按亮度、对比度和信息熵为帧评分，所有帧一次向量化计算
+
+    Returns:
+        numpy 数组，分数越高越适合作为封面
+    """
+    gray = np.stack([
+        cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), SCORE_SIZE, interpolation=cv2.INTER_AREA)
+        for frame in frames
+    ]).reshape(len(frames), -1)
+    values = gray.astype(np.float32) / 255
+    brightness = values.mean(axis=1)
+    contrast = np.clip(values.std(axis=1) / 0.25, 0, 1)
+
+    # 每帧的直方图错开 ENTROPY_BINS 个位置，一次 bincount 得到所有帧的直方图
+    bins = (gray.astype(np.int64) * ENTROPY_BINS) // 256
+    bins += np.arange(len(frames))[:, None] * ENTROPY_BINS
+    hist = np.bincount(bins.ravel(), minlength=len(frames) * ENTROPY_BINS)
+    hist = hist.reshape(len(frames), ENTROPY_BINS) / gray.shape[1]
+    logs = np.log2(hist, out=np.zeros_like(hist), where=hist > 0)
+    entropy = -(hist * logs).sum(axis=1) / np.log2(ENTROPY_BINS)
+
+    # 黑场、白场和淡入淡出的帧曝光分很低，内容再丰富也不会被选中
+    exposure = np.clip(1 - np.abs(brightness - 0.45) / 0.45, 0, 1)
+    return exposure * (0.4 * contrast + 0.6 * entropy)
+
+
+def build_filmstrip(frames, height=FILMSTRIP_HEIGHT):
+    """把采样帧按时间顺序横向拼接成胶片条"""
+    cells = []
+    for frame in frames:
+        frame_height, frame_width = frame.shape[:2]
+        width = max(1, round(frame_width * height / frame_height))
+        cells.append(cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA))
+    return np.hstack(cells)
+
+
+def analyze_video(path, max_width, max_height, count=SAMPLE_COUNT):
+    """采样并评分，选出封面帧并生成胶片条
+
+    Returns:
+        (poster, filmstrip, frames): 封面和胶片条为 BGR 数组，frames 为胶片条格数；
+        无法读取时返回 None
+    """
+    frames = sample_frames(path, max_width, max_height, count)
+    if not frames:
+        return None
+    poster = frames[int(np.argmax(score_frames(frames)))]
+    return poster, build_filmstrip(frames), len(frames)
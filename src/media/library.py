@@ -0,0 +1,403 @@
+import os
+import time
+import threading
+import sqlite3
+import logging
+from PySide6.QtCore import (
+    QObject, QRunnable, QThreadPool, QFileSystemWatcher, QTimer, QSize,
+    QByteArray, QBuffer, QIODevice, Signal
+)
+from PySide6.QtGui import QImage, QImageReader
+from utils.config import Config
+from utils.lazy import lazy_import
+from utils.paths import data_dir
+from media.thumbnails import VIDEO_EXTENSIONS, is_video, read_image, read_video_preview
+from media.phash import HashIndex, media_hash, to_signed, to_unsigned, DEFAULT_DISTANCE
+
+cv2 = lazy_import('cv2')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.apng')
+MEDIA_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS
+
+# 网格中缩略图的尺寸
+GRID_THUMBNAIL_SIZE = QSize(160, 90)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    duration REAL,
+    codec TEXT,
+    phash INTEGER,
+    thumbnail BLOB
+);
+CREATE INDEX IF NOT EXISTS media_folder ON media(folder);
+CREATE INDEX IF NOT EXISTS media_name ON media(name COLLATE NOCASE);
+"""
+
+# 旧版本数据库缺少的列
+MIGRATIONS = (
+    ('phash', 'ALTER TABLE media ADD COLUMN phash INTEGER'),
+)
+
+# 列表只查询这些列，缩略图按需单独读取
+ROW_COLUMNS = 'id, path, name, kind, width, height, duration, codec'
+
+
+def connect(path):
+    """打开数据库，每个线程使用自己的连接"""
+    db = sqlite3.connect(path, timeout=10)
+    # WAL 模式下后台扫描写入时界面仍然可以读取
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    return db
+
+
+def probe_image(path):
+    """读取图片尺寸（只读文件头，不解码）"""
+    reader = QImageReader(path)
+    size = reader.size()
+    codec = bytes(reader.format()).decode('ascii', errors='replace')
+    if not size.isValid():
+        return None
+    return size.width(), size.height(), None, codec
+
+
+def probe_video(path):
+    """读取视频尺寸、时长和编码"""
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            return None
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+    finally:
+        capture.release()
+    duration = frames / fps if fps > 0 and frames > 0 else None
+    codec = ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip('\0 ')
+    return width, height, duration, codec or None
+
+
+def encode_image(image, fmt='JPG', quality=85):
+    """把 QImage 编码为字节"""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt, quality)
+    buffer.close()
+    return bytes(data)
+
+
+def scan_folder(db, folder, stop=None):
+    """增量扫描文件夹：只探测新增或修改过的文件，删除已经不存在的记录
+
+    stop 被设置时提交已经扫描的部分后立即返回（不删除记录，下次扫描继续）
+
+    Returns:
+        (新增或更新的数量, 删除的数量)
+    """
+    known = dict(db.execute('SELECT path, mtime FROM media WHERE folder = ?', (folder,)))
+    seen = set()
+    updated = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if stop is not None and stop.is_set():
+                db.commit()
+                return updated, 0
+            if os.path.splitext(name)[1].lower() not in MEDIA_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(path)
+            if known.get(path) == mtime:
+                continue
+
+            kind = 'video' if is_video(path) else 'image'
+            info = probe_video(path) if kind == 'video' else probe_image(path)
+            if info is None:
+                continue
+            width, height, duration, codec = info
+            phash = media_hash(path)
+            if phash is not None:
+                phash = to_signed(phash)
+            # 文件改变后清空缩略图，下次显示时重新生成
+            db.execute(
+                'INSERT INTO media (path, folder, name, kind, mtime, width, height, duration, codec, phash) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime, width = excluded.width, '
+                'height = excluded.height, duration = excluded.duration, codec = excluded.codec, '
+                'phash = excluded.phash, thumbnail = NULL',
+                (path, folder, name, kind, mtime, width, height, duration, codec, phash)
+            )
+            updated += 1
+
+    removed = [(path,) for path in known if path not in seen]
+    db.executemany('DELETE FROM media WHERE path = ?', removed)
+    db.commit()
+    return updated, len(removed)
+
+
+def build_grid_thumbnail(path, size=GRID_THUMBNAIL_SIZE):
+    """生成网格缩略图，视频使用评分选出的封面"""
+    if is_video(path):
+        image, _ = read_video_preview(path, size)
+        return image
+    return read_image(path, size)
+
+
+class _ScanTask(QRunnable):
+    def __init__(self, library, folders):
+        super().__init__()
+        self.library = library
+        self.folders = folders
+
+    def run(self):
+        db = connect(self.library.db_path)
+        try:
+            for folder in self.folders:
+                if self.library.stopping.is_set():
+                    break
+                started = time.perf_counter()
+                try:
+                    updated, removed = scan_folder(db, folder, self.library.stopping)
+                except (OSError, sqlite3.Error) as e:
+                    self.library.logger.error(f'Error scanning {folder}: {e}')
+                    continue
+                self.library.logger.info(
+                    f'Scanned {folder}: {updated} updated, {removed} removed '
+                    f'in {(time.perf_counter() - started) * 1000:.0f} ms'
+                )
+                self.library._scanned.emit(folder, updated + removed)
+        finally:
+            db.close()
+            self.library._scan_finished.emit()
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, library, media_id, path):
+        super().__init__()
+        self.library = library
+        self.media_id = media_id
+        self.path = path
+
+    def run(self):
+        image = QImage()
+        db = connect(self.library.db_path)
+        try:
+            row = db.execute('SELECT thumbnail FROM media WHERE id = ?', (self.media_id,)).fetchone()
+            if row and row[0]:
+                image.loadFromData(row[0])
+            else:
+                built = build_grid_thumbnail(self.path)
+                if built is not None:
+                    image = built
+                    db.execute(
+                        'UPDATE media SET thumbnail = ? WHERE id = ?',
+                        (encode_image(image), self.media_id)
+                    )
+                    db.commit()
+        except Exception as e:
+            self.library.logger.error(f'Error loading thumbnail for {self.path}: {e}')
+        finally:
+            db.close()
+        self.library._thumbnail_loaded.emit(self.media_id, image)
+
+
+class MediaLibrary(QObject):
+    """
+    媒体库
+    文件信息和缩略图保存在 SQLite 中，文件夹在后台线程增量扫描（只探测修改过的文件），
+    QFileSystemWatcher 发现变化后只重新扫描对应的文件夹；
+    界面线程只做分页查询，缩略图按需在后台读取或生成；
+    导入文件时用感知哈希的多索引查找已有的相似文件
+    """
+    changed = Signal()
+    thumbnail_ready = Signal(int, QImage)
+    _scanned = Signal(str, int)
+    _scan_finished = Signal()
+    _thumbnail_loaded = Signal(int, QImage)
+
+    def __init__(self, db_path=None, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('MediaLibrary')
+        self.db_path = db_path or os.path.join(data_dir(), 'media_library.db')
+        self.db = connect(self.db_path)
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute('PRAGMA table_info(media)')}
+        for column, statement in MIGRATIONS:
+            if column not in columns:
+                self.db.execute(statement)
+        self.db.commit()
+        # 相似文件查询用的哈希索引，第一次查询时建立，媒体库改变后重建
+        self.hash_index = None
+
+        # 扫描和缩略图各用一个线程，扫描大文件夹时缩略图仍然可以加载
+        self.scan_pool = QThreadPool(self)
+        self.scan_pool.setMaxThreadCount(1)
+        self.thumbnail_pool = QThreadPool(self)
+        self.thumbnail_pool.setMaxThreadCount(1)
+        self.pending_thumbnails = set()
+        # 退出时通知后台扫描尽快结束
+        self.stopping = threading.Event()
+        # 一次扫描中各文件夹的变化合并为一次 changed，扫描期间网格不会反复重置
+        self._scan_changes = False
+
+        self.folders = []
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self._dirty = set()
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(500)
+        self._rescan_timer.timeout.connect(self._rescan_dirty)
+
+        self._scanned.connect(self._on_scanned)
+        self._scan_finished.connect(self._on_scan_finished)
+        self._thumbnail_loaded.connect(self._on_thumbnail_loaded)
+
+    def set_folders(self, folders):
+        """设置媒体库文件夹，移除的文件夹的记录会被删除，之后在后台扫描"""
+        folders = [os.path.abspath(os.path.expanduser(f)) for f in folders]
+        removed = [f for f in self.folders if f not in folders]
+        if removed:
+            self.db.executemany('DELETE FROM media WHERE folder = ?', [(f,) for f in removed])
+            self.db.commit()
+            self.hash_index = None
+            self.changed.emit()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.folders = folders
+        self.rescan()
+
+    def rescan(self, folders=None):
+        folders = [f for f in (folders or self.folders) if os.path.isdir(f)]
+        if folders:
+            self.scan_pool.start(_ScanTask(self, folders))
+
+    def count(self):
+        return self.db.execute('SELECT COUNT(*) FROM media').fetchone()[0]
+
+    def fetch(self, offset, limit):
+        """按名称分页查询，不读取缩略图"""
+        return self.db.execute(
+            f'SELECT {ROW_COLUMNS} FROM media ORDER BY name COLLATE NOCASE, id LIMIT ? OFFSET ?',
+            (limit, offset)
+        ).fetchall()
+
+    def find_similar(self, path, max_distance=DEFAULT_DISTANCE, kind=None):
+        """查找媒体库中与 path 相似的其他文件
+
+        在调用线程上计算 path 的哈希，首次调用还会从数据库建立哈希索引；
+        kind 为 'image' 或 'video' 时只返回同类文件
+
+        Returns:
+            [(距离, 路径)]，按距离从小到大排序；无法读取文件时为空
+        """
+        value = media_hash(path)
+        if value is None:
+            return []
+        if self.hash_index is None:
+            started = time.perf_counter()
+            self.hash_index = HashIndex()
+            for media_path, phash in self.db.execute(
+                'SELECT path, phash FROM media WHERE phash IS NOT NULL'
+            ):
+                self.hash_index.add(to_unsigned(phash), media_path)
+            self.logger.debug(
+                f'Built hash index with {len(self.hash_index)} entries '
+                f'in {(time.perf_counter() - started) * 1000:.0f} ms'
+            )
+        path = os.path.abspath(path)
+        return [
+            (distance, media_path)
+            for distance, media_path in self.hash_index.search(value, max_distance)
+            if os.path.abspath(media_path) != path
+            and (kind is None or is_video(media_path) == (kind == 'video'))
+        ]
+
+    def request_thumbnail(self, media_id, path):
+        """在后台读取或生成缩略图，完成后发出 thumbnail_ready"""
+        if media_id not in self.pending_thumbnails:
+            self.pending_thumbnails.add(media_id)
+            self.thumbnail_pool.start(_ThumbnailTask(self, media_id, path))
+
+    def cancel_thumbnails(self):
+        """取消还没开始的缩略图任务（例如视图快速滚动后）"""
+        self.thumbnail_pool.clear()
+        self.pending_thumbnails.clear()
+
+    def _watch(self, folder):
+        """监听文件夹及其子文件夹"""
+        paths = [root for root, _, _ in os.walk(folder)]
+        watched = set(self.watcher.directories())
+        paths = [p for p in paths if p not in watched]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def _on_scanned(self, folder, changes):
+        if folder in self.folders:
+            self._watch(folder)
+        if changes:
+            self.hash_index = None
+            self._scan_changes = True
+
+    def _on_scan_finished(self):
+        if self._scan_changes:
+            self._scan_changes = False
+            self.changed.emit()
+
+    def _on_directory_changed(self, path):
+        # 复制大量文件时会连续触发，合并后再扫描
+        for folder in self.folders:
+            if path == folder or path.startswith(folder + os.sep):
+                self._dirty.add(folder)
+        self._rescan_timer.start()
+
+    def _rescan_dirty(self):
+        folders, self._dirty = list(self._dirty), set()
+        self.rescan(folders)
+
+    def _on_thumbnail_loaded(self, media_id, image):
+        self.pending_thumbnails.discard(media_id)
+        self.thumbnail_ready.emit(media_id, image)
+
+    def close(self):
+        """停止后台扫描和缩略图任务并关闭数据库（应用退出时调用）"""
+        self.stopping.set()
+        self.scan_pool.clear()
+        self.thumbnail_pool.clear()
+        self.scan_pool.waitForDone()
+        self.thumbnail_pool.waitForDone()
+        self.db.close()
+
+
+_library = None
+
+
+def media_library():
+    """获取共享的媒体库，第一次调用时按配置开始扫描"""
+    global _library
+    if _library is None:
+        _library = MediaLibrary()
+        _library.set_folders(Config().get('media_library.folders', []) or [])
+    return _library
+
+
+def close_media_library():
+    """应用退出时关闭媒体库（没有打开过时什么也不做）"""
+    global _library
+    if _library is not None:
+        _library.close()
+        _library = None
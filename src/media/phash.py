@@ -0,0 +1,121 @@
+from itertools import combinations
+from utils.lazy import lazy_import
+from media.analyzer import sample_frames
+from media.thumbnails import is_video
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+# 汉明距离不超过该值视为相似（64 位 dHash）
+DEFAULT_DISTANCE = 6
+# 灰度标准差低于该值的画面（纯色、黑场）没有可比较的细节，不计算哈希
+MIN_DETAIL = 2.0
+
+
+def dhash(gray):
+    """计算 64 位 dHash：缩小到 9x8 后比较相邻像素的亮度"""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def read_gray(path):
+    """读取缩小的灰度图，JPEG 在解码时直接缩小到 1/8
+
+    用 imdecode 读取字节，Windows 下中文路径也能打开
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+    if data.size == 0:
+        return None
+    return cv2.imdecode(data, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+
+
+def media_hash(path):
+    """计算图片或视频（取中间一帧）的感知哈希，无法读取时返回 None"""
+    try:
+        if is_video(path):
+            frames = sample_frames(path, 256, 256, count=1)
+            gray = cv2.cvtColor(frames[0], cv2.COLOR_BGR2GRAY) if frames else None
+        else:
+            gray = read_gray(path)
+    except (OSError, cv2.error):
+        return None
+    if gray is None or gray.std() < MIN_DETAIL:
+        return None
+    return dhash(gray)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def to_signed(value):
+    """64 位哈希转换为 SQLite INTEGER 可以保存的有符号整数"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class HashIndex:
+    """
+    多索引汉明距离查找
+    64 位哈希拆成 4 段 16 位分别建立索引。两个哈希距离不超过 r 时，
+    至少有一段的距离不超过 r // 4（鸽巢原理），只需要在每段中查找
+    很少几个相邻的键，再对候选逐个计算距离
+    """
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self):
+        self.values = []
+        self.items = []
+        self.tables = [{} for _ in range(self.CHUNKS)]
+
+    def _chunks(self, value):
+        mask = (1 << self.CHUNK_BITS) - 1
+        return [(value >> (i * self.CHUNK_BITS)) & mask for i in range(self.CHUNKS)]
+
+    def _neighbors(self, chunk, radius):
+        """与 chunk 距离不超过 radius 的所有键"""
+        yield chunk
+        for count in range(1, radius + 1):
+            for bits in combinations(range(self.CHUNK_BITS), count):
+                flipped = chunk
+                for bit in bits:
+                    flipped ^= 1 << bit
+                yield flipped
+
+    def add(self, value, item):
+        """添加哈希，item 为对应的数据（例如文件路径）"""
+        index = len(self.values)
+        self.values.append(value)
+        self.items.append(item)
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            table.setdefault(chunk, []).append(index)
+
+    def search(self, value, max_distance=DEFAULT_DISTANCE):
+        """查找距离不超过 max_distance 的条目
+
+        Returns:
+            [(距离, item)]，按距离从小到大排序
+        """
+        radius = max_distance // self.CHUNKS
+        candidates = set()
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            for key in self._neighbors(chunk, radius):
+                bucket = table.get(key)
+                if bucket:
+                    candidates.update(bucket)
+
+        results = []
+        for index in candidates:
+            distance = hamming(value, self.values[index])
+            if distance <= max_distance:
+                results.append((distance, self.items[index]))
+        results.sort(key=lambda result: result[0])
+        return results
+
+    def __len__(self):
+        return len(self.values)
@@ -0,0 +1,216 @@
+import os
+import hashlib
+import logging
+import multiprocessing
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QGuiApplication
+from utils.config import Config
+from utils.lazy import lazy_import
+from utils.paths import cache_dir
+
+cv2 = lazy_import('cv2')
+
+# 尺寸和帧率超过目标这么多时才需要代理，避免为几乎相同的视频重新编码
+TOLERANCE = 1.1
+# cv2.VideoWriter 在各平台的 OpenCV 发行包中都可用的编码
+PROXY_FOURCC = 'mp4v'
+
+
+def proxy_target():
+    """代理视频的最大尺寸（主屏幕的设备像素）和最大帧率"""
+    config = Config()
+    screen = QGuiApplication.primaryScreen()
+    dpr = screen.devicePixelRatio()
+    size = screen.size()
+    width, height = round(size.width() * dpr), round(size.height() * dpr)
+    return width, height, float(config.get('screensaver.proxy_max_fps', 30))
+
+
+def proxy_key(path, max_width, max_height, max_fps):
+    """代理文件的缓存键，源文件修改或屏幕尺寸改变后自动失效"""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    raw = f'{path}|{mtime}|{max_width}x{max_height}@{max_fps:g}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def proxy_paths(path, max_width, max_height, max_fps):
+    """(代理文件路径, 不需要代理时写入的标记文件路径)"""
+    key = proxy_key(path, max_width, max_height, max_fps)
+    directory = cache_dir('proxies')
+    return os.path.join(directory, f'{key}.mp4'), os.path.join(directory, f'{key}.skip')
+
+
+def playback_path(path):
+    """播放时使用的文件：已生成代理时返回代理，否则返回原文件"""
+    if not Config().get('screensaver.proxy_enabled', True):
+        return path
+    try:
+        proxy, _ = proxy_paths(path, *proxy_target())
+    except OSError:
+        return path
+    return proxy if os.path.exists(proxy) else path
+
+
+def part_path(output):
+    """生成过程中写入的临时文件；VideoWriter 按扩展名选择容器格式，保留 .mp4 结尾"""
+    return output[:-len('.mp4')] + '.part.mp4'
+
+
+def transcode(path, output, marker, max_width, max_height, max_fps):
+    """在子进程中生成代理：缩放到屏幕范围内，丢弃超过最大帧率的帧
+
+    不需要代理时只写入标记文件，之后不再检查。只导入 cv2，不创建任何 Qt 对象
+
+    Returns:
+        int: 0 成功或不需要代理，1 失败
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        return 1
+    width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or max_fps
+    if width <= 0 or height <= 0:
+        capture.release()
+        return 1
+
+    scale = min(max_width / width, max_height / height, 1.0)
+    out_fps = min(fps, max_fps)
+    if scale * TOLERANCE >= 1.0 and fps <= max_fps * TOLERANCE:
+        capture.release()
+        open(marker, 'w').close()
+        return 0
+
+    # 编码器要求偶数尺寸
+    size = (max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2))
+    temp = part_path(output)
+    writer = cv2.VideoWriter(temp, cv2.VideoWriter_fourcc(*PROXY_FOURCC), out_fps, size)
+    if not writer.isOpened():
+        capture.release()
+        return 1
+    try:
+        index = 0
+        written = 0
+        while capture.grab():
+            # 输出帧按时间对齐到输入帧，多余的帧只 grab 不解码颜色
+            if int(index * out_fps / fps) >= written:
+                ok, frame = capture.retrieve()
+                if ok:
+                    writer.write(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+                    written += 1
+            index += 1
+    finally:
+        capture.release()
+        writer.release()
+    if written == 0:
+        os.remove(temp)
+        return 1
+    # 写完之后再改名，播放时不会读到写了一半的文件
+    os.replace(temp, output)
+    return 0
+
+
+def _transcode_process(*args):
+    raise SystemExit(transcode(*args))
+
+
+class ProxyTranscoder(QObject):
+    """
+    代理视频生成
+    为超过屏幕尺寸或帧率的视频在后台进程中生成播放用的代理文件，
+    编码不占用界面进程的 GIL，休息时播放代理可以大幅降低 CPU 占用；
+    同一时间只运行一个进程，其余请求排队
+    """
+    proxy_ready = Signal(str, str)  # 源文件, 实际播放的文件
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('ProxyTranscoder')
+        self.queue = []
+        self.process = None
+        self.current = None
+        self.current_output = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(500)
+        self.poll_timer.timeout.connect(self._poll)
+
+    def request(self, path):
+        """需要时在后台生成代理，已生成或已确认不需要时立即发出 proxy_ready"""
+        if not Config().get('screensaver.proxy_enabled', True):
+            return
+        try:
+            target = proxy_target()
+            proxy, marker = proxy_paths(path, *target)
+        except OSError:
+            return
+        if os.path.exists(proxy) or os.path.exists(marker):
+            self.proxy_ready.emit(path, playback_path(path))
+            return
+        if path == self.current or any(item[0] == path for item in self.queue):
+            return
+        self.queue.append((path, proxy, marker, target))
+        self._start_next()
+
+    def _start_next(self):
+        if self.process is not None or not self.queue:
+            return
+        path, proxy, marker, target = self.queue.pop(0)
+        # spawn 在各平台行为一致，子进程不继承界面进程的线程和 Qt 状态
+        context = multiprocessing.get_context('spawn')
+        self.process = context.Process(
+            target=_transcode_process, args=(path, proxy, marker, *target),
+            name='proxy-transcode', daemon=True
+        )
+        self.process.start()
+        self.current = path
+        self.current_output = proxy
+        self.logger.info(f'Transcoding proxy for {path} (max {target[0]}x{target[1]}@{target[2]:g})')
+        self.poll_timer.start()
+
+    def _poll(self):
+        if self.process is None or self.process.is_alive():
+            return
+        self.poll_timer.stop()
+        path, code = self.current, self.process.exitcode
+        self.process = None
+        self.current = None
+        self.current_output = None
+        if code == 0:
+            self.proxy_ready.emit(path, playback_path(path))
+        else:
+            self.logger.error(f'Proxy transcoding failed for {path} (exit code {code})')
+        self._start_next()
+
+    def stop(self):
+        """退出时结束正在运行的进程并删除未完成的 .part.mp4 文件"""
+        self.queue.clear()
+        self.poll_timer.stop()
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+            try:
+                os.remove(part_path(self.current_output))
+            except OSError:
+                pass
+            self.logger.info(f'Stopped proxy transcoding for {self.current}')
+        self.process = None
+        self.current = None
+        self.current_output = None
+
+
+_transcoder = None
+
+
+def proxy_transcoder():
+    """获取共享的代理生成器"""
+    global _transcoder
+    if _transcoder is None:
+        _transcoder = ProxyTranscoder()
+    return _transcoder
+
+
+def stop_proxy_transcoder():
+    """应用退出时停止后台生成（没有创建过生成器时什么也不做）"""
+    if _transcoder is not None:
+        _transcoder.stop()
@@ -0,0 +1,205 @@
+import os
+import hashlib
+import logging
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Signal
+from PySide6.QtGui import QImage, QImageReader
+from utils.lazy import lazy_import
+from utils.paths import cache_dir
+from media.analyzer import analyze_video
+
+cv2 = lazy_import('cv2')
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.webm')
+
+# 缩略图的最大尺寸（保持比例缩放到该范围内）
+THUMBNAIL_SIZE = QSize(480, 270)
+
+
+def is_video(path):
+    return os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS
+
+
+def cache_key(path, size):
+    """缓存键由路径、修改时间和尺寸组成，文件被修改后自动失效"""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    raw = f'{path}|{mtime}|{size.width()}x{size.height()}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def fit_size(width, height, size):
+    """按比例缩放到 size 范围内（不放大）"""
+    scale = min(size.width() / width, size.height() / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def frame_to_image(frame):
+    """把 BGR 帧转换为 QImage（调用方负责先缩小帧）"""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width = rgb.shape[:2]
+    # QImage 不持有 numpy 内存，copy() 之后才能离开当前作用域
+    return QImage(rgb.data, width, height, rgb.strides[0], QImage.Format_RGB888).copy()
+
+
+def read_video_preview(path, size):
+    """读取视频封面和胶片条，封面从均匀采样的帧中按画面质量选出
+
+    Returns:
+        (poster, filmstrip)，无法读取时为 (None, None)
+    """
+    result = analyze_video(path, size.width(), size.height())
+    if result is None:
+        return None, None
+    poster, strip, frames = result
+    filmstrip = frame_to_image(strip)
+    # 格数写入 PNG 的文本块，从磁盘缓存读取时据此切分
+    filmstrip.setText('frames', str(frames))
+    return frame_to_image(poster), filmstrip
+
+
+def filmstrip_frames(filmstrip):
+    """胶片条的格数"""
+    try:
+        return max(1, int(filmstrip.text('frames')))
+    except ValueError:
+        return 1
+
+
+def read_image(path, size):
+    """读取图片，解码时直接缩小（JPEG 等格式不需要解码完整分辨率）"""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    original = reader.size()
+    if original.isValid():
+        reader.setScaledSize(QSize(*fit_size(original.width(), original.height(), size)))
+    image = reader.read()
+    return None if image.isNull() else image
+
+
+def load_cached(cache_path):
+    if os.path.exists(cache_path):
+        image = QImage(cache_path)
+        if not image.isNull():
+            return image
+    return None
+
+
+def save_cached(image, cache_path):
+    if image is not None and not image.save(cache_path):
+        logging.getLogger('ThumbnailLoader').warning(f'Error caching thumbnail: {cache_path}')
+
+
+def build_thumbnail(path, size=THUMBNAIL_SIZE):
+    """生成缩略图（视频还会生成用于拖动预览的胶片条），优先使用磁盘缓存
+
+    Returns:
+        (image, filmstrip)，图片没有胶片条，无法读取的部分为 None
+    """
+    try:
+        key = cache_key(path, size)
+    except OSError:
+        return None, None
+    cache_path = os.path.join(cache_dir('thumbnails'), f'{key}.png')
+    if not is_video(path):
+        image = load_cached(cache_path)
+        if image is None:
+            image = read_image(path, size)
+            save_cached(image, cache_path)
+        return image, None
+
+    filmstrip_path = os.path.join(cache_dir('filmstrips'), f'{key}.png')
+    image = load_cached(cache_path)
+    filmstrip = load_cached(filmstrip_path)
+    if image is None or filmstrip is None:
+        image, filmstrip = read_video_preview(path, size)
+        save_cached(image, cache_path)
+        save_cached(filmstrip, filmstrip_path)
+    return image, filmstrip
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, loader, path, size):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+        self.size = size
+
+    def run(self):
+        try:
+            image, filmstrip = build_thumbnail(self.path, self.size)
+        except Exception as e:
+            self.loader.logger.error(f'Error building thumbnail for {self.path}: {e}')
+            image, filmstrip = None, None
+        self.loader._finished.emit(
+            self.path,
+            image if image is not None else QImage(),
+            filmstrip if filmstrip is not None else QImage()
+        )
+
+
+class ThumbnailLoader(QObject):
+    """
+    缩略图加载器
+    在线程池中解码和缩小，结果写入磁盘缓存并保留在内存中；
+    视频同时生成胶片条，通过 filmstrip() 获取。同一文件正在加载时不会重复提交
+    """
+    thumbnail_ready = Signal(str, QImage)
+    _finished = Signal(str, QImage, QImage)
+
+    def __init__(self, size=THUMBNAIL_SIZE, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('ThumbnailLoader')
+        self.size = size
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.memory = {}
+        self.filmstrips = {}
+        self.pending = set()
+        self._finished.connect(self._on_finished)
+
+    def request(self, path):
+        """请求缩略图，已缓存时立即返回 QImage，否则返回 None 并在完成后发出 thumbnail_ready"""
+        try:
+            key = cache_key(path, self.size)
+        except OSError:
+            return None
+        image = self.memory.get(key)
+        if image is not None:
+            return image
+        if path not in self.pending:
+            self.pending.add(path)
+            self.pool.start(_ThumbnailTask(self, path, self.size))
+        return None
+
+    def filmstrip(self, path):
+        """已加载的视频胶片条，没有时返回 None"""
+        try:
+            return self.filmstrips.get(cache_key(path, self.size))
+        except OSError:
+            return None
+
+    def _on_finished(self, path, image, filmstrip):
+        self.pending.discard(path)
+        if image.isNull():
+            self.logger.warning(f'No thumbnail for {path}')
+        else:
+            try:
+                key = cache_key(path, self.size)
+            except OSError:
+                key = None
+            if key is not None:
+                self.memory[key] = image
+                if not filmstrip.isNull():
+                    self.filmstrips[key] = filmstrip
+        self.thumbnail_ready.emit(path, image)
+
+
+_loader = None
+
+
+def thumbnail_loader():
+    """获取共享的缩略图加载器"""
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader
@@ -0,0 +1,3 @@
+from .journal import SessionJournal
+
+__all__ = ['SessionJournal']
@@ -0,0 +1,409 @@
+import os
+import re
+import time
+import heapq
+import bisect
+import logging
+from datetime import datetime, timedelta, timezone
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+_DURATION_RE = re.compile(
+    r'^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+
+# ---- iCalendar 解析 ----
+
+def _unfold(text):
+    """展开 iCalendar 的折行"""
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (' ', '\t') and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    return lines
+
+
+def _split_property(line):
+    """把一行拆分为 (名称, 参数字典, 值)"""
+    in_quotes = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ':' and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None, {}, ''
+
+    parts = head.split(';')
+    params = {}
+    for part in parts[1:]:
+        key, _, val = part.partition('=')
+        params[key.upper()] = val.strip('"')
+    return parts[0].upper(), params, value
+
+
+def _parse_datetime(value, params):
+    """解析日期时间，返回 (datetime, 是否全天)"""
+    value = value.strip()
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        d = datetime.strptime(value[:8], '%Y%m%d')
+        return d, True
+
+    if value.endswith('Z'):
+        dt = datetime.strptime(value[:15], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc)
+        return dt, False
+
+    dt = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    tzid = params.get('TZID')
+    if tzid and ZoneInfo is not None:
+        try:
+            dt = dt.replace(tzinfo=ZoneInfo(tzid))
+        except Exception:
+            pass  # 未知时区按本地时间处理
+    return dt, False
+
+
+def _parse_duration(value):
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        return None
+    parts = {k: int(v) for k, v in match.groupdict().items() if v and k != 'sign'}
+    delta = timedelta(**parts)
+    return -delta if match.group('sign') == '-' else delta
+
+
+def _parse_rrule(value):
+    """解析重复规则，INTERVAL / COUNT / UNTIL 格式错误时抛出 ValueError"""
+    rule = {}
+    for part in value.split(';'):
+        key, _, val = part.partition('=')
+        rule[key.upper()] = val
+    for key in ('INTERVAL', 'COUNT'):
+        if key in rule:
+            int(rule[key])
+    if 'UNTIL' in rule:
+        _parse_datetime(rule['UNTIL'], {})
+    return rule
+
+
+def parse_events(text):
+    """解析 iCalendar 文本中的忙碌事件
+
+    跳过全天事件、透明（TRANSP:TRANSPARENT）事件和已取消的事件；
+    日期格式错误的事件记录日志后跳过，不影响同一文件中的其他事件
+    """
+    events = []
+    current = None
+    for line in _unfold(text):
+        name, params, value = _split_property(line)
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            current = {'exdates': set()}
+        elif name == 'END' and value.upper() == 'VEVENT':
+            if current is not None and not current.get('invalid'):
+                events.append(current)
+            current = None
+        elif current is None or current.get('invalid'):
+            continue
+        else:
+            try:
+                _parse_property(current, name, params, value)
+            except ValueError as e:
+                logging.getLogger('BusyCalendar').warning(f'Skipping event with invalid {name}: {e}')
+                current['invalid'] = True
+
+    busy = []
+    overrides = {}
+    for event in events:
+        if 'start' not in event or event.get('all_day'):
+            continue
+        if event.get('transp', '').upper() == 'TRANSPARENT':
+            continue
+        if 'end' in event:
+            try:
+                event['duration'] = event['end'] - event['start']
+            except TypeError:
+                # DTSTART 和 DTEND 一个带时区一个不带
+                logging.getLogger('BusyCalendar').warning(
+                    f'Skipping event with mismatched DTSTART/DTEND: {event.get("uid")}'
+                )
+                continue
+        if not event.get('duration') or event['duration'] <= timedelta(0):
+            continue
+        if 'recurrence_id' in event:
+            overrides.setdefault(event.get('uid'), set()).add(event['recurrence_id'])
+        busy.append(event)
+
+    # 被单独修改过的重复事件实例从主事件中排除
+    for event in busy:
+        if 'rrule' in event and event.get('uid') in overrides:
+            event['exdates'] |= overrides[event['uid']]
+
+    return [event for event in busy if event.get('status', '').upper() != 'CANCELLED']
+
+
+def _parse_property(current, name, params, value):
+    """把 VEVENT 中的一个属性写入事件字典，格式错误时抛出 ValueError"""
+    if name == 'DTSTART':
+        current['start'], current['all_day'] = _parse_datetime(value, params)
+    elif name == 'DTEND':
+        current['end'], _ = _parse_datetime(value, params)
+    elif name == 'DURATION':
+        current['duration'] = _parse_duration(value)
+    elif name == 'RRULE':
+        current['rrule'] = _parse_rrule(value)
+    elif name == 'EXDATE':
+        for item in value.split(','):
+            current['exdates'].add(_parse_datetime(item, params)[0])
+    elif name == 'RECURRENCE-ID':
+        current['recurrence_id'] = _parse_datetime(value, params)[0]
+    elif name in ('UID', 'TRANSP', 'STATUS'):
+        current[name.lower()] = value.strip()
+
+
+def _timestamp(dt):
+    return dt.timestamp()
+
+
+def _occurrences(event, window_start, window_end):
+    """展开事件在时间窗口内的所有实例
+
+    DAILY / WEEKLY 直接计算窗口内第一个实例的位置，
+    多年前开始的重复事件也不需要从头遍历
+    """
+    start = event['start']
+    duration = event['duration']
+    rrule = event.get('rrule')
+
+    if not rrule:
+        if _timestamp(start + duration) > window_start and _timestamp(start) < window_end:
+            yield start
+        return
+
+    freq = rrule.get('FREQ', '').upper()
+    interval = max(1, int(rrule.get('INTERVAL', 1)))
+    count = int(rrule['COUNT']) if 'COUNT' in rrule else None
+    until = _parse_datetime(rrule['UNTIL'], {})[0] if 'UNTIL' in rrule else None
+    if until is not None and start.tzinfo is not None and until.tzinfo is None:
+        until = until.replace(tzinfo=start.tzinfo)
+    elif until is not None and start.tzinfo is None and until.tzinfo is not None:
+        until = until.astimezone().replace(tzinfo=None)
+    exdates = event['exdates']
+
+    def emit(occurrence):
+        if occurrence in exdates:
+            return False
+        return _timestamp(occurrence + duration) > window_start
+
+    # 窗口开始时间对应的本地时间（用于计算跳过的周期数）
+    first = datetime.fromtimestamp(window_start - duration.total_seconds(), start.tzinfo)
+    if start.tzinfo is None:
+        first = first.replace(tzinfo=None)
+
+    if freq == 'DAILY':
+        step = timedelta(days=interval)
+        index = max(0, (first - start) // step)
+        while True:
+            if count is not None and index >= count:
+                return
+            occurrence = start + step * index
+            if (until is not None and occurrence > until) or _timestamp(occurrence) >= window_end:
+                return
+            if emit(occurrence):
+                yield occurrence
+            index += 1
+
+    elif freq == 'WEEKLY':
+        weekdays = sorted(_WEEKDAYS[d[-2:]] for d in rrule.get('BYDAY', '').split(',')
+                          if d[-2:] in _WEEKDAYS) or [start.weekday()]
+        week_start = start - timedelta(days=start.weekday())
+        step = timedelta(weeks=interval)
+        skipped_first_week = sum(1 for d in weekdays if d < start.weekday())
+        week = max(0, (first - week_start) // step)
+        index = week * len(weekdays) - (skipped_first_week if week > 0 else 0)
+        while True:
+            base = week_start + step * week
+            for weekday in weekdays:
+                occurrence = base + timedelta(days=weekday)
+                if occurrence < start:
+                    continue
+                if count is not None and index >= count:
+                    return
+                if (until is not None and occurrence > until) or _timestamp(occurrence) >= window_end:
+                    return
+                index += 1
+                if emit(occurrence):
+                    yield occurrence
+            week += 1
+
+    elif freq in ('MONTHLY', 'YEARLY'):
+        months = interval if freq == 'MONTHLY' else interval * 12
+        period = 0
+        index = 0
+        while True:
+            if count is not None and index >= count:
+                return
+            month = start.month - 1 + months * period
+            period += 1
+            try:
+                occurrence = start.replace(year=start.year + month // 12, month=month % 12 + 1)
+            except ValueError:
+                # 目标月份没有这一天（例如 2 月 30 日），按 RFC 5545 跳过且不计数
+                continue
+            if (until is not None and occurrence > until) or _timestamp(occurrence) >= window_end:
+                return
+            index += 1
+            if emit(occurrence):
+                yield occurrence
+
+
+def expand_events(events, window_start, window_end):
+    """把事件展开为窗口内按开始时间排序的 (开始, 结束) 时间戳列表"""
+    intervals = []
+    for event in events:
+        seconds = event['duration'].total_seconds()
+        try:
+            occurrences = list(_occurrences(event, window_start, window_end))
+        except (ValueError, TypeError, OverflowError) as e:
+            # 单个事件无法展开时跳过，不影响其他事件
+            logging.getLogger('BusyCalendar').warning(f'Skipping event {event.get("uid")}: {e}')
+            continue
+        for occurrence in occurrences:
+            begin = _timestamp(occurrence)
+            intervals.append((begin, begin + seconds))
+    intervals.sort()
+    return intervals
+
+
+# ---- 忙碌时间索引 ----
+
+class BusyIndex:
+    """
+    忙碌区间索引
+    区间合并为互不重叠的有序数组，重叠查询通过二分查找完成，复杂度 O(log n)
+    """
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for begin, end in intervals:
+            if self.ends and begin <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(begin)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def busy_until(self, begin, end):
+        """[begin, end) 与忙碌区间重叠时返回该忙碌区间的结束时间，否则返回 None"""
+        i = bisect.bisect_right(self.ends, begin)
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.ends[i]
+        return None
+
+
+class BusyCalendar(QObject):
+    """
+    基于本地 .ics 文件的忙碌日历
+    只在第一次查询时解析文件，重复事件只展开滚动窗口内的实例；
+    文件改变时只重新解析该文件
+    """
+    def __init__(self, paths, window_days=7, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('BusyCalendar')
+        self.paths = [os.path.abspath(os.path.expanduser(p)) for p in paths]
+        self.window_days = window_days
+
+        self._events = {}       # path -> (mtime, 已解析的事件)
+        self._intervals = {}    # path -> 窗口内的忙碌区间
+        self._index = None
+        self._window = (0, 0)
+
+        self._pending = set()
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(500)
+        self._reload_timer.timeout.connect(self._reload_pending)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+
+    def busy_until(self, begin, duration):
+        """检查从 begin 开始、持续 duration 秒的休息是否与日程冲突
+
+        Returns:
+            冲突时返回日程结束的时间戳，否则返回 None
+        """
+        self._ensure_index(begin)
+        return self._index.busy_until(begin, begin + duration)
+
+    def _ensure_index(self, now):
+        window_start, window_end = self._window
+        # 超过半个窗口后向前滚动
+        if self._index is not None and now < window_start + (window_end - window_start) / 2:
+            return
+
+        self._window = (now - 86400, now + self.window_days * 86400)
+        started = time.perf_counter()
+        for path in self.paths:
+            self._expand_file(path)
+        self._rebuild_index()
+        self.logger.debug(
+            f'Indexed {len(self._index)} busy intervals '
+            f'in {(time.perf_counter() - started) * 1000:.1f} ms'
+        )
+
+    def _load_file(self, path):
+        """解析文件，文件未改变时使用缓存"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            self._events.pop(path, None)
+            return []
+
+        cached = self._events.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                events = parse_events(f.read())
+        except OSError as e:
+            self.logger.error(f'Error reading calendar {path}: {e}')
+            events = []
+
+        self._events[path] = (mtime, events)
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+        return events
+
+    def _expand_file(self, path):
+        self._intervals[path] = expand_events(self._load_file(path), *self._window)
+
+    def _rebuild_index(self):
+        self._index = BusyIndex(heapq.merge(*self._intervals.values()))
+
+    def _on_file_changed(self, path):
+        # 编辑器保存时经常替换文件，稍后再读取
+        self._pending.add(path)
+        self._reload_timer.start()
+
+    def _reload_pending(self):
+        if self._index is None:
+            self._pending.clear()
+            return
+        for path in self._pending:
+            self._expand_file(path)
+            self.logger.debug(f'Calendar reindexed: {path}')
+        self._pending.clear()
+        self._rebuild_index()
@@ -0,0 +1,356 @@
+import heapq
+import itertools
+import time
+import logging
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# 休息结束事件在堆中使用的名称
+BREAK_END = '__break_end__'
+
+# 冲突处理策略
+POLICY_MERGE = 'merge'        # 合并到当前休息中，休息时长取最大值
+POLICY_DEFER = 'defer'        # 推迟到当前休息结束后
+POLICY_SUPPRESS = 'suppress'  # 跳过本次，等待下一个周期
+POLICIES = (POLICY_MERGE, POLICY_DEFER, POLICY_SUPPRESS)
+
+
+class ReminderRule:
+    """
+    提醒规则
+    interval > 0 时按固定间隔触发；
+    every_cycles > 0 时在 base 规则每触发 every_cycles 次时一起触发（例如每 4 个番茄钟一次长休息）
+    """
+    def __init__(self, name, interval=0, break_duration=0, policy=POLICY_MERGE,
+                 priority=0, every_cycles=0, base=None):
+        self.name = name
+        self.interval = interval                # 触发间隔（秒）
+        self.break_duration = break_duration    # 休息时长（秒）
+        self.policy = policy if policy in POLICIES else POLICY_MERGE
+        self.priority = priority
+        self.every_cycles = every_cycles
+        self.base = base
+
+    @property
+    def is_timed(self):
+        return self.interval > 0
+
+    @classmethod
+    def from_config(cls, data):
+        """从配置字典创建规则
+
+        支持的键：name、interval_minutes、break_minutes、break_seconds、
+        policy、priority、every_cycles、base
+        """
+        interval = data.get('interval_minutes', 0) * 60
+        break_duration = data.get('break_seconds', data.get('break_minutes', 0) * 60)
+        return cls(
+            name=data['name'],
+            interval=interval,
+            break_duration=break_duration,
+            policy=data.get('policy', POLICY_MERGE),
+            priority=data.get('priority', 0),
+            every_cycles=data.get('every_cycles', 0),
+            base=data.get('base'),
+        )
+
+    def __repr__(self):
+        return f'ReminderRule({self.name!r}, interval={self.interval}, break={self.break_duration})'
+
+
+class ReminderEngine(QObject):
+    """
+    提醒调度引擎
+    所有规则的下一次触发时间保存在一个最小堆中，只使用一个 QTimer，
+    每次事件处理后重新设置为堆顶的截止时间，单次调度开销为 O(log N)
+    """
+    break_started = Signal(int, list)  # 休息时长（秒）、触发的规则名称
+    break_finished = Signal()
+    break_postponed = Signal(float)    # 推迟到的时间戳
+    break_extended = Signal(float)     # 休息中合并规则后新的结束时间戳
+
+    def __init__(self, collision_window=60, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('ReminderEngine')
+        self.collision_window = collision_window
+
+        self._rules = {}
+        self._heap = []         # (deadline, seq, name)
+        self._deadlines = {}    # name -> 当前有效的截止时间，堆中不一致的条目视为已失效
+        self._fire_counts = {}
+        self._seq = itertools.count()
+        self._running = False
+
+        self._break_duration = 0
+        # 推迟到本次休息结束后的规则，休息结束时不按"未到期"重置
+        self._deferred = set()
+
+        # 休息前的检查函数 guard(开始时间, 休息秒数)，返回时间戳时休息推迟到该时间
+        self.break_guard = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    # ---- 规则管理 ----
+
+    def set_rules(self, rules):
+        """替换全部规则，正在运行时保留仍然存在的规则的截止时间"""
+        old_rules = self._rules
+        self._rules = {rule.name: rule for rule in rules}
+
+        if not self._running:
+            return
+
+        now = time.time()
+        for name in old_rules:
+            if name not in self._rules:
+                self._deadlines.pop(name, None)
+        for rule in self._rules.values():
+            if rule.is_timed and rule.name not in self._deadlines and not self.in_break:
+                self._schedule(rule.name, now + rule.interval)
+        self._rearm()
+
+    def rules(self):
+        return list(self._rules.values())
+
+    # ---- 运行控制 ----
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def in_break(self):
+        return BREAK_END in self._deadlines
+
+    def start(self):
+        """从当前时间开始调度所有定时规则"""
+        self.stop()
+        self._running = True
+        now = time.time()
+        for rule in self._rules.values():
+            if rule.is_timed:
+                self._schedule(rule.name, now + rule.interval)
+        self._rearm()
+
+    def stop(self):
+        """停止调度并清空所有截止时间"""
+        self._timer.stop()
+        self._heap.clear()
+        self._deadlines.clear()
+        self._fire_counts.clear()
+        self._break_duration = 0
+        self._deferred.clear()
+        self._running = False
+
+    def next_break_deadline(self):
+        """下一次休息开始的时间，没有时返回 None"""
+        deadlines = [d for name, d in self._deadlines.items() if name != BREAK_END]
+        return min(deadlines) if deadlines else None
+
+    def break_deadline(self):
+        """当前休息结束的时间，不在休息中时返回 None"""
+        return self._deadlines.get(BREAK_END)
+
+    # ---- 快照 ----
+
+    def snapshot(self):
+        """导出可以 JSON 序列化的调度状态"""
+        return {
+            'deadlines': dict(self._deadlines),
+            'fire_counts': dict(self._fire_counts),
+            'break_duration': self._break_duration,
+            'deferred': sorted(self._deferred),
+        }
+
+    def restore(self, snapshot):
+        """从快照恢复调度状态
+
+        已经过期的规则截止时间会从当前时间重新计算；
+        休息已经结束时直接回到工作状态
+        """
+        self.stop()
+        self._running = True
+        now = time.time()
+        deadlines = snapshot.get('deadlines', {})
+        self._fire_counts = {
+            name: count for name, count in snapshot.get('fire_counts', {}).items()
+            if name in self._rules
+        }
+
+        break_end = deadlines.get(BREAK_END)
+        resume_break = break_end is not None and break_end > now
+        for rule in self._rules.values():
+            if not rule.is_timed:
+                continue
+            deadline = deadlines.get(rule.name)
+            if deadline is None or deadline <= now:
+                if resume_break:
+                    continue  # 休息结束时会重新调度
+                deadline = now + rule.interval
+            self._schedule(rule.name, deadline)
+
+        if resume_break:
+            self._break_duration = snapshot.get('break_duration', 0)
+            self._deferred = {name for name in snapshot.get('deferred', []) if name in self._rules}
+            self._schedule(BREAK_END, break_end)
+        self._rearm()
+        return resume_break
+
+    # ---- 内部实现 ----
+
+    def _schedule(self, name, deadline):
+        self._deadlines[name] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), name))
+
+    def _peek(self):
+        """丢弃堆顶已失效的条目，返回第一个有效条目"""
+        while self._heap:
+            deadline, _, name = self._heap[0]
+            if self._deadlines.get(name) == deadline:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, until):
+        """弹出所有截止时间不晚于 until 的有效条目"""
+        due = []
+        while True:
+            entry = self._peek()
+            if entry is None or entry[0] > until:
+                return due
+            heapq.heappop(self._heap)
+            del self._deadlines[entry[2]]
+            due.append(entry)
+
+    def _rearm(self):
+        entry = self._peek()
+        if entry is None:
+            self._timer.stop()
+            return
+        delay = max(0.0, entry[0] - time.time())
+        self._timer.start(int(delay * 1000))
+
+    def _on_timeout(self):
+        now = time.time()
+        due = self._pop_due(now)
+
+        if any(name == BREAK_END for _, _, name in due):
+            self._finish_break(now)
+            # 休息结束时已重新调度的规则不再触发
+            due = [entry for entry in due
+                   if entry[2] != BREAK_END and entry[2] not in self._deadlines]
+
+        if due:
+            if self.in_break:
+                self._resolve_during_break(due, now)
+            else:
+                self._begin_break(due, now)
+        self._rearm()
+
+    def _resolve_during_break(self, due, now):
+        """休息过程中到期的规则按各自的策略处理"""
+        break_end = self._deadlines[BREAK_END]
+        extended = False
+        for _, _, name in due:
+            rule = self._rules.get(name)
+            if rule is None:
+                continue
+            if rule.policy == POLICY_SUPPRESS:
+                self._schedule(name, now + rule.interval)
+            elif rule.policy == POLICY_MERGE and rule.break_duration > self._break_duration:
+                # 合并：延长当前休息
+                extra = rule.break_duration - self._break_duration
+                self._break_duration = rule.break_duration
+                self._schedule(BREAK_END, break_end + extra)
+                break_end += extra
+                extended = True
+                self._count_fire(rule)
+            else:
+                # 推迟到休息结束后（时长足够时会在休息结束时被重置）
+                self._deferred.add(name)
+                self._schedule(name, break_end)
+        if extended:
+            self.logger.info(f'Break extended to {self._break_duration}s')
+            self.break_extended.emit(break_end)
+
+    def _begin_break(self, due, now):
+        """处理到期规则和冲突窗口内的规则，合并为一次休息"""
+        due_rules = [self._rules[name] for _, _, name in due if name in self._rules]
+        if not due_rules:
+            return
+
+        # 同时到期的规则中，优先级最高（其次休息最长）的作为主规则
+        due_rules.sort(key=lambda r: (r.priority, r.break_duration), reverse=True)
+        leader = due_rules[0]
+
+        if self.break_guard is not None:
+            try:
+                until = self.break_guard(now, leader.break_duration)
+            except Exception as e:
+                # 到期规则已经出队，检查失败时按不推迟处理，避免调度停止
+                self.logger.error(f'Break guard failed: {e}')
+                until = None
+            if until is not None and until > now:
+                for rule in due_rules:
+                    self._schedule(rule.name, until)
+                self.logger.info(f'Break postponed by guard: {[r.name for r in due_rules]}')
+                self.break_postponed.emit(until)
+                return
+        fired = [leader]
+        candidates = due_rules[1:] + [
+            self._rules[name] for _, _, name in self._pop_due(now + self.collision_window)
+            if name in self._rules
+        ]
+
+        break_duration = leader.break_duration
+        deferred = []
+        for rule in candidates:
+            if rule.policy == POLICY_MERGE:
+                fired.append(rule)
+                break_duration = max(break_duration, rule.break_duration)
+            elif rule.policy == POLICY_DEFER:
+                deferred.append(rule)
+            else:
+                self._schedule(rule.name, now + rule.interval)
+
+        for rule in list(fired):
+            self._count_fire(rule)
+            # 按周期触发的规则（如长休息）跟随基础规则一起触发
+            for cyclic in self._rules.values():
+                if cyclic.base == rule.name and cyclic.every_cycles > 0 \
+                        and self._fire_counts[rule.name] % cyclic.every_cycles == 0:
+                    fired.append(cyclic)
+                    self._count_fire(cyclic)
+                    break_duration = max(break_duration, cyclic.break_duration)
+
+        self._break_duration = break_duration
+        self._schedule(BREAK_END, now + break_duration)
+        for rule in deferred:
+            self._deferred.add(rule.name)
+            self._schedule(rule.name, now + break_duration)
+
+        names = [rule.name for rule in fired]
+        self.logger.info(f'Break started: {names}, {break_duration}s')
+        self.break_started.emit(int(break_duration), names)
+
+    def _finish_break(self, now):
+        """休息结束，时长不超过本次休息的规则视为已满足，重新开始计时
+
+        推迟的规则与休息结束同时到期，不在此处重置，由调用方接着开始它们的休息
+        """
+        taken = self._break_duration
+        self._break_duration = 0
+        deferred, self._deferred = self._deferred, set()
+        for rule in self._rules.values():
+            if not rule.is_timed:
+                continue
+            if rule.break_duration <= taken:
+                self._schedule(rule.name, now + rule.interval)
+            elif rule.name not in self._deadlines and rule.name not in deferred:
+                self._schedule(rule.name, now + rule.interval)
+        self.logger.info('Break finished')
+        self.break_finished.emit()
+
+    def _count_fire(self, rule):
+        self._fire_counts[rule.name] = self._fire_counts.get(rule.name, 0) + 1
@@ -0,0 +1,261 @@
+import importlib
+import logging
+import os
+import subprocess
+import threading
+import time
+
+# 第三方插件注册钩子使用的 entry point 分组
+ENTRY_POINT_GROUP = 'efficiencytool.hooks'
+
+# 支持的事件
+EVENTS = ('break_start', 'break_end')
+
+
+class HookStats:
+    """单个钩子的执行统计"""
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'dropped': self.dropped,
+            'avg_ms': round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            'max_ms': round(self.max_ms, 2),
+            'last_ms': round(self.last_ms, 2),
+        }
+
+
+class Hook:
+    """
+    休息生命周期钩子
+    command 为 shell 命令；target 为 "模块:函数" 形式的 Python 入口，
+    函数以 (事件名, 上下文字典) 调用
+    """
+    def __init__(self, name, event, command=None, target=None, timeout=5.0):
+        self.name = name
+        self.event = event
+        self.command = command
+        self.target = target
+        self.timeout = timeout
+        self._callable = None
+
+    @classmethod
+    def from_config(cls, event, data):
+        """从配置创建钩子，支持字符串（shell 命令）或字典"""
+        if isinstance(data, str):
+            data = {'command': data}
+        command = data.get('command')
+        target = data.get('entry_point')
+        if not command and not target:
+            raise ValueError('hook requires "command" or "entry_point"')
+        return cls(
+            name=data.get('name') or command or target,
+            event=event,
+            command=command,
+            target=target,
+            timeout=data.get('timeout', 5.0),
+        )
+
+    def resolve(self):
+        """加载 Python 入口函数（在工作线程中调用，避免导入阻塞界面）"""
+        if self._callable is None:
+            if callable(self.target):
+                self._callable = self.target
+            else:
+                module_name, _, attr = self.target.partition(':')
+                obj = importlib.import_module(module_name)
+                for part in attr.split('.') if attr else []:
+                    obj = getattr(obj, part)
+                self._callable = obj
+        return self._callable
+
+    def run(self, context, slots=None):
+        """执行钩子，超时抛出 TimeoutError
+
+        Args:
+            slots: 限制 Python 钩子线程总数的信号量，超时未结束的线程在结束前一直占用名额
+        """
+        if self.command:
+            try:
+                subprocess.run(
+                    self.command,
+                    shell=True,
+                    timeout=self.timeout,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    env=_hook_env(context),
+                    check=True,
+                )
+            except subprocess.TimeoutExpired:
+                raise TimeoutError(f'{self.name} timed out')
+        else:
+            # Python 线程无法强制中止，只能在单独的线程中等待，超时后放弃等待；
+            # 放弃的线程仍占用 slots 名额，卡住的钩子不会无限累积线程
+            if slots is not None and not slots.acquire(timeout=self.timeout):
+                raise TimeoutError(f'{self.name} timed out waiting for a free hook thread')
+            result = {}
+
+            def target():
+                try:
+                    self.resolve()(self.event, dict(context))
+                except Exception as e:
+                    result['error'] = e
+                finally:
+                    if slots is not None:
+                        slots.release()
+
+            worker = threading.Thread(target=target, name=f'hook-{self.name}', daemon=True)
+            worker.start()
+            worker.join(self.timeout)
+            if worker.is_alive():
+                raise TimeoutError(f'{self.name} timed out')
+            if 'error' in result:
+                raise result['error']
+
+
+def _hook_env(context):
+    """把上下文以 EFFICIENCYTOOL_* 环境变量传给 shell 命令"""
+    env = dict(os.environ)
+    for key, value in context.items():
+        env[f'EFFICIENCYTOOL_{key.upper()}'] = str(value)
+    return env
+
+
+class HookRunner:
+    """
+    钩子执行器
+    在有界的线程池中异步执行钩子，调用方（界面线程）只负责提交，永远不会等待钩子完成；
+    排队的任务超过上限时直接丢弃并计入统计
+    """
+    def __init__(self, max_workers=2, max_pending=16):
+        self.logger = logging.getLogger('HookRunner')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._hooks = {event: [] for event in EVENTS}
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Python 钩子线程（包括超时后被放弃、仍在运行的线程）的数量上限
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._pending = 0
+        self._entry_points_loaded = False
+        self._executor = None
+
+    def load(self, config):
+        """从配置加载钩子，已安装插件的 entry points 在第一次触发时于后台线程中加载"""
+        for event in EVENTS:
+            self._hooks[event] = []
+            for data in config.get(f'hooks.{event}', []) or []:
+                try:
+                    self.add(Hook.from_config(event, data))
+                except (ValueError, AttributeError) as e:
+                    self.logger.error(f'Invalid {event} hook {data}: {e}')
+
+    def _load_entry_points(self):
+        """加载插件通过 entry points 注册的钩子（扫描已安装的包较慢，只执行一次）"""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+
+        try:
+            from importlib.metadata import entry_points
+            eps = entry_points()
+            group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, 'select') \
+                else eps.get(ENTRY_POINT_GROUP, [])
+        except Exception as e:
+            self.logger.error(f'Error reading hook entry points: {e}')
+            return
+        # entry point 名称格式为 "<事件>.<名称>"，如 break_start.pause_music
+        for ep in group:
+            event, _, name = ep.name.partition('.')
+            if event in EVENTS:
+                self.add(Hook(name or ep.name, event, target=ep.value))
+
+    def add(self, hook):
+        self._hooks[hook.event].append(hook)
+
+    def has_hooks(self, event=None):
+        if event:
+            return bool(self._hooks.get(event))
+        return any(self._hooks.values())
+
+    def fire(self, event, **context):
+        """异步触发事件对应的所有钩子，立即返回"""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='hook'
+            )
+
+        context = dict(context, event=event, time=time.time())
+        self._executor.submit(self._dispatch, event, context)
+
+    def _dispatch(self, event, context):
+        """在工作线程中展开事件对应的钩子并逐个提交"""
+        self._load_entry_points()
+        for hook in list(self._hooks.get(event) or []):
+            with self._lock:
+                if self._pending >= self.max_pending:
+                    self._stats_for(hook).dropped += 1
+                    self.logger.warning(f'Hook queue full, dropped: {hook.name}')
+                    continue
+                self._pending += 1
+            executor = self._executor
+            try:
+                executor.submit(self._run, hook, context)
+            except (AttributeError, RuntimeError):
+                # 退出时线程池已经关闭，剩余的钩子不再执行
+                return
+
+    def metrics(self):
+        """返回每个钩子的耗时统计"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def shutdown(self, wait=False):
+        """停止线程池并丢弃排队的钩子，默认不等待正在执行的钩子"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _stats_for(self, hook):
+        return self._stats.setdefault(f'{hook.event}:{hook.name}', HookStats())
+
+    def _run(self, hook, context):
+        started = time.perf_counter()
+        error = None
+        try:
+            hook.run(context, self._slots)
+        except Exception as e:
+            error = e
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._pending -= 1
+            stats = self._stats_for(hook)
+            stats.add(elapsed_ms)
+            if isinstance(error, TimeoutError):
+                stats.timeouts += 1
+            elif error is not None:
+                stats.failures += 1
+
+        if error is not None:
+            self.logger.warning(f'Hook {hook.name} failed after {elapsed_ms:.0f} ms: {error}')
+        else:
+            self.logger.debug(f'Hook {hook.name} finished in {elapsed_ms:.0f} ms')
@@ -0,0 +1,95 @@
+import json
+import os
+import time
+import logging
+from utils.paths import data_dir
+
+
+class SessionJournal:
+    """
+    会话日志
+    以追加方式记录计时器的每次状态切换（状态 + 绝对截止时间），
+    程序重启后只读取最后一条记录即可恢复，文件超过阈值时自动压缩
+    """
+    # 恢复时只读取文件末尾的这部分字节
+    TAIL_BYTES = 4096
+
+    def __init__(self, path=None, max_bytes=64 * 1024):
+        self.logger = logging.getLogger('SessionJournal')
+        self.path = path or os.path.join(data_dir(), 'session.journal')
+        self.max_bytes = max_bytes
+        self._seq = 0
+
+        last = self.last_record()
+        if last:
+            self._seq = last.get('seq', 0)
+
+    def record(self, state, deadline=None, **extra):
+        """追加一条状态切换记录
+
+        Args:
+            state: 状态名称（work / break / idle）
+            deadline: 当前状态结束的绝对时间（time.time() 时间戳）
+            extra: 需要一起保存的其他字段
+        """
+        self._seq += 1
+        entry = {
+            'seq': self._seq,
+            'ts': time.time(),
+            'state': state,
+            'deadline': deadline,
+        }
+        entry.update(extra)
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+        try:
+            with open(self.path, 'a+b') as f:
+                # 上次写入中断时补齐换行，避免和残缺记录拼在同一行
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if os.path.getsize(self.path) > self.max_bytes:
+                self.compact(entry)
+        except OSError as e:
+            self.logger.error(f'Error writing session journal: {e}')
+
+    def last_record(self):
+        """读取最后一条完整的记录，不存在或无法解析时返回 None"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - self.TAIL_BYTES))
+                tail = f.read()
+        except OSError:
+            return None
+
+        # 从后往前找第一条可以解析的记录（崩溃时最后一行可能写了一半）
+        for raw in reversed(tail.splitlines()):
+            try:
+                entry = json.loads(raw.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError):
+                continue
+            if isinstance(entry, dict) and 'state' in entry:
+                return entry
+        return None
+
+    def compact(self, entry=None):
+        """压缩日志，只保留最后一条记录"""
+        entry = entry or self.last_record()
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if entry:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.logger.debug('Session journal compacted')
+        except OSError as e:
+            self.logger.error(f'Error compacting session journal: {e}')
@@ -1,5 +1,4 @@
 from .manager import ScreenSaverManager
 from .screen_saver import ScreenSaver
-from .warning_window import WarningWindow
 
-__all__ = ['ScreenSaverManager', 'ScreenSaver', 'WarningWindow'] 
\ No newline at end of file
+__all__ = ['ScreenSaverManager', 'ScreenSaver']
@@ -0,0 +1,355 @@
+import os
+import time
+import logging
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QTimer, QRect, QSize, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPainter, QColor
+from utils.config import Config
+from utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+ANIMATED_EXTENSIONS = ('.gif', '.webp', '.apng')
+# 浏览器对 0~10ms 的帧间隔按 100ms 处理，很多 GIF 依赖这个行为
+MIN_DELAY = 20
+DEFAULT_DELAY = 100
+
+
+def apng_header(path):
+    """读取 APNG 的画布尺寸和帧数（PNG 在第一个 IDAT 之前有 acTL 块时为 APNG）
+
+    Returns:
+        (宽, 高, 帧数)，不是 APNG 时为 None
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read(8) != b'\x89PNG\r\n\x1a\n':
+                return None
+            width = height = 0
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                length, chunk = int.from_bytes(header[:4], 'big'), header[4:]
+                if chunk == b'IHDR':
+                    data = f.read(8)
+                    width, height = int.from_bytes(data[:4], 'big'), int.from_bytes(data[4:], 'big')
+                    f.seek(length - 8 + 4, os.SEEK_CUR)
+                    continue
+                if chunk == b'acTL':
+                    return width, height, int.from_bytes(f.read(4), 'big')
+                if chunk == b'IDAT':
+                    return None
+                f.seek(length + 4, os.SEEK_CUR)
+    except OSError:
+        return None
+
+
+def is_animated(path):
+    """检查文件是否为多帧的 GIF/WebP/APNG（只读取文件头）"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.png', '.apng'):
+        return apng_header(path) is not None
+    if ext in ('.gif', '.webp'):
+        reader = QImageReader(path)
+        return reader.supportsAnimation() and reader.imageCount() != 1
+    return False
+
+
+def frame_delay(delay):
+    return DEFAULT_DELAY if delay < MIN_DELAY else delay
+
+
+def fit_size(size, area):
+    """按比例缩小到 area 范围内；比屏幕小的动画保持原尺寸，绘制时再放大，缓存占用更少"""
+    if size.width() <= area.width() and size.height() <= area.height():
+        return size
+    return size.scaled(area, Qt.KeepAspectRatio)
+
+
+class QtFrameSource:
+    """用 QImageReader 逐帧解码 GIF/WebP，大于屏幕的动画解码时直接缩小"""
+    def __init__(self, path, area):
+        self.path = path
+        self.area = area
+        self.rewind()
+
+    def rewind(self):
+        # GIF 不支持跳转，重新打开文件回到第一帧
+        self.reader = QImageReader(self.path)
+        size = self.reader.size()
+        if size.isValid():
+            self.reader.setScaledSize(fit_size(size, self.area))
+
+    def read(self):
+        """读取下一帧
+
+        Returns:
+            (QImage, 显示时长毫秒)，到结尾时返回 None
+        """
+        image = self.reader.read()
+        if image.isNull():
+            return None
+        return image, frame_delay(self.reader.nextImageDelay())
+
+
+class _DecodeSignals(QObject):
+    finished = Signal(int, list)
+
+
+class _CvDecodeTask(QRunnable):
+    """
+    用 OpenCV 解码 APNG（Qt 的 PNG 插件只能读取第一帧）
+    imreadanimation 按范围读取时每次都从第一帧重新解码，因此一次解码全部帧；
+    超出内存预算时均匀丢帧并把时长合并到保留的帧上。
+    imreadanimation 按原始尺寸解码全部帧，解码前按文件头估算的大小超出预算时只显示第一帧
+    """
+    def __init__(self, signals, generation, path, area, budget):
+        super().__init__()
+        self.signals = signals
+        self.generation = generation
+        self.path = path
+        self.area = area
+        self.budget = budget
+
+    def run(self):
+        frames = []
+        try:
+            header = apng_header(self.path)
+            if header is not None and header[0] * header[1] * 4 * header[2] > self.budget:
+                logging.getLogger('AnimatedImage').info(
+                    f'{os.path.basename(self.path)}: {header[2]} frames of {header[0]} x {header[1]} '
+                    f'exceed the frame cache budget, showing the first frame only'
+                )
+                frames = self._first_frame()
+                self._emit(frames)
+                return
+            ok, animation = cv2.imreadanimation(self.path)
+            # 每次访问 animation.frames 都会复制全部帧，只取一次
+            source_frames = animation.frames if ok else []
+            durations = list(animation.durations) if ok else []
+            if source_frames:
+                height, width = source_frames[0].shape[:2]
+                size = fit_size(QSize(width, height), self.area)
+                frame_bytes = size.width() * size.height() * 4
+                step = max(1, -(-frame_bytes * len(source_frames) // self.budget))
+                for start in range(0, len(source_frames), step):
+                    frame = source_frames[start]
+                    if (frame.shape[1], frame.shape[0]) != (size.width(), size.height()):
+                        frame = cv2.resize(frame, (size.width(), size.height()), interpolation=cv2.INTER_AREA)
+                    if frame.ndim == 2 or frame.shape[2] == 3:
+                        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGRA if frame.ndim == 2 else cv2.COLOR_BGR2BGRA)
+                    # BGRA 在小端内存中与 ARGB32 的布局相同
+                    image = QImage(
+                        frame.data, frame.shape[1], frame.shape[0], frame.strides[0], QImage.Format_ARGB32
+                    ).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+                    delay = sum(frame_delay(int(d)) for d in durations[start:start + step])
+                    frames.append((image, delay))
+        except Exception as e:
+            logging.getLogger('AnimatedImage').error(f'Error decoding {self.path}: {e}')
+        self._emit(frames)
+
+    def _first_frame(self):
+        """用 Qt 的 PNG 插件只读取默认图像，解码时直接缩小到屏幕范围内"""
+        reader = QImageReader(self.path)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(fit_size(size, self.area))
+        image = reader.read()
+        if image.isNull():
+            return []
+        return [(image.convertToFormat(QImage.Format_ARGB32_Premultiplied), DEFAULT_DELAY)]
+
+    def _emit(self, frames):
+        try:
+            self.signals.finished.emit(self.generation, frames)
+        except RuntimeError:
+            # 解码期间屏保已经关闭，结果不再需要
+            pass
+
+
+class AnimatedImage(QWidget):
+    """
+    动画图片播放控件（GIF/WebP/APNG）
+    帧解码时缩小到屏幕范围内；第一遍播放时缓存解码后的帧，整个动画在
+    screensaver.animation_cache_mb 以内时之后的循环不再解码，超出时释放缓存改为逐帧解码。
+    每帧按自身的时长定时，下一帧在当前帧显示后提前解码
+    """
+    failed = Signal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('AnimatedImage')
+        self.path = path
+        self.budget = int(Config().get('screensaver.animation_cache_mb', 64)) * 1024 * 1024
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self.source = None
+        # APNG 在后台解码，停止后完成的旧结果按 generation 丢弃
+        self.decoding = False
+        self.generation = 0
+        # 不设置父对象：控件被删除时后台任务仍持有引用，发出信号时不会访问已删除的对象
+        self.signals = _DecodeSignals()
+        self.signals.finished.connect(self._on_decoded)
+        self.cache = []
+        self.cache_bytes = 0
+        self.caching = False
+        self.cache_complete = False
+        self.index = 0
+        self.image = None
+        self.next_frame = None
+        self.due = None
+        self.late = 0
+        self.frames_shown = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._advance)
+
+    def start(self):
+        self.stop()
+        dpr = self.devicePixelRatioF()
+        area = self.size() if not self.size().isEmpty() else self.screen().size()
+        area = QSize(round(area.width() * dpr), round(area.height() * dpr))
+
+        if os.path.splitext(self.path)[1].lower() in ('.png', '.apng'):
+            self.decoding = True
+            QThreadPool.globalInstance().start(
+                _CvDecodeTask(self.signals, self.generation, self.path, area, self.budget)
+            )
+            return
+
+        self.source = QtFrameSource(self.path, area)
+        self.caching = True
+        self.next_frame = self._read_frame()
+        if self.next_frame is None:
+            self.failed.emit(f'Cannot read {self.path}')
+            return
+        self._advance()
+
+    def stop(self):
+        self.timer.stop()
+        if self.frames_shown:
+            self.logger.info(
+                f'{os.path.basename(self.path)}: frames={self.frames_shown} late={self.late} '
+                f'cached={len(self.cache)} ({self.cache_bytes / 1024 / 1024:.1f} MB)'
+            )
+        self.generation += 1
+        self.decoding = False
+        self.source = None
+        self.cache = []
+        self.cache_bytes = 0
+        self.cache_complete = False
+        self.index = 0
+        self.image = None
+        self.next_frame = None
+        self.due = None
+        self.late = 0
+        self.frames_shown = 0
+
+    def _on_decoded(self, generation, frames):
+        if generation != self.generation:
+            return
+        self.decoding = False
+        if not frames:
+            self.failed.emit(f'Cannot read {self.path}')
+            return
+        if len(frames) == 1:
+            # 只有一帧（或超出预算只解码了第一帧）时静态显示，不启动定时器
+            self.image = frames[0][0]
+            self.frames_shown = 1
+            self.update()
+            return
+        self.cache = frames
+        self.cache_bytes = sum(image.sizeInBytes() for image, _ in frames)
+        self.cache_complete = True
+        self.next_frame = self._read_frame()
+        self._advance()
+
+    def _read_frame(self):
+        """取下一帧：完整缓存时从缓存读取，否则解码（第一遍同时写入缓存）"""
+        if self.cache_complete:
+            frame = self.cache[self.index % len(self.cache)]
+            self.index += 1
+            return frame
+
+        frame = self.source.read()
+        if frame is None:
+            if self.caching and self.cache:
+                # 第一遍播放完毕，整个动画都在预算以内，之后不再解码
+                self.cache_complete = True
+                self.source = None
+                self.index = 0
+                return self._read_frame()
+            self.source.rewind()
+            frame = self.source.read()
+            if frame is None:
+                return None
+
+        image, delay = frame
+        # 转换为绘制最快的格式，没有透明通道的帧绘制前不需要清除背景
+        image = image.convertToFormat(
+            QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32
+        )
+        frame = (image, delay)
+        if self.caching:
+            self.cache_bytes += image.sizeInBytes()
+            if self.cache_bytes > self.budget:
+                self.logger.info(
+                    f'{os.path.basename(self.path)} exceeds the frame cache budget, streaming instead'
+                )
+                self.caching = False
+                self.cache = []
+                self.cache_bytes = 0
+            else:
+                self.cache.append(frame)
+        return frame
+
+    def _advance(self):
+        """显示已经解码好的下一帧，按它的时长安排下一次切换，然后提前解码下一帧"""
+        if self.next_frame is None:
+            return
+        image, delay = self.next_frame
+        self.image = image
+        self.frames_shown += 1
+        self.update(self.image_rect())
+
+        now = time.perf_counter()
+        if self.due is None or now - self.due > delay / 1000:
+            # 第一帧或落后超过一帧时重新计时，不连续追帧
+            if self.due is not None:
+                self.late += 1
+            self.due = now
+        self.due += delay / 1000
+
+        self.next_frame = self._read_frame()
+        self.timer.start(max(0, round((self.due - time.perf_counter()) * 1000)))
+
+    def image_rect(self):
+        """动画按比例缩放到控件范围内居中显示的区域"""
+        if self.image is None:
+            return QRect()
+        size = self.image.size().scaled(self.size(), Qt.KeepAspectRatio)
+        return QRect(
+            (self.width() - size.width()) // 2, (self.height() - size.height()) // 2,
+            size.width(), size.height()
+        )
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        target = self.image_rect()
+        if self.image is None or self.image.hasAlphaChannel() or not target.contains(event.rect()):
+            painter.fillRect(event.rect(), QColor('#000000'))
+        if self.image is not None:
+            painter.drawImage(target, self.image)
+        painter.end()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.image is None and not self.decoding:
+            self.start()
+
+    def hideEvent(self, event):
+        self.stop()
+        super().hideEvent(event)
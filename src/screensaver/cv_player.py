@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+from collections import deque
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QTimer, QRect, QSize, Signal
+from PySide6.QtGui import QImage, QPainter, QColor
+from utils.lazy import lazy_import
+from utils.perf import FrameStats
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+# 环形缓冲的帧数，解码线程最多领先显示这么多帧
+RING_SIZE = 4
+# 读不到帧率时使用的默认值
+DEFAULT_FPS = 25.0
+
+
+class FrameRing:
+    """
+    解码线程和界面线程之间的有界环形缓冲
+    预先分配 count 个显示尺寸的帧缓冲区并循环使用，解码线程写满后等待界面线程归还，
+    播放期间不再分配帧内存
+    """
+    def __init__(self, count, width, height):
+        self.buffers = [np.empty((height, width, 3), np.uint8) for _ in range(count)]
+        self.free = deque(range(count))
+        self.ready = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def acquire(self):
+        """解码线程取一个空闲缓冲区，没有时等待；关闭后返回 None"""
+        with self.condition:
+            while not self.free and not self.closed:
+                self.condition.wait()
+            return None if self.closed else self.free.popleft()
+
+    def publish(self, slot, index):
+        """解码完成，index 为帧序号（循环播放时继续递增）"""
+        with self.condition:
+            self.ready.append((slot, index))
+
+    def take_until(self, index):
+        """取出序号不超过 index 的所有帧
+
+        Returns:
+            按顺序排列的 [(slot, 帧序号)]
+        """
+        frames = []
+        with self.condition:
+            while self.ready and self.ready[0][1] <= index:
+                frames.append(self.ready.popleft())
+        return frames
+
+    def release(self, slot):
+        with self.condition:
+            self.free.append(slot)
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class CvVideoPlayer(QWidget):
+    """
+    基于 OpenCV 的视频播放控件，QtMultimedia 不可用或播放出错时使用
+    解码线程直接把帧缩放到显示尺寸写入环形缓冲区，界面线程用 QImage 包装缓冲区
+    （BGR888，不转换、不复制），按视频帧率绘制；来不及显示的帧计为丢帧
+    """
+    failed = Signal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('CvVideoPlayer')
+        self.path = path
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self.ring = None
+        self.thread = None
+        self.fps = DEFAULT_FPS
+        self.source_size = QSize()
+        self.frame_size = QSize()
+        self.image = None
+        self.slot = None
+        self.started_at = None
+        self.shown_index = -1
+        self.stats = None
+        self.skipped = 0
+        self.late_ticks = 0
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_tick)
+
+    def start(self):
+        """打开视频并开始解码，显示尺寸按控件当前大小计算"""
+        self.stop()
+        capture = cv2.VideoCapture(self.path)
+        if not capture.isOpened():
+            self.failed.emit(f'Cannot open {self.path}')
+            return
+
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and 1 <= fps <= 240 else DEFAULT_FPS
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width <= 0 or height <= 0:
+            capture.release()
+            self.failed.emit(f'Invalid video size: {self.path}')
+            return
+
+        self.source_size = QSize(width, height)
+        self.frame_size = self.fit_size()
+
+        self.ring = FrameRing(RING_SIZE, self.frame_size.width(), self.frame_size.height())
+        self.thread = threading.Thread(
+            target=self._decode, args=(capture, self.ring, self.frame_size),
+            name='cv-video', daemon=True
+        )
+        self.thread.start()
+
+        self.started_at = None
+        self.shown_index = -1
+        self.stats = FrameStats('cv_video', 1000 / self.fps)
+        self.skipped = 0
+        self.late_ticks = 0
+        # 间隔略短于一帧，避免计时误差导致两帧同时到期
+        self.timer.start(max(1, int(1000 / self.fps)))
+        self.logger.info(
+            f'Playing {self.path} at {self.fps:.1f} fps, '
+            f'{width}x{height} -> {self.frame_size.width()}x{self.frame_size.height()}'
+        )
+
+    def fit_size(self):
+        """按设备像素把视频缩放到控件范围内，绘制时不再缩放"""
+        dpr = self.devicePixelRatioF()
+        area = self.size() if not self.size().isEmpty() else self.screen().size()
+        width, height = self.source_size.width(), self.source_size.height()
+        scale = min(area.width() * dpr / width, area.height() * dpr / height)
+        return QSize(max(1, int(width * scale)), max(1, int(height * scale)))
+
+    def stop(self):
+        """停止播放并等待解码线程退出，记录丢帧统计"""
+        self.timer.stop()
+        if self.ring is not None:
+            self.ring.close()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self.stats is not None and self.stats.intervals:
+            self.logger.info(
+                f'{self.stats.summary()} skipped={self.skipped} late_ticks={self.late_ticks}'
+            )
+        self.stats = None
+        self.ring = None
+        self.slot = None
+        self.image = None
+
+    def _decode(self, capture, ring, size):
+        """解码线程：读取、缩放到显示尺寸并写入空闲缓冲区，到结尾后从头循环"""
+        target = (size.width(), size.height())
+        index = 0
+        try:
+            while True:
+                slot = ring.acquire()
+                if slot is None:
+                    break
+                ok, frame = capture.read()
+                if not ok:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ok, frame = capture.read()
+                    if not ok:
+                        ring.release(slot)
+                        self.logger.error(f'Error decoding {self.path}')
+                        break
+                buffer = ring.buffers[slot]
+                if frame.shape[1] == target[0] and frame.shape[0] == target[1]:
+                    np.copyto(buffer, frame)
+                else:
+                    shrink = frame.shape[1] > target[0]
+                    cv2.resize(
+                        frame, target, dst=buffer,
+                        interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR
+                    )
+                ring.publish(slot, index)
+                index += 1
+        finally:
+            capture.release()
+
+    def _on_tick(self):
+        if self.ring is None:
+            return
+        now = time.perf_counter()
+        # 第一帧到达时开始计时，之后按帧率计算当前应显示的帧
+        expected = 0 if self.started_at is None else int((now - self.started_at) * self.fps)
+        frames = self.ring.take_until(expected)
+        if not frames:
+            # 应该显示新帧但解码还没完成
+            if self.started_at is not None and expected > self.shown_index:
+                self.late_ticks += 1
+            return
+        if self.started_at is None:
+            self.started_at = now
+
+        # 只显示最新的一帧，其余来不及显示的帧直接归还
+        for slot, _ in frames[:-1]:
+            self.ring.release(slot)
+        self.skipped += len(frames) - 1
+        slot, self.shown_index = frames[-1]
+
+        buffer = self.ring.buffers[slot]
+        height, width = buffer.shape[:2]
+        image = QImage(buffer.data, width, height, buffer.strides[0], QImage.Format_BGR888)
+        image.setDevicePixelRatio(self.devicePixelRatioF())
+        previous, self.slot, self.image = self.slot, slot, image
+        # 新的帧已经替换 QImage，上一帧的缓冲区可以交给解码线程
+        if previous is not None:
+            self.ring.release(previous)
+
+        self.stats.tick()
+        self.update(self.frame_rect())
+
+    def frame_rect(self):
+        """视频在控件中居中显示的区域（逻辑坐标）"""
+        dpr = self.devicePixelRatioF()
+        width = round(self.frame_size.width() / dpr)
+        height = round(self.frame_size.height() / dpr)
+        return QRect((self.width() - width) // 2, (self.height() - height) // 2, width, height)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        target = self.frame_rect()
+        if self.image is None or not target.contains(event.rect()):
+            painter.fillRect(event.rect(), QColor('#000000'))
+        if self.image is not None:
+            painter.drawImage(target.topLeft(), self.image)
+        painter.end()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.ring is None:
+            self.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # 全屏后显示尺寸改变时重新开始，保证解码输出和显示尺寸一致
+        if self.ring is not None and self.fit_size() != self.frame_size:
+            self.start()
+
+    def hideEvent(self, event):
+        self.stop()
+        super().hideEvent(event)
@@ -1,75 +1,230 @@
-from PySide6.QtCore import QObject, Signal, QTimer
-from PySide6.QtWidgets import QApplication
-from datetime import datetime, timedelta
+from PySide6.QtCore import QObject, Signal
+import time
+import logging
 from .screen_saver import ScreenSaver
-from .warning_window import WarningWindow
 from utils.config import Config
+from scheduler.engine import ReminderEngine, ReminderRule
+from scheduler.journal import SessionJournal
+from scheduler.busy_calendar import BusyCalendar
+from scheduler.hooks import HookRunner
+from widgets.countdown_window import CountdownWindow
+from widgets.overlay import OverlayManager
+
+# 主规则名称，对应 screensaver.work_duration / break_duration
+WORK_RULE = 'work'
+
 
 class ScreenSaverManager(QObject):
     """
     屏保管理器
-    负责管理定时器、展示警告、控制屏保
+    负责管理提醒规则调度、展示倒计时、控制屏保
     """
     break_started = Signal()
     break_finished = Signal()
-    
-    def __init__(self):
-        super().__init__()
+    running_changed = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.config = Config()
+        self.logger = logging.getLogger('ScreenSaverManager')
         self.screen_saver = None
-        self.warning_window = None
-        
-        # 初始化定时器
-        self.work_timer = QTimer(self)
-        self.break_timer = QTimer(self)
-        self.warning_timer = QTimer(self)
-        
-        self.setup_timers()
+        # 当前休息触发的规则，休息延长时写入会话日志
+        self.break_rules = []
+
+        # 每个屏幕一个常驻的倒计时浮层
+        self.overlay = OverlayManager(self)
+
+        # 提醒调度引擎
+        self.engine = ReminderEngine(
+            collision_window=self.config.get('reminders.collision_window', 60),
+            parent=self
+        )
+        self.engine.set_rules(self.load_rules())
+
+        # 日程冲突时推迟休息
+        self.calendar = None
+        calendar_files = self.config.get('calendar.files', []) or []
+        if calendar_files:
+            self.calendar = BusyCalendar(
+                calendar_files,
+                window_days=self.config.get('calendar.window_days', 7),
+                parent=self
+            )
+            self.engine.break_guard = self.calendar.busy_until
+
+        # 休息开始/结束时在后台线程执行的钩子
+        self.hooks = HookRunner(
+            max_workers=self.config.get('hooks.max_workers', 2),
+            max_pending=self.config.get('hooks.max_pending', 16)
+        )
+        self.hooks.load(self.config)
+
+        # 会话日志，用于异常退出后恢复计时
+        self.journal = SessionJournal(
+            max_bytes=self.config.get('session.journal_max_bytes', 64 * 1024)
+        )
+
         self.setup_connections()
-        
-    def setup_timers(self):
-        """设置定时器"""
-        work_mins = self.config.get("screensaver.work_duration")
-        self.work_timer.setInterval(work_mins * 60 * 1000)  # 转换为毫秒
-        self.work_timer.start()
-        
+
     def setup_connections(self):
         """设置信号连接"""
-        self.work_timer.timeout.connect(self.prepare_break)
-        self.warning_timer.timeout.connect(self.start_break)
-        self.break_timer.timeout.connect(self.finish_break)
-        
-    def prepare_break(self):
-        """准备休息,显示警告窗口"""
-        warning_secs = self.config.get("screensaver.warning_time")
-        self.warning_window = WarningWindow(warning_secs)
-        self.warning_window.show()
-        
-        self.warning_timer.setInterval(warning_secs * 1000)
-        self.warning_timer.start()
-        
-    def start_break(self):
+        self.engine.break_started.connect(self.start_break)
+        self.engine.break_finished.connect(self.finish_break)
+        self.engine.break_postponed.connect(self.on_break_postponed)
+        self.engine.break_extended.connect(self.on_break_extended)
+
+    def load_rules(self):
+        """从配置加载提醒规则"""
+        rules = [ReminderRule(
+            WORK_RULE,
+            interval=self.config.get('screensaver.work_duration', 25) * 60,
+            break_duration=self.config.get('screensaver.break_duration', 5) * 60,
+            priority=10
+        )]
+
+        for data in self.config.get('reminders.rules', []) or []:
+            try:
+                rule = ReminderRule.from_config(data)
+            except (KeyError, TypeError) as e:
+                self.logger.error(f'Invalid reminder rule {data}: {e}')
+                continue
+            if rule.name != WORK_RULE:
+                rules.append(rule)
+        return rules
+
+    def reload_rules(self):
+        """配置改变后重新加载规则"""
+        self.engine.set_rules(self.load_rules())
+
+    def is_running(self):
+        return self.engine.running
+
+    def status(self):
+        """当前状态的简短描述，用于回复其他实例的 status 命令"""
+        if not self.engine.running:
+            return 'idle'
+        if self.engine.in_break:
+            return f'break, {max(0, int(self.engine.break_deadline() - time.time()))}s left'
+        deadline = self.engine.next_break_deadline()
+        if deadline is None:
+            return 'work'
+        return f'work, next break in {max(0, int(deadline - time.time()))}s'
+
+    def start(self):
+        """开始计时"""
+        self.engine.start()
+        self.show_work_countdown()
+        self.record_state()
+        self.running_changed.emit(True)
+
+    def stop(self):
+        """停止计时"""
+        was_in_break = self.engine.in_break
+        self.engine.stop()
+        self.close_windows()
+        self.journal.record('idle')
+        self.running_changed.emit(False)
+        if was_in_break:
+            self.break_finished.emit()
+            self.hooks.fire('break_end')
+
+    def resume_session(self):
+        """根据会话日志恢复上次未完成的计时"""
+        last = self.journal.last_record()
+        if not last or last.get('state') == 'idle' or 'engine' not in last:
+            return False
+
+        in_break = self.engine.restore(last['engine'])
+        self.running_changed.emit(True)
+        if in_break:
+            self.start_break(0, last.get('rules', []))
+        else:
+            self.show_work_countdown()
+            self.record_state()
+
+        # 恢复后压缩日志
+        self.journal.compact()
+        return True
+
+    def record_state(self, rules=None):
+        """把当前调度状态写入会话日志"""
+        if self.engine.in_break:
+            self.journal.record(
+                'break', self.engine.break_deadline(),
+                engine=self.engine.snapshot(), rules=rules or []
+            )
+        else:
+            self.journal.record(
+                'work', self.engine.next_break_deadline(),
+                engine=self.engine.snapshot()
+            )
+
+    def show_work_countdown(self):
+        """显示距离下一次休息的倒计时"""
+        deadline = self.engine.next_break_deadline()
+        if deadline is None:
+            self.overlay.hide()
+            return
+        self.overlay.show_countdown(
+            CountdownWindow.MODE_WORK,
+            deadline - time.time(),
+            warning_seconds=self.config.get('screensaver.warning_time', 5)
+        )
+
+    def start_break(self, duration, rules):
         """开始休息"""
-        self.warning_timer.stop()
-        if self.warning_window:
-            self.warning_window.close()
-            
-        break_mins = self.config.get("screensaver.break_duration")
-        self.screen_saver = ScreenSaver()
+        remaining = self.engine.break_deadline() - time.time()
+
+        # 创建并显示屏保
+        self.screen_saver = ScreenSaver(self.engine.break_deadline(), max(duration, remaining))
         self.screen_saver.show()
-        
-        self.break_timer.setInterval(break_mins * 60 * 1000)
-        self.break_timer.start()
+
+        # 浮层切换为休息倒计时，并保持在屏保之上
+        self.overlay.show_countdown(CountdownWindow.MODE_BREAK, remaining)
+
+        self.break_rules = list(rules)
+        self.record_state(rules)
         self.break_started.emit()
-        
+
+        # 屏保显示后再提交钩子，钩子只在后台线程中执行
+        self.hooks.fire('break_start', duration=int(remaining), rules=','.join(rules))
+
     def finish_break(self):
         """结束休息"""
-        self.break_timer.stop()
+        self.close_screen_saver()
+
+        self.show_work_countdown()
+        self.record_state()
+        self.break_finished.emit()
+
+        self.hooks.fire('break_end')
+
+    def on_break_postponed(self, until):
+        """休息因日程推迟，刷新倒计时"""
+        self.show_work_countdown()
+        self.record_state()
+
+    def on_break_extended(self, deadline):
+        """休息中合并了更长的规则，刷新倒计时和屏保的结束时间"""
+        if self.screen_saver:
+            self.screen_saver.set_deadline(deadline)
+        self.overlay.show_countdown(CountdownWindow.MODE_BREAK, deadline - time.time())
+        self.record_state(self.break_rules)
+
+    def close_screen_saver(self):
+        """强制关闭屏保"""
         if self.screen_saver:
             # 强制允许关闭
             self.screen_saver.allow_close = True
             self.screen_saver.closing_by_hotkey = True
             self.screen_saver.close()
-            
-        self.work_timer.start()
-        self.break_finished.emit() 
\ No newline at end of file
+            self.screen_saver = None
+
+    def shutdown(self):
+        """应用退出时调用：不再等待后台执行的钩子"""
+        self.hooks.shutdown(wait=False)
+
+    def close_windows(self):
+        """隐藏倒计时浮层并关闭屏保"""
+        self.overlay.hide()
+        self.close_screen_saver()
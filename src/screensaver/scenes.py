@@ -0,0 +1,378 @@
+import math
+import time
+import logging
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QTimer, QRect, QRectF, QPointF
+from PySide6.QtGui import (
+    QPainter, QPixmap, QColor, QPen, QFont, QStaticText,
+    QLinearGradient, QRegion
+)
+from utils.config import Config
+from utils.style import parse_color
+from utils.perf import TimingStats, CpuMeter
+from widgets.countdown_window import GlyphCache
+
+BACKGROUND_TOP = QColor('#10141C')
+BACKGROUND_BOTTOM = QColor('#1C2431')
+TRACK_COLOR = QColor(255, 255, 255, 36)
+CAPTION_COLOR = QColor(255, 255, 255, 160)
+# 呼吸引导：吸气 4 秒，呼气 6 秒
+INHALE_SECONDS = 4.0
+EXHALE_SECONDS = 6.0
+# 抗锯齿边缘会超出几何形状，脏区域向外扩展的像素
+AA_MARGIN = 2
+
+
+class GlyphText:
+    """用 GlyphCache 贴图绘制的一行居中文字，只返回发生变化的字符区域"""
+    def __init__(self, glyphs):
+        self.glyphs = glyphs
+        self.text = ''
+        self.cells = []
+
+    def layout(self, text, center_x, top):
+        cells = []
+        x = center_x - sum(self.glyphs.cell_width(ch) for ch in text) // 2
+        for ch in text:
+            width = self.glyphs.cell_width(ch)
+            cells.append(QRect(x, top, width, self.glyphs.height))
+            x += width
+        return cells
+
+    def set_text(self, text, center_x, top):
+        """更新文字
+
+        Returns:
+            QRegion: 需要重绘的区域
+        """
+        cells = self.layout(text, center_x, top)
+        if text == self.text and cells == self.cells:
+            return QRegion()
+        dirty = QRegion()
+        if len(text) != len(self.text) or len(cells) != len(self.cells):
+            for rect in cells + self.cells:
+                dirty += rect
+        else:
+            for i, (old, new) in enumerate(zip(self.text, text)):
+                if old != new or cells[i] != self.cells[i]:
+                    dirty += cells[i].united(self.cells[i])
+        self.text, self.cells = text, cells
+        return dirty
+
+    def paint(self, painter, region):
+        for ch, rect in zip(self.text, self.cells):
+            if region.intersects(rect):
+                painter.drawPixmap(rect.topLeft(), self.glyphs.pixmaps[ch])
+
+
+def format_seconds(seconds):
+    seconds = max(0, math.ceil(seconds))
+    return f'{seconds // 60:02d}:{seconds % 60:02d}'
+
+
+class BreakScene(QWidget):
+    """
+    程序绘制的休息场景基类
+    背景等静态内容只在尺寸改变时绘制一次到缓存图层；定时器按 screensaver.scene_fps
+    限制最高帧率，场景没有变化时等待更久，每次只重绘 advance() 返回的区域
+    """
+    # 场景本身需要的最高帧率，配置的帧率更低时以配置为准
+    MAX_FPS = 60
+
+    def __init__(self, deadline, duration, parent=None):
+        super().__init__(parent)
+        self.config = Config()
+        self.logger = logging.getLogger(type(self).__name__)
+        # deadline 为 time.time() 时间戳，与调度引擎一致
+        self.deadline = deadline
+        self.duration = max(1.0, float(duration))
+        self.background = None
+        self.color = parse_color(self.config.get('countdown.color', 'rgba(0, 122, 255, 0.8)'))
+        self.font_family = self.config.get('countdown.font_family', 'SF Pro Display')
+        self.paint_stats = TimingStats(f'{type(self).__name__} paint')
+        self.cpu_meter = CpuMeter()
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        fps = min(float(self.config.get('screensaver.scene_fps', 30)), self.MAX_FPS)
+        self.frame_interval = max(1, round(1000 / max(fps, 1)))
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.time())
+
+    def set_deadline(self, deadline, duration):
+        """休息被延长后更新结束时间和总时长，正在播放时立即重绘变化的部分"""
+        self.deadline = deadline
+        self.duration = max(1.0, float(duration))
+        if self.timer.isActive():
+            self._tick()
+
+    def build_background(self, painter):
+        """绘制静态图层，子类在背景渐变之上追加不变的内容"""
+        gradient = QLinearGradient(0, 0, 0, self.height())
+        gradient.setColorAt(0, BACKGROUND_TOP)
+        gradient.setColorAt(1, BACKGROUND_BOTTOM)
+        painter.fillRect(self.rect(), gradient)
+
+    def layout_scene(self):
+        """尺寸改变后重新计算场景布局"""
+
+    def advance(self):
+        """更新场景状态
+
+        Returns:
+            QRegion: 需要重绘的区域
+        """
+        return QRegion()
+
+    def next_interval(self):
+        """距离下一次变化的毫秒数，小于帧间隔时按帧率上限刷新"""
+        return 0
+
+    def paint_scene(self, painter, region):
+        """在缓存图层之上绘制动态内容"""
+
+    def _rebuild(self):
+        dpr = self.devicePixelRatioF()
+        self.background = QPixmap(
+            max(1, math.ceil(self.width() * dpr)), max(1, math.ceil(self.height() * dpr))
+        )
+        self.background.setDevicePixelRatio(dpr)
+        self.layout_scene()
+        painter = QPainter(self.background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.build_background(painter)
+        painter.end()
+        self.advance()
+        self.update()
+
+    def _tick(self):
+        if self.background is None:
+            self._rebuild()
+        dirty = self.advance()
+        if not dirty.isEmpty():
+            self.update(dirty)
+        self.timer.start(max(self.frame_interval, self.next_interval()))
+
+    def paintEvent(self, event):
+        with self.paint_stats.measure():
+            if self.background is None:
+                self._rebuild()
+            painter = QPainter(self)
+            region = event.region()
+            # 绘制被裁剪到需要重绘的区域，只复制缓存图层中对应的像素
+            painter.drawPixmap(0, 0, self.background)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.paint_scene(painter, region)
+            painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._rebuild()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.cpu_meter.reset()
+        self._tick()
+
+    def hideEvent(self, event):
+        self.stop()
+        super().hideEvent(event)
+
+    def stop(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.logger.debug(f'{self.paint_stats.summary()}, {self.cpu_meter.summary()}')
+
+
+class ClockScene(BreakScene):
+    """大号时钟，每秒只重绘变化的数字"""
+    # 定时器对齐到整秒，第一次对齐前最多晚 250ms
+    MAX_FPS = 4
+
+    def layout_scene(self):
+        size = max(12, self.height() // 8)
+        self.glyphs = GlyphCache.get(self.font_family, size, self.color, self.devicePixelRatioF())
+        self.clock = GlyphText(self.glyphs)
+        self.top = (self.height() - self.glyphs.height) // 2
+
+    def advance(self):
+        return self.clock.set_text(time.strftime('%H:%M:%S'), self.width() // 2, self.top)
+
+    def next_interval(self):
+        # 对齐到下一秒开始之后
+        return math.ceil((1 - time.time() % 1) * 1000) + 1
+
+    def paint_scene(self, painter, region):
+        self.clock.paint(painter, region)
+
+
+class BreathingScene(BreakScene):
+    """呼吸引导圆：吸气时放大、呼气时缩小，只重绘新旧半径之间的圆环"""
+
+    def __init__(self, deadline, duration, parent=None):
+        self.radius = 0.0
+        self.inhale = True
+        self.started = time.monotonic()
+        super().__init__(deadline, duration, parent)
+        self.caption_font = QFont(self.font_family, 18)
+        self.captions = {}
+        for inhale, text in ((True, '吸气'), (False, '呼气')):
+            caption = QStaticText(text)
+            caption.prepare(font=self.caption_font)
+            self.captions[inhale] = caption
+
+    def layout_scene(self):
+        self.center = QPointF(self.width() / 2, self.height() / 2)
+        self.max_radius = min(self.width(), self.height()) * 0.3
+        self.min_radius = self.max_radius * 0.4
+        self.radius = 0.0
+
+    def build_background(self, painter):
+        super().build_background(painter)
+        painter.setPen(QPen(TRACK_COLOR, 2))
+        painter.drawEllipse(self.center, self.max_radius, self.max_radius)
+
+    def caption_rect(self):
+        size = self.captions[True].size()
+        return QRect(
+            int(self.center.x() - size.width() / 2) - AA_MARGIN,
+            int(self.center.y() + self.max_radius + 24),
+            int(size.width()) + 2 * AA_MARGIN, int(size.height()) + AA_MARGIN
+        )
+
+    def circle_rect(self, radius):
+        return QRectF(
+            self.center.x() - radius, self.center.y() - radius, radius * 2, radius * 2
+        ).toAlignedRect()
+
+    def advance(self):
+        cycle = (time.monotonic() - self.started) % (INHALE_SECONDS + EXHALE_SECONDS)
+        inhale = cycle < INHALE_SECONDS
+        if inhale:
+            progress = cycle / INHALE_SECONDS
+        else:
+            progress = 1 - (cycle - INHALE_SECONDS) / EXHALE_SECONDS
+        # 缓入缓出
+        eased = (1 - math.cos(math.pi * progress)) / 2
+        radius = self.min_radius + (self.max_radius - self.min_radius) * eased
+
+        dirty = QRegion()
+        if inhale != self.inhale:
+            self.inhale = inhale
+            dirty += self.caption_rect()
+        if abs(radius - self.radius) < 0.25:
+            return dirty
+        # 圆内是纯色填充，只有新旧边缘之间的圆环会变化
+        outer = max(radius, self.radius) + AA_MARGIN
+        inner = max(0.0, min(radius, self.radius) - AA_MARGIN * 2)
+        self.radius = radius
+        ring = QRegion(self.circle_rect(outer), QRegion.Ellipse)
+        if inner > 0:
+            ring -= QRegion(self.circle_rect(inner), QRegion.Ellipse)
+        return dirty + ring
+
+    def paint_scene(self, painter, region):
+        if region.intersects(self.circle_rect(self.radius + AA_MARGIN)):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.color)
+            painter.drawEllipse(self.center, self.radius, self.radius)
+        if region.intersects(self.caption_rect()):
+            caption = self.captions[self.inhale]
+            painter.setFont(self.caption_font)
+            painter.setPen(CAPTION_COLOR)
+            rect = self.caption_rect()
+            painter.drawStaticText(QPointF(rect.x() + AA_MARGIN, rect.y()), caption)
+
+
+class RingScene(BreakScene):
+    """剩余时间圆环：圆弧随休息进度缩短，只重绘圆弧末端移动经过的区域和变化的数字"""
+
+    def __init__(self, deadline, duration, parent=None):
+        self.angle = None
+        super().__init__(deadline, duration, parent)
+
+    def layout_scene(self):
+        self.radius = min(self.width(), self.height()) * 0.3
+        self.pen_width = max(4.0, self.radius / 12)
+        center_x, center_y = self.width() / 2, self.height() / 2
+        self.ring = QRectF(center_x - self.radius, center_y - self.radius, self.radius * 2, self.radius * 2)
+        self.glyphs = GlyphCache.get(
+            self.font_family, max(12, int(self.radius / 4)), self.color, self.devicePixelRatioF()
+        )
+        self.clock = GlyphText(self.glyphs)
+        self.top = int(center_y - self.glyphs.height / 2)
+        self.angle = None
+
+    def build_background(self, painter):
+        super().build_background(painter)
+        painter.setPen(QPen(TRACK_COLOR, self.pen_width))
+        painter.drawEllipse(self.ring)
+        caption_font = QFont(self.font_family, 14)
+        painter.setFont(caption_font)
+        painter.setPen(CAPTION_COLOR)
+        caption_rect = QRectF(0, self.top + self.glyphs.height, self.width(), self.pen_width * 3)
+        painter.drawText(caption_rect, Qt.AlignHCenter | Qt.AlignTop, '休息中')
+
+    def end_point(self, angle):
+        # 从 12 点方向顺时针计算
+        radians = math.radians(90 - angle)
+        return QPointF(
+            self.ring.center().x() + self.radius * math.cos(radians),
+            self.ring.center().y() - self.radius * math.sin(radians)
+        )
+
+    def arc_dirty(self, old, new):
+        """两个末端角度之间的圆弧所占的区域"""
+        margin = self.pen_width / 2 + AA_MARGIN
+        if abs(old - new) > 30:
+            return QRegion(self.ring.adjusted(-margin, -margin, margin, margin).toAlignedRect())
+        a, b = self.end_point(old), self.end_point(new)
+        rect = QRectF(a, b).normalized().adjusted(-margin, -margin, margin, margin)
+        return QRegion(rect.toAlignedRect())
+
+    def advance(self):
+        remaining = self.remaining()
+        # drawArc 的角度单位为 1/16 度，角度不变时不重绘圆弧
+        angle = round(360 * 16 * min(1.0, remaining / self.duration)) / 16
+        dirty = self.clock.set_text(format_seconds(remaining), self.width() // 2, self.top)
+        if angle != self.angle:
+            old = self.angle if self.angle is not None else 360.0
+            self.angle = angle
+            dirty += self.arc_dirty(old, angle)
+        return dirty
+
+    def next_interval(self):
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 1000
+        # 等到数字变化或圆弧末端移动约半个像素
+        to_next_second = (remaining - math.floor(remaining)) * 1000 or 1000
+        pixels_per_ms = 2 * math.pi * self.radius / self.duration / 1000
+        if pixels_per_ms <= 0:
+            # 布局之前尺寸为 0，只按数字变化刷新
+            return int(to_next_second) + 1
+        return int(min(to_next_second, 0.5 / pixels_per_ms)) + 1
+
+    def paint_scene(self, painter, region):
+        if self.angle:
+            pen = QPen(self.color, self.pen_width)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawArc(self.ring, 90 * 16, -round(self.angle * 16))
+        self.clock.paint(painter, region)
+
+
+SCENES = {
+    'clock': ClockScene,
+    'breathing': BreathingScene,
+    'ring': RingScene,
+}
+
+
+def create_scene(name, deadline, duration, parent=None):
+    """按名称创建休息场景，未知名称使用剩余时间圆环"""
+    return SCENES.get(name, RingScene)(deadline, duration, parent)
@@ -1,29 +1,68 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt, Signal, QEvent, QTimer
-from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtGui import (
     QPixmap, QColor, QKeySequence, QShortcut, 
     QGuiApplication, QImage
 )
 from utils.config import Config
+from screensaver.animated_image import AnimatedImage, is_animated
+import logging
+import time
 import os
 
-# 尝试导入视频组件
-try:
-    from PySide6.QtMultimediaWidgets import QVideoWidget
-    VIDEO_SUPPORT = True
-except ImportError:
-    VIDEO_SUPPORT = False
+_video_support = None
+_warm_player = None
+
+
+def video_support():
+    """检查视频组件是否可用（第一次调用时才导入 QtMultimedia）"""
+    global _video_support
+    if _video_support is None:
+        try:
+            from PySide6.QtMultimedia import QMediaPlayer
+            from PySide6.QtMultimediaWidgets import QVideoWidget
+            _video_support = True
+        except ImportError:
+            _video_support = False
+    return _video_support
+
+
+def warm_up_multimedia():
+    """初始化多媒体后端（FFmpeg/GStreamer），只执行一次
+
+    Returns:
+        float: 本次初始化耗时（毫秒），已初始化或不支持视频时返回 0
+    """
+    global _warm_player
+    if _warm_player is not None or not video_support():
+        return 0.0
+
+    from PySide6.QtMultimedia import QMediaPlayer
+    started = time.perf_counter()
+    try:
+        # 创建播放器时会加载多媒体后端，保留实例避免后端被卸载
+        _warm_player = QMediaPlayer()
+    except Exception as e:
+        logging.getLogger('ScreenSaver').error(f'Failed to initialize multimedia system: {e}')
+        return 0.0
+    return (time.perf_counter() - started) * 1000
 
 class ScreenSaver(QWidget):
     """全屏屏保窗口"""
     closed = Signal()  # 添加关闭信号
     
-    def __init__(self):
+    def __init__(self, deadline=None, duration=0):
         super().__init__()
         self.config = Config()
         self.preview_mode = False
         
+        # 休息结束时间（time.time() 时间戳）和总时长，供休息场景显示进度；预览时按配置的休息时长演示
+        if deadline is None:
+            duration = self.config.get('screensaver.break_duration', 5) * 60
+            deadline = time.time() + duration
+        self.deadline = deadline
+        self.duration = duration
+        
         # 读取是否允许关闭的配置
         self.allow_close = self.config.get('screensaver.allow_close', False)
         
@@ -58,11 +97,14 @@ class ScreenSaver(QWidget):
         self.focus_check_timer.timeout.connect(self._check_focus)
         self.focus_check_timer.start(500)  # 降低检查频率
         
-        self.init_ui()
-        self.setup_hotkey()
-        
+        # init_ui 开始播放视频时会修改这些状态，需要先初始化
         self.can_close = False
         self.video_playing = False
+        # QtMultimedia 实际播放的文件（可能是代理），出错时用 OpenCV 播放同一个文件
+        self.video_path = None
+        
+        self.init_ui()
+        self.setup_hotkey()
         
     def ensure_top_window(self):
         """优化确保窗口保持在最前的逻辑"""
@@ -159,13 +201,27 @@ class ScreenSaver(QWidget):
         media_type = self.config.get('screensaver.media_type', 'image')
         media_path = self.config.get('screensaver.media_path', 'assets/default_wallpaper.jpg')
         
-        if VIDEO_SUPPORT and media_type == 'video' and os.path.exists(media_path):
-            self.setup_video(media_path)
+        if media_type == 'scene':
+            self.setup_scene(self.config.get('screensaver.scene', 'ring'))
+        elif media_type == 'video' and os.path.exists(media_path):
+            # 已经生成代理时播放代理文件
+            from media.proxy import playback_path
+            media_path = playback_path(media_path)
+            # auto: 优先 QtMultimedia，不可用时使用 OpenCV 播放
+            renderer = self.config.get('screensaver.video_renderer', 'auto')
+            if renderer != 'opencv' and video_support():
+                self.setup_video(media_path)
+            else:
+                self.setup_cv_video(media_path)
+        elif is_animated(media_path):
+            self.setup_animated_image(media_path)
         else:
             self.setup_image(media_path)
     
     def setup_video(self, media_path):
         """优化视频播放设置"""
+        from PySide6.QtMultimedia import QMediaPlayer
+        from PySide6.QtMultimediaWidgets import QVideoWidget
         try:
             self.player = QMediaPlayer()
             self.video_widget = QVideoWidget()  # 先创建 video_widget
@@ -185,6 +241,7 @@ class ScreenSaver(QWidget):
             if hasattr(self.player, 'setBufferSize'):
                 self.player.setBufferSize(4096)
             
+            self.video_path = media_path
             self.player.setSource(media_path)
             self.player.setLoops(QMediaPlayer.Infinite)  # 添加循环播放设置
             
@@ -202,11 +259,52 @@ class ScreenSaver(QWidget):
             self.video_playing = True
         except Exception as e:
             print(f"视频播放初始化失败: {e}")
-            # 如果视频播放失败，回退到图片模式
-            self.setup_image(self.config.get('screensaver.media.path', 'assets/default_wallpaper.jpg'))
+            # 如果视频播放失败，改用 OpenCV 播放
+            self.setup_cv_video(media_path)
+    
+    def setup_cv_video(self, media_path):
+        """使用 OpenCV 解码播放视频（QtMultimedia 不可用或出错时）"""
+        from screensaver.cv_player import CvVideoPlayer
+        self.cv_player = CvVideoPlayer(media_path, self)
+        self.cv_player.failed.connect(self._handle_cv_video_error)
+        self.layout().addWidget(self.cv_player)
+        self.video_playing = True
+    
+    def _handle_cv_video_error(self, error_string):
+        """OpenCV 也无法播放时显示黑色背景"""
+        print(f"视频播放错误: {error_string}")
+        self.video_playing = False
+        self.cv_player.hide()
+        self.setup_image('')
+    
+    def setup_animated_image(self, media_path):
+        """播放 GIF/WebP/APNG 动画"""
+        self.animated_image = AnimatedImage(media_path, self)
+        self.animated_image.failed.connect(self._handle_animated_image_error)
+        self.layout().addWidget(self.animated_image)
+    
+    def _handle_animated_image_error(self, error_string):
+        """无法解码动画时按静态图片显示"""
+        print(f"动画播放错误: {error_string}")
+        self.animated_image.hide()
+        self.setup_image(self.animated_image.path)
+    
+    def setup_scene(self, name):
+        """程序绘制的休息场景（时钟、呼吸引导、剩余时间圆环），不需要解码任何媒体"""
+        from screensaver.scenes import create_scene
+        self.scene = create_scene(name, self.deadline, self.duration, self)
+        self.layout().addWidget(self.scene)
+    
+    def set_deadline(self, deadline):
+        """休息被延长后更新结束时间，总时长增加相同的秒数"""
+        self.duration += deadline - self.deadline
+        self.deadline = deadline
+        if hasattr(self, 'scene'):
+            self.scene.set_deadline(self.deadline, self.duration)
     
     def _on_playback_state_changed(self, state):
         """处理视频播放状态变化"""
+        from PySide6.QtMultimedia import QMediaPlayer
         if state == QMediaPlayer.StoppedState and self.video_playing:
             self.player.play()
     
@@ -270,6 +368,13 @@ class ScreenSaver(QWidget):
         if hasattr(self, 'player'):
             self.video_playing = False
             self.player.stop()
+        if hasattr(self, 'cv_player'):
+            self.video_playing = False
+            self.cv_player.stop()
+        if hasattr(self, 'animated_image'):
+            self.animated_image.stop()
+        if hasattr(self, 'scene'):
+            self.scene.stop()
             
         # 检查是否允许关闭
         if self.preview_mode or (self.allow_close and hasattr(self, 'closing_by_hotkey') and self.closing_by_hotkey):
@@ -335,8 +440,10 @@ class ScreenSaver(QWidget):
         print(f"视频播放错误: {error_string}")
         if self.video_playing:
             self.video_playing = False
-            # 出错时回退到图片模式
-            self.setup_image(self.config.get('screensaver.media.path', 'assets/default_wallpaper.jpg')) 
+            self.player.stop()
+            self.video_widget.hide()
+            # 出错时改用 OpenCV 播放同一个文件
+            self.setup_cv_video(self.video_path)
     
     def close_preview(self):
         """关闭预览"""
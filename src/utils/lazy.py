@@ -0,0 +1,35 @@
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    延迟导入的模块代理
+    第一次访问属性时才真正导入模块，用于 cv2、numpy、markdown、QtMultimedia
+    等只在部分功能中用到、导入又很慢的模块
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self):
+        return self.__dict__['_lazy_module'] is not None
+
+
+def lazy_import(name):
+    """返回延迟导入的模块代理"""
+    return LazyModule(name)
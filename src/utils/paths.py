@@ -0,0 +1,26 @@
+import os
+from PySide6.QtCore import QStandardPaths
+
+APP_DIR_NAME = 'EfficiencyTool'
+
+
+def _ensure_dir(path):
+    """确保目录存在并返回路径"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_dir(*parts):
+    """获取用户数据目录（会话日志等需要长期保存的数据）"""
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation)
+    if not base:
+        base = os.path.expanduser('~')
+    return _ensure_dir(os.path.join(base, APP_DIR_NAME, *parts))
+
+
+def cache_dir(*parts):
+    """获取缓存目录（可以随时删除重建的数据）"""
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return _ensure_dir(os.path.join(base, APP_DIR_NAME, *parts))
@@ -0,0 +1,174 @@
+import time
+
+
+class TimingStats:
+    """耗时统计（毫秒）"""
+    def __init__(self, name=''):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def measure(self):
+        """用于 with 语句的计时上下文"""
+        return _Measure(self)
+
+    def summary(self):
+        return f'{self.name}: n={self.count} avg={self.avg_ms:.3f}ms max={self.max_ms:.3f}ms'
+
+
+class _Measure:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add((time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class CpuMeter:
+    """统计一段时间内本进程消耗的 CPU 时间"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.wall_started = time.monotonic()
+        self.cpu_started = time.process_time()
+
+    def cpu_seconds(self):
+        return time.process_time() - self.cpu_started
+
+    def wall_seconds(self):
+        return time.monotonic() - self.wall_started
+
+    def cpu_seconds_per_hour(self):
+        """按当前速率折算为每小时消耗的 CPU 秒数"""
+        wall = self.wall_seconds()
+        return self.cpu_seconds() * 3600 / wall if wall > 0 else 0.0
+
+    def summary(self):
+        wall = self.wall_seconds()
+        cpu = self.cpu_seconds()
+        percent = cpu * 100 / wall if wall > 0 else 0.0
+        return f'cpu={cpu:.2f}s wall={wall:.0f}s ({percent:.2f}%, {self.cpu_seconds_per_hour():.1f}s/h)'
+
+
+class StartupTimer:
+    """
+    记录启动过程中各阶段的耗时
+    mark() 记录首尾相接的主流程阶段，phase() 记录可以嵌套的子阶段
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        # 创建计时器之前解释器已经消耗的 CPU 时间（解释器启动和最早的导入）
+        self.interpreter_cpu_ms = time.process_time() * 1000
+        self.last = self.started
+        self.phases = []
+
+    def _offset_ms(self, moment):
+        return (moment - self.started) * 1000
+
+    def mark(self, phase):
+        """结束一个阶段，记录从上一个阶段结束到现在的耗时"""
+        now = time.perf_counter()
+        self.phases.append((phase, self._offset_ms(self.last), (now - self.last) * 1000))
+        self.last = now
+
+    def phase(self, phase):
+        """用于 with 语句，记录代码块的耗时"""
+        return _Phase(self, phase)
+
+    def add(self, phase, elapsed_ms):
+        """记录不在启动主流程中的独立阶段（例如空闲时的预热）"""
+        now = time.perf_counter()
+        self.phases.append((phase, self._offset_ms(now) - elapsed_ms, elapsed_ms))
+
+    def elapsed_ms(self):
+        return self._offset_ms(self.last)
+
+    def to_dict(self):
+        return {
+            'interpreter_cpu_ms': round(self.interpreter_cpu_ms, 2),
+            'total_ms': round(self.elapsed_ms(), 2),
+            'phases': [
+                {'name': name, 'start_ms': round(start, 2), 'duration_ms': round(duration, 2)}
+                for name, start, duration in self.phases
+            ],
+        }
+
+    def summary(self):
+        phases = ', '.join(f'{name}={duration:.0f}ms' for name, _, duration in self.phases)
+        return f'startup {self.elapsed_ms():.0f}ms ({phases})'
+
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ended = time.perf_counter()
+        self.timer.phases.append(
+            (self.name, self.timer._offset_ms(self.started), (ended - self.started) * 1000)
+        )
+        return False
+
+
+_startup_timer = None
+
+
+def startup_timer():
+    """获取全局启动计时器，第一次调用时开始计时"""
+    global _startup_timer
+    if _startup_timer is None:
+        _startup_timer = StartupTimer()
+    return _startup_timer
+
+
+class FrameStats:
+    """动画帧间隔统计，间隔超过一个帧预算时按错过的帧数计为掉帧"""
+    def __init__(self, name='', budget_ms=1000 / 60):
+        self.name = name
+        self.budget_ms = budget_ms
+        self.start()
+
+    def start(self):
+        self.last = None
+        self.intervals = []
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.intervals.append((now - self.last) * 1000)
+        self.last = now
+
+    @property
+    def dropped(self):
+        return sum(max(0, round(interval / self.budget_ms) - 1) for interval in self.intervals)
+
+    def summary(self):
+        if not self.intervals:
+            return f'{self.name}: no frames'
+        avg = sum(self.intervals) / len(self.intervals)
+        return (f'{self.name}: frames={len(self.intervals) + 1} avg={avg:.1f}ms '
+                f'max={max(self.intervals):.1f}ms dropped={self.dropped}')
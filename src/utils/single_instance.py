@@ -0,0 +1,120 @@
+import getpass
+import logging
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# 可以转发给已运行实例的命令
+COMMANDS = ('show', 'start', 'stop', 'status')
+DEFAULT_COMMAND = 'show'
+
+
+def server_name():
+    """本地服务名称，每个用户一个实例"""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = 'default'
+    return f'EfficiencyTool-{user}'
+
+
+def parse_command(argv):
+    """从命令行参数中取出命令，未指定时为 show"""
+    for arg in argv[1:]:
+        if arg in COMMANDS:
+            return arg
+    return DEFAULT_COMMAND
+
+
+def send_command(command, timeout_ms=500):
+    """把命令发送给已运行的实例
+
+    Returns:
+        str: 已运行实例的回复；没有运行中的实例时返回 None
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return None
+
+    socket.write(f'{command}\n'.encode('utf-8'))
+    socket.flush()
+    reply = b''
+    while socket.waitForReadyRead(timeout_ms):
+        reply += bytes(socket.readAll())
+        if reply.endswith(b'\n'):
+            break
+    socket.disconnectFromServer()
+    return reply.decode('utf-8', errors='replace').strip()
+
+
+class InstanceServer(QObject):
+    """
+    单实例服务
+    第一个实例监听本地套接字，之后启动的实例把命令转发过来后立即退出；
+    handler 以命令名调用，返回值作为回复发送给对方
+    """
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('InstanceServer')
+        self.handler = handler
+        # 另一个同时启动的实例已经在监听时为 True，本实例应把命令转发给它后退出
+        self.secondary = False
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self):
+        """开始监听，上次异常退出残留的套接字会被清理
+
+        Returns:
+            bool: 是否在监听；另一个实例已在监听时返回 False 并设置 secondary
+        """
+        name = server_name()
+        # 两个实例同时启动时都可能转发失败。先确认没有实例在监听：设置了访问权限的
+        # listen 在 Unix 上会直接替换已有的套接字文件，后启动的实例会顶替先启动的实例
+        if self.is_server_alive(name):
+            self.logger.info(f'Another instance is already listening on {name}')
+            self.secondary = True
+            return False
+        if self.server.listen(name):
+            return True
+        QLocalServer.removeServer(name)
+        if self.server.listen(name):
+            return True
+        self.logger.error(f'Cannot listen on {name}: {self.server.errorString()}')
+        return False
+
+    @staticmethod
+    def is_server_alive(name, timeout_ms=200):
+        """是否有实例正在监听 name（残留的套接字文件无法连接）"""
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        alive = socket.waitForConnected(timeout_ms)
+        socket.abort()
+        return alive
+
+    def close(self):
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _on_ready_read(self, socket):
+        if not socket.canReadLine():
+            return
+        command = bytes(socket.readLine()).decode('utf-8', errors='replace').strip()
+        if command not in COMMANDS:
+            reply = f'unknown command: {command}'
+        else:
+            try:
+                reply = self.handler(command) or 'ok'
+            except Exception as e:
+                self.logger.error(f'Error handling command {command}: {e}')
+                reply = f'error: {e}'
+        self.logger.info(f'Received command from another instance: {command}')
+        socket.write(f'{reply}\n'.encode('utf-8'))
+        socket.flush()
+        socket.disconnectFromServer()
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import time
+import logging
+import platform
+
+# 环境变量：值为 1 时使用默认路径，否则作为报告路径
+ENV_REPORT = 'EFFICIENCYTOOL_PROFILE_STARTUP'
+ENV_CPROFILE = 'EFFICIENCYTOOL_PROFILE_CPROFILE'
+
+OPTION_REPORT = '--profile-startup'
+OPTION_CPROFILE = '--profile-cprofile'
+
+
+class StartupProfile:
+    """
+    启动性能分析
+    把各启动阶段的耗时写入 JSON 报告，可选同时保存 cProfile 数据，
+    便于比较不同打包方式和代码修改前后的启动耗时
+
+    用法:
+        main.py --profile-startup[=报告路径] [--profile-cprofile[=路径]]
+    """
+    def __init__(self, report_path=None, cprofile_path=None):
+        self.report_path = report_path
+        self.cprofile_path = cprofile_path
+        self.profiler = None
+        self.finished = False
+
+    @classmethod
+    def from_argv(cls, argv, environ=None):
+        """从命令行参数和环境变量读取选项
+
+        打包时排除了 argparse，这里手动解析
+
+        Returns:
+            (StartupProfile, 去掉分析选项后的参数列表)
+        """
+        environ = os.environ if environ is None else environ
+        report = environ.get(ENV_REPORT) or None
+        cprofile = environ.get(ENV_CPROFILE) or None
+
+        remaining = []
+        for arg in argv:
+            name, has_value, value = arg.partition('=')
+            if name == OPTION_REPORT:
+                report = value if has_value and value else '1'
+            elif name == OPTION_CPROFILE:
+                cprofile = value if has_value and value else '1'
+            else:
+                remaining.append(arg)
+
+        # 只要求 cProfile 时也输出报告
+        if cprofile and not report:
+            report = '1'
+        return cls(report, cprofile), remaining
+
+    @property
+    def enabled(self):
+        return bool(self.report_path)
+
+    def start(self):
+        """开始采集 cProfile 数据（应在导入界面模块之前调用）"""
+        if self.cprofile_path:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def finish(self, timer):
+        """停止采集并写入报告，只执行一次
+
+        Args:
+            timer: StartupTimer
+        Returns:
+            str: 报告路径，未启用时返回 None
+        """
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        logger = logging.getLogger('StartupProfile')
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+
+        report = timer.to_dict()
+        report.update({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'argv': sys.argv,
+        })
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            path = self._resolve(self.cprofile_path, f'startup-{stamp}.prof')
+            try:
+                self.profiler.dump_stats(path)
+                report['cprofile'] = path
+            except OSError as e:
+                logger.error(f'Error writing cProfile data: {e}')
+            self.profiler = None
+
+        path = self._resolve(self.report_path, f'startup-{stamp}.json')
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.error(f'Error writing startup report: {e}')
+            return None
+        logger.info(f'Startup report written to {path}')
+        return path
+
+    @staticmethod
+    def _resolve(path, default_name):
+        """路径为 1 时写入数据目录下的 profiles 目录"""
+        if path == '1':
+            from utils.paths import data_dir
+            return os.path.join(data_dir('profiles'), default_name)
+        return os.path.abspath(os.path.expanduser(path))
@@ -2,6 +2,23 @@ from .config import Config
 from PySide6.QtGui import QColor, QLinearGradient, QGradient
 from typing import Dict, Any
 import logging
+import re
+
+_RGBA_RE = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)')
+
+
+def parse_color(value: str, default: str = '#000000') -> QColor:
+    """解析颜色字符串，支持 QColor 格式和样式表中的 rgb()/rgba()"""
+    match = _RGBA_RE.fullmatch(str(value).strip())
+    if match:
+        r, g, b, a = match.groups()
+        color = QColor(int(r), int(g), int(b))
+        if a is not None:
+            color.setAlphaF(float(a))
+        return color
+    color = QColor(value)
+    return color if color.isValid() else QColor(default)
+
 
 class StyleManager:
     """样式管理器"""
@@ -1,24 +1,22 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QSpacerItem, QSizePolicy, QGroupBox,
-    QRadioButton, QFileDialog, QScrollArea, QFrame
+    QRadioButton, QFileDialog, QScrollArea, QFrame,
+    QApplication, QComboBox
 )
 from PySide6.QtCore import Qt, QTimer, QMimeData, QUrl, QSize
 from PySide6.QtGui import (
     QDragEnterEvent, QDropEvent, QPixmap, 
     QPainter, QColor, QImage
 )
-from PySide6.QtMultimedia import QMediaPlayer, QMediaMetaData
-from PySide6.QtMultimediaWidgets import QVideoWidget
 import qtawesome as qta
 from utils.config import Config
 from utils.style import StyleManager
-from widgets.countdown_window import CountdownWindow
-from screensaver.screen_saver import ScreenSaver
+from screensaver.screen_saver import ScreenSaver, warm_up_multimedia
+from screensaver.manager import ScreenSaverManager
 from widgets.time_spinbox import TimeSpinBox
+from media.thumbnails import thumbnail_loader, filmstrip_frames
 import os
-import cv2
-import numpy as np
 
 class MediaDropArea(QWidget):
     """媒体文件拖放区域"""
@@ -33,6 +31,10 @@ class MediaDropArea(QWidget):
         self.setCursor(Qt.PointingHandCursor)
         self.init_ui()
         
+        # 视频预览时鼠标悬停拖动可以浏览胶片条，子控件也需要跟踪鼠标
+        for widget in (self, self.preview_container, self.preview_label):
+            widget.setMouseTracking(True)
+        
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -118,6 +120,18 @@ class MediaDropArea(QWidget):
             # 点击整个区域都可以选择文件
             self.choose_btn.click()
     
+    def mouseMoveEvent(self, event):
+        """悬停时按鼠标的水平位置浏览视频"""
+        if self.preview_container.isVisible() and self.width() > 0:
+            fraction = min(max(event.position().x() / self.width(), 0.0), 1.0)
+            self.control_panel.scrub_preview(fraction)
+        super().mouseMoveEvent(event)
+    
+    def leaveEvent(self, event):
+        """鼠标离开后恢复封面"""
+        self.control_panel.scrub_preview(None)
+        super().leaveEvent(event)
+    
     def update_preview(self, pixmap=None):
         """更新预览"""
         if pixmap:
@@ -185,10 +199,31 @@ class ControlPanel(QWidget):
         self.work_time = self.config.get('screensaver.work_duration', 25)
         self.break_time = self.config.get('screensaver.break_duration', 5)
         
+        # 屏保管理器负责提醒调度和休息流程，由 Application 持有，主窗口关闭后计时仍然继续
+        self.manager = getattr(QApplication.instance(), 'manager', None)
+        owns_manager = self.manager is None
+        if owns_manager:
+            self.manager = ScreenSaverManager(self)
+        self.manager.running_changed.connect(self.on_running_changed)
+        self.manager.break_started.connect(self.on_break_started)
+        self.manager.break_finished.connect(self.on_break_finished)
+        
+        self.preview_path = None
+        # 当前视频的胶片条和正在显示的格（None 表示显示封面）
+        self.filmstrip = None
+        self.scrub_index = None
+        thumbnail_loader().thumbnail_ready.connect(self.on_thumbnail_ready)
+        
         self.init_ui()
+        # 主窗口可能在计时开始后才创建，按当前状态显示按钮
+        self.on_running_changed(self.manager.is_running())
         
         # 初始化完成后更新预览
         QTimer.singleShot(100, self.update_preview)  # 使用延时确保组件已完全初始化
+        
+        # 等待窗口创建完成后恢复上次会话（共享的管理器由 Application 负责恢复）
+        if owns_manager and self.config.get('session.resume', True):
+            QTimer.singleShot(0, self.resume_session)
     
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -243,18 +278,31 @@ class ControlPanel(QWidget):
         media_type_layout = QHBoxLayout()
         self.image_radio = QRadioButton("图片")
         self.video_radio = QRadioButton("视频")
+        self.scene_radio = QRadioButton("场景")
         
         current_type = self.config.get('screensaver.media_type', 'image')
         if current_type == 'video':
             self.video_radio.setChecked(True)
+        elif current_type == 'scene':
+            self.scene_radio.setChecked(True)
         else:
             self.image_radio.setChecked(True)
         
         self.image_radio.toggled.connect(self.on_media_type_changed)
         self.video_radio.toggled.connect(self.on_media_type_changed)
+        self.scene_radio.toggled.connect(self.on_media_type_changed)
+        
+        # 程序绘制的休息场景，不需要媒体文件
+        self.scene_combo = QComboBox()
+        for name, label in (('ring', '剩余时间圆环'), ('breathing', '呼吸引导'), ('clock', '时钟')):
+            self.scene_combo.addItem(label, name)
+        index = self.scene_combo.findData(self.config.get('screensaver.scene', 'ring'))
+        self.scene_combo.setCurrentIndex(max(0, index))
+        self.scene_combo.currentIndexChanged.connect(self.on_scene_changed)
         
         media_type_layout.addWidget(self.image_radio)
         media_type_layout.addWidget(self.video_radio)
+        media_type_layout.addWidget(self.scene_radio)
         media_type_layout.addStretch()
         
         # 媒体文件选择区域
@@ -278,10 +326,21 @@ class ControlPanel(QWidget):
             }
         """)
         
+        # 媒体库按钮
+        library_button = QPushButton("媒体库")
+        library_button.clicked.connect(self.show_media_library)
+        library_button.setStyleSheet(preview_button.styleSheet())
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(library_button)
+        buttons_layout.addWidget(preview_button)
+        
         # 添加到屏保布局
         screensaver_layout.addLayout(media_type_layout)
         screensaver_layout.addWidget(self.drop_area)
-        screensaver_layout.addWidget(preview_button)
+        screensaver_layout.addWidget(self.scene_combo)
+        screensaver_layout.addLayout(buttons_layout)
+        self.update_media_controls()
         
         # 开始按钮
         self.start_button = QPushButton("开始专注", self)
@@ -319,94 +378,43 @@ class ControlPanel(QWidget):
     
     def toggle_timer(self):
         """切换计时器状态"""
-        if hasattr(self, 'work_timer') and self.work_timer.isActive():
+        if self.manager.is_running():
             self.stop_timer()
         else:
             self.start_timer()
     
     def start_timer(self):
         """开始计时"""
-        self.work_timer = QTimer(self)
-        self.work_timer.timeout.connect(self.start_break)
-        self.work_timer.start(self.work_time * 60 * 1000)  # 转换为毫秒
-        
-        # 创建并显示倒计时窗口
-        self.countdown_window = CountdownWindow(self.work_time)
-        self.countdown_window.show()
-        
-        self.start_button.setText("停止专注")
-        self.start_button.setIcon(qta.icon('fa5s.stop-circle', color='white'))
+        self.manager.start()
     
     def stop_timer(self):
         """停止计时"""
-        # 停止所有计时器
-        if hasattr(self, 'work_timer'):
-            self.work_timer.stop()
-        if hasattr(self, 'break_timer'):
-            self.break_timer.stop()
-        
-        # 关闭所有窗口
-        if hasattr(self, 'countdown_window'):
-            self.countdown_window.close()
-        if hasattr(self, 'break_countdown'):
-            self.break_countdown.close()
-        if hasattr(self, 'screen_saver'):
-            self.screen_saver.closing_by_hotkey = True
-            self.screen_saver.close()
-        
-        # 重置按钮状态
-        self.start_button.setText("开始专注")
-        self.start_button.setIcon(qta.icon('fa5s.play-circle', color='white'))
+        self.manager.stop()
     
-    def start_break(self):
-        """开始休息"""
-        # 停止工作计时器和倒计时窗口
-        self.work_timer.stop()
-        if hasattr(self, 'countdown_window'):
-            self.countdown_window.close()
-        
-        # 创建并显示屏保
-        self.screen_saver = ScreenSaver()
-        self.screen_saver.show()
-        
+    def resume_session(self):
+        """根据会话日志恢复上次未完成的计时"""
+        self.manager.resume_session()
+    
+    def on_running_changed(self, running):
+        """更新开始按钮状态"""
+        if running:
+            self.start_button.setText("停止专注")
+            self.start_button.setIcon(qta.icon('fa5s.stop-circle', color='white'))
+        else:
+            self.start_button.setText("开始专注")
+            self.start_button.setIcon(qta.icon('fa5s.play-circle', color='white'))
+    
+    def on_break_started(self):
+        """休息开始"""
         # 设置主窗口不可关闭
         self.window().can_close = False
-        
-        # 创建并显示休息倒计时窗口
-        self.break_countdown = CountdownWindow(self.break_time)
-        self.break_countdown.setWindowTitle("休息时间")
-        self.break_countdown.show()
-        
-        # 设置休息计时器
-        self.break_timer = QTimer(self)
-        self.break_timer.timeout.connect(self.end_break)
-        self.break_timer.start(self.break_time * 60 * 1000)
-        
         # 通知主窗口
         self.window().on_break_started()
     
-    def end_break(self):
-        """结束休息"""
-        # 停止休息计时器和关闭休息倒计时窗口
-        self.break_timer.stop()
-        if hasattr(self, 'break_countdown'):
-            self.break_countdown.close()
-        
-        # 关闭屏保
-        if hasattr(self, 'screen_saver'):
-            self.screen_saver.closing_by_hotkey = True
-            self.screen_saver.close()
-        
-        # 创建新的工作倒计时窗口
-        self.countdown_window = CountdownWindow(self.work_time)
-        self.countdown_window.show()
-        
-        # 重新开始工作计时器
-        self.work_timer.start()
-        
+    def on_break_finished(self):
+        """休息结束"""
         # 恢复主窗口可关闭状态
         self.window().can_close = True
-        
         # 通知主窗口
         self.window().on_break_finished()
     
@@ -414,31 +422,62 @@ class ControlPanel(QWidget):
         """工作时间改变"""
         self.work_time = value
         self.config.set('screensaver.work_duration', value)
+        self.manager.reload_rules()
     
     def on_break_time_changed(self, value):
         """休息时间改变"""
         self.break_time = value
         self.config.set('screensaver.break_duration', value)
+        self.manager.reload_rules()
     
     def on_media_type_changed(self, checked):
         """媒体类型改变时更新预览"""
         if checked:  # 只处理选中的事件
-            media_type = 'video' if self.video_radio.isChecked() else 'image'
+            if self.scene_radio.isChecked():
+                media_type = 'scene'
+            else:
+                media_type = 'video' if self.video_radio.isChecked() else 'image'
             self.config.set('screensaver.media_type', media_type)
-            self.update_preview()  # 更新预览
+            self.update_media_controls()
+            if media_type != 'scene':
+                self.update_preview()  # 更新预览
+    
+    def on_scene_changed(self, index):
+        """休息场景改变"""
+        self.config.set('screensaver.scene', self.scene_combo.itemData(index))
+    
+    def update_media_controls(self):
+        """场景模式下用场景选择替换媒体文件区域"""
+        scene = self.scene_radio.isChecked()
+        self.drop_area.setVisible(not scene)
+        self.scene_combo.setVisible(scene)
     
     def preview_screensaver(self):
         """预览屏保"""
-        # 如果有正在播放的视频，先停止
-        if hasattr(self, 'media_player'):
-            self.media_player.stop()
-        
         self.preview_saver = ScreenSaver()
         self.preview_saver.preview_mode = True
         self.preview_saver.closed.connect(self.on_preview_closed)
         self.preview_saver.show()
         self.window().hide()
     
+    def show_media_library(self):
+        """打开媒体库选择屏保文件（第一次打开时才导入和扫描）"""
+        from widgets.media_library import MediaLibraryDialog
+        dialog = MediaLibraryDialog(self)
+        dialog.media_selected.connect(self.on_library_media_selected)
+        dialog.exec()
+        dialog.deleteLater()
+    
+    def on_library_media_selected(self, path, kind):
+        """切换到对应的媒体类型并使用选中的文件"""
+        self.config.set('screensaver.media_path', path)
+        radio = self.video_radio if kind == 'video' else self.image_radio
+        if radio.isChecked():
+            self.update_preview()
+        else:
+            # 切换类型时会更新预览
+            radio.setChecked(True)
+    
     def on_preview_closed(self):
         """预览结束"""
         self.window().show()
@@ -449,6 +488,7 @@ class ControlPanel(QWidget):
     def handle_dropped_file(self, file_path):
         """处理拖放的文件"""
         if self.check_file_type(file_path):
+            file_path = self.find_library_duplicate(file_path)
             self.config.set('screensaver.media_path', file_path)
             self.update_preview()
         else:
@@ -456,115 +496,169 @@ class ControlPanel(QWidget):
             QMessageBox.warning(
                 self,
                 "文件类型错误",
-                "请选择正确的文件类型：\n图片模式：jpg、jpeg、png、bmp\n视频模式：mp4、avi、mkv"
+                "请选择正确的文件类型：\n图片模式：jpg、jpeg、png、bmp、gif、webp、apng\n视频模式：mp4、avi、mkv"
             )
     
+    def find_library_duplicate(self, file_path):
+        """媒体库中已有相似文件（不同分辨率或格式的同一张图）时询问是否使用已有文件
+
+        只匹配当前模式的文件类型。哈希在界面线程上计算（只读取这一个文件），
+        哈希索引只在第一次查找或媒体库变化后重建
+
+        Returns:
+            最终使用的文件路径
+        """
+        if not self.config.get('media_library.folders', []):
+            return file_path
+        from media.library import media_library
+        max_distance = self.config.get('media_library.duplicate_distance', 6)
+        kind = 'video' if self.video_radio.isChecked() else 'image'
+        similar = media_library().find_similar(file_path, max_distance, kind)
+        if not similar:
+            return file_path
+        
+        from PySide6.QtWidgets import QMessageBox
+        existing = similar[0][1]
+        reply = QMessageBox.question(
+            self,
+            "发现相似文件",
+            f"媒体库中已有相似的文件：\n{existing}\n\n是否使用已有文件？"
+        )
+        return existing if reply == QMessageBox.Yes else file_path
+    
     def update_preview(self):
-        """更新预览"""
+        """更新预览（缩略图在后台生成，生成前显示占位图）"""
         media_path = self.config.get('screensaver.media_path', '')
         if not media_path or not os.path.exists(media_path):
             # 显示默认状态
+            self.preview_path = None
             self.drop_area.update_preview(None)
             return
         
+        self.preview_path = media_path
+        self.filmstrip = thumbnail_loader().filmstrip(media_path)
+        self.scrub_index = None
+        image = thumbnail_loader().request(media_path)
+        if image is not None:
+            self.show_thumbnail(media_path, image)
+        elif self.video_radio.isChecked():
+            self._show_placeholder_preview(media_path, 'fa5s.film')
+        else:
+            self._show_placeholder_preview(media_path, 'fa5s.image')
+        
+        if self.video_radio.isChecked():
+            # 选择了视频，提前初始化多媒体后端，休息开始时不再卡顿
+            QTimer.singleShot(0, warm_up_multimedia)
+            # 视频超过屏幕尺寸或帧率时在后台生成播放用的代理
+            from media.proxy import proxy_transcoder
+            proxy_transcoder().request(media_path)
+    
+    def on_thumbnail_ready(self, path, image):
+        """后台缩略图生成完成"""
+        # 忽略已经被替换的文件，无法生成缩略图时保留占位图
+        if path == self.preview_path and not image.isNull():
+            self.filmstrip = thumbnail_loader().filmstrip(path)
+            self.scrub_index = None
+            self.show_thumbnail(path, image)
+    
+    def scrub_preview(self, fraction):
+        """显示胶片条中对应位置的帧，fraction 为 None 时恢复封面"""
+        if self.filmstrip is None or not self.video_radio.isChecked():
+            return
+        frames = filmstrip_frames(self.filmstrip)
+        index = None if fraction is None else min(int(fraction * frames), frames - 1)
+        if index == self.scrub_index:
+            return
+        self.scrub_index = index
+        
+        if index is None:
+            image = thumbnail_loader().request(self.preview_path)
+            if image is not None:
+                self.show_thumbnail(self.preview_path, image)
+        else:
+            width = self.filmstrip.width() // frames
+            frame = self.filmstrip.copy(index * width, 0, width, self.filmstrip.height())
+            self._show_video_preview(self.preview_path, frame)
+    
+    def show_thumbnail(self, media_path, image):
         if self.image_radio.isChecked():
-            # 显示图片预览
-            pixmap = QPixmap(media_path)
-            self.drop_area.update_preview(pixmap)
+            self.drop_area.update_preview(QPixmap.fromImage(image))
         else:
-            try:
-                # 使用 OpenCV 获取视频第一帧作为缩略图
-                cap = cv2.VideoCapture(media_path)
-                ret, frame = cap.read()
-                cap.release()
-                
-                if ret:
-                    # 转换 BGR 到 RGB
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    height, width, channel = frame.shape
-                    
-                    # 创建预览图
-                    preview = QPixmap(self.drop_area.width() - 40, self.drop_area.height() - 40)
-                    preview.fill(Qt.transparent)
-                    
-                    # 在预览图上绘制视频帧和文件信息
-                    painter = QPainter(preview)
-                    painter.setRenderHint(QPainter.Antialiasing)
-                    
-                    # 绘制背景
-                    painter.setBrush(QColor('#F5F5F7'))
-                    painter.setPen(Qt.NoPen)
-                    painter.drawRoundedRect(0, 0, preview.width(), preview.height(), 8, 8)
-                    
-                    # 计算缩放后的视频帧大小
-                    frame_height = preview.height() - 60  # 留出空间显示文件名
-                    frame_width = int(frame_height * width / height)
-                    if frame_width > preview.width() - 20:
-                        frame_width = preview.width() - 20
-                        frame_height = int(frame_width * height / width)
-                    
-                    # 转换帧为 QPixmap
-                    bytes_per_line = 3 * width
-                    q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
-                    frame_pixmap = QPixmap.fromImage(q_img).scaled(
-                        frame_width, frame_height,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    
-                    # 绘制视频帧
-                    frame_x = (preview.width() - frame_width) // 2
-                    frame_y = (preview.height() - frame_height - 30) // 2
-                    painter.drawPixmap(frame_x, frame_y, frame_pixmap)
-                    
-                    # 添加半透明遮罩
-                    painter.setBrush(QColor(0, 0, 0, 100))
-                    painter.drawRect(frame_x, frame_y, frame_width, frame_height)
-                    
-                    # 绘制播放图标（调整大小和位置）
-                    play_icon = qta.icon(
-                        'fa5s.play-circle',
-                        color='white',
-                        opacity=0.9
-                    ).pixmap(QSize(32, 32))
-                    
-                    # 将播放图标放在视频帧的右下角
-                    margin = 10
-                    play_x = frame_x + frame_width - play_icon.width() - margin
-                    play_y = frame_y + frame_height - play_icon.height() - margin
-                    painter.drawPixmap(play_x, play_y, play_icon)
-                    
-                    # 绘制文件名（移到底部）
-                    file_name = os.path.basename(media_path)
-                    if len(file_name) > 30:
-                        file_name = file_name[:27] + "..."
-                    
-                    painter.setPen(QColor('#666666'))
-                    font = painter.font()
-                    font.setPointSize(10)
-                    painter.setFont(font)
-                    
-                    text_rect = painter.fontMetrics().boundingRect(file_name)
-                    text_x = (preview.width() - text_rect.width()) // 2
-                    text_y = frame_y + frame_height + 20  # 调整文件名位置
-                    painter.drawText(text_x, text_y, file_name)
-                    
-                    painter.end()
-                    self.drop_area.update_preview(preview)
-                else:
-                    # 如果无法获取视频帧，显示默认图标
-                    self._show_default_video_preview(media_path)
-            except Exception as e:
-                print(f"Error generating video preview: {e}")
-                self._show_default_video_preview(media_path)
-            
-            # 预加载视频但不显示
-            if not hasattr(self, 'media_player'):
-                self.media_player = QMediaPlayer()
-            self.media_player.setSource(QUrl.fromLocalFile(media_path))
+            self._show_video_preview(media_path, image)
+    
+    def _show_video_preview(self, media_path, image):
+        """在视频缩略图上绘制播放图标和文件名"""
+        width, height = image.width(), image.height()
+        
+        # 创建预览图
+        preview = QPixmap(self.drop_area.width() - 40, self.drop_area.height() - 40)
+        preview.fill(Qt.transparent)
+        
+        # 在预览图上绘制视频帧和文件信息
+        painter = QPainter(preview)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # 绘制背景
+        painter.setBrush(QColor('#F5F5F7'))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(0, 0, preview.width(), preview.height(), 8, 8)
+        
+        # 计算缩放后的视频帧大小
+        frame_height = preview.height() - 60  # 留出空间显示文件名
+        frame_width = int(frame_height * width / height)
+        if frame_width > preview.width() - 20:
+            frame_width = preview.width() - 20
+            frame_height = int(frame_width * height / width)
+        
+        # 缩略图已经很小，这里的缩放开销可以忽略
+        frame_pixmap = QPixmap.fromImage(image).scaled(
+            frame_width, frame_height,
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        )
+        
+        # 绘制视频帧
+        frame_x = (preview.width() - frame_width) // 2
+        frame_y = (preview.height() - frame_height - 30) // 2
+        painter.drawPixmap(frame_x, frame_y, frame_pixmap)
+        
+        # 添加半透明遮罩
+        painter.setBrush(QColor(0, 0, 0, 100))
+        painter.drawRect(frame_x, frame_y, frame_width, frame_height)
+        
+        # 绘制播放图标（调整大小和位置）
+        play_icon = qta.icon(
+            'fa5s.play-circle',
+            color='white',
+            opacity=0.9
+        ).pixmap(QSize(32, 32))
+        
+        # 将播放图标放在视频帧的右下角
+        margin = 10
+        play_x = frame_x + frame_width - play_icon.width() - margin
+        play_y = frame_y + frame_height - play_icon.height() - margin
+        painter.drawPixmap(play_x, play_y, play_icon)
+        
+        # 绘制文件名（移到底部）
+        file_name = os.path.basename(media_path)
+        if len(file_name) > 30:
+            file_name = file_name[:27] + "..."
+        
+        painter.setPen(QColor('#666666'))
+        font = painter.font()
+        font.setPointSize(10)
+        painter.setFont(font)
+        
+        text_rect = painter.fontMetrics().boundingRect(file_name)
+        text_x = (preview.width() - text_rect.width()) // 2
+        text_y = frame_y + frame_height + 20  # 调整文件名位置
+        painter.drawText(text_x, text_y, file_name)
+        
+        painter.end()
+        self.drop_area.update_preview(preview)
     
-    def _show_default_video_preview(self, media_path):
-        """显示默认的视频预览"""
+    def _show_placeholder_preview(self, media_path, icon_name):
+        """显示占位预览（缩略图生成前或无法读取文件时）"""
         preview = QPixmap(self.drop_area.width() - 40, self.drop_area.height() - 40)
         preview.fill(Qt.transparent)
         
@@ -576,8 +670,8 @@ class ControlPanel(QWidget):
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(0, 0, preview.width(), preview.height(), 8, 8)
         
-        # 绘制视频图标
-        video_icon = qta.icon('fa5s.film', color='#666666').pixmap(QSize(64, 64))
+        # 绘制文件类型图标
+        video_icon = qta.icon(icon_name, color='#666666').pixmap(QSize(64, 64))
         icon_x = (preview.width() - video_icon.width()) // 2
         icon_y = (preview.height() - video_icon.height()) // 2 - 20
         painter.drawPixmap(icon_x, icon_y, video_icon)
@@ -602,7 +696,9 @@ class ControlPanel(QWidget):
     
     def choose_media_file(self):
         """选择媒体文件"""
-        file_filter = "图片文件 (*.jpg *.jpeg *.png *.bmp);;视频文件 (*.mp4 *.avi *.mkv)" if self.image_radio.isChecked() else "视频文件 (*.mp4 *.avi *.mkv);;图片文件 (*.jpg *.jpeg *.png *.bmp)"
+        image_filter = "图片文件 (*.jpg *.jpeg *.png *.bmp *.gif *.webp *.apng)"
+        video_filter = "视频文件 (*.mp4 *.avi *.mkv)"
+        file_filter = f"{image_filter};;{video_filter}" if self.image_radio.isChecked() else f"{video_filter};;{image_filter}"
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "选择媒体文件",
@@ -617,6 +713,6 @@ class ControlPanel(QWidget):
         """检查文件类型是否匹配当前模式"""
         ext = os.path.splitext(file_path)[1].lower()
         if self.image_radio.isChecked():
-            return ext in ['.jpg', '.jpeg', '.png', '.bmp']
+            return ext in ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.apng']
         else:
             return ext in ['.mp4', '.avi', '.mkv'] 
\ No newline at end of file
@@ -1,15 +1,88 @@
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QColor
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QTimer, QRect, QPointF
+from PySide6.QtGui import QFont, QFontMetrics, QPainter, QPixmap, QStaticText
 from utils.config import Config
+from utils.style import parse_color
+from utils.perf import TimingStats, CpuMeter
+import logging
+import math
+import time
+
+GLYPHS = '0123456789:'
+
+
+class GlyphCache:
+    """
+    倒计时字形缓存
+    每种 字体/字号/颜色/缩放比例 只渲染一次所有数字和冒号，
+    之后每次刷新只需要贴图，不再进行文字排版
+    """
+    _cache = {}
+
+    @classmethod
+    def get(cls, family, size, color, dpr=1.0):
+        key = (family, size, color.rgba(), dpr)
+        if key not in cls._cache:
+            cls._cache[key] = cls(family, size, color, dpr)
+        return cls._cache[key]
+
+    def __init__(self, family, size, color, dpr):
+        self.font = QFont(family, size, QFont.Bold)
+        metrics = QFontMetrics(self.font)
+        self.height = metrics.height()
+        # 数字使用统一宽度，避免刷新时文字左右跳动
+        self.digit_width = max(metrics.horizontalAdvance(ch) for ch in '0123456789')
+        self.colon_width = metrics.horizontalAdvance(':')
+
+        self.pixmaps = {}
+        for ch in GLYPHS:
+            width = self.cell_width(ch)
+            pixmap = QPixmap(math.ceil(width * dpr), math.ceil(self.height * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.TextAntialiasing)
+            painter.setFont(self.font)
+            painter.setPen(color)
+            painter.drawText(QRect(0, 0, width, self.height), Qt.AlignCenter, ch)
+            painter.end()
+            self.pixmaps[ch] = pixmap
+
+    def cell_width(self, ch):
+        return self.colon_width if ch == ':' else self.digit_width
+
 
 class CountdownWindow(QWidget):
-    """透明倒计时窗口"""
-    def __init__(self, total_minutes, parent=None):
+    """
+    透明倒计时窗口
+    每个屏幕只创建一个，通过切换模式显示工作倒计时、休息提醒和休息剩余时间，
+    不再在每个周期创建和销毁窗口
+    """
+    MODE_WORK = 'work'
+    MODE_WARNING = 'warning'
+    MODE_BREAK = 'break'
+
+    CAPTIONS = {
+        MODE_WORK: '',
+        MODE_WARNING: '即将开始休息',
+        MODE_BREAK: '休息中',
+    }
+
+    def __init__(self, screen=None, parent=None):
         super().__init__(parent)
-        self.total_seconds = total_minutes * 60
-        self.current_seconds = self.total_seconds
-        
+        self.mode = self.MODE_WORK
+        self.current_seconds = 0
+        self.warning_seconds = 0
+        # 按截止时间计算剩余秒数，避免定时器误差累积
+        self.deadline = time.monotonic()
+        self.text = ''
+        self.cells = []
+        self.caption = QStaticText()
+
+        self.logger = logging.getLogger('CountdownWindow')
+        self.paint_stats = TimingStats('countdown paint')
+        self.cpu_meter = CpuMeter()
+
         # 设置窗口标志
         self.setWindowFlags(
             Qt.FramelessWindowHint |
@@ -19,78 +92,170 @@ class CountdownWindow(QWidget):
         )
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_ShowWithoutActivating)  # 显示时不激活窗口
-        
+
         self.config = Config()
-        
+        self.target_screen = screen
+
         self.init_ui()
         self.setup_timer()
-        
+
     def init_ui(self):
-        # 创建布局
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 从配置中获取样式
-        font_family = self.config.get('countdown.font_family', 'SF Pro Display')
-        font_size = self.config.get('countdown.font_size', 48)
-        color = self.config.get('countdown.color', 'rgba(0, 122, 255, 0.8)')
-        opacity = self.config.get('countdown.opacity', 0.8)
-        
-        # 创建时间标签
-        self.time_label = QLabel()
-        self.time_label.setAlignment(Qt.AlignCenter)
-        self.time_label.setFont(QFont(font_family, font_size, QFont.Bold))
-        self.time_label.setStyleSheet(f"""
-            QLabel {{
-                color: {color};
-                background: transparent;
-            }}
-        """)
-        
-        layout.addWidget(self.time_label)
-        
         # 设置窗口大小和位置
         self.resize(200, 120)
+        self.reload_style()
         self.move_to_corner()
-        
-        self.update_time_display()
-        
+
+    def reload_style(self):
+        """从配置中获取样式"""
+        self.font_family = self.config.get('countdown.font_family', 'SF Pro Display')
+        self.font_size = self.config.get('countdown.font_size', 48)
+        self.color = parse_color(self.config.get('countdown.color', 'rgba(0, 122, 255, 0.8)'))
+
+        self.caption_font = QFont(self.font_family, 12)
+        self.caption.setText(self.CAPTIONS.get(self.mode, ''))
+        self.caption.prepare(font=self.caption_font)
+
         # 设置窗口透明度
-        self.setWindowOpacity(opacity)
-    
+        self.setWindowOpacity(self.config.get('countdown.opacity', 0.8))
+        if self.text:
+            self.cells = self.layout_cells(self.text)
+        self.update()
+
+    def glyphs(self):
+        return GlyphCache.get(self.font_family, self.font_size, self.color, self.devicePixelRatioF())
+
     def setup_timer(self):
         """设置定时器"""
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1000)  # 每秒更新一次
         self.timer.timeout.connect(self.update_countdown)
-        self.timer.start(1000)  # 每秒更新一次
-    
+
+    def start(self, mode, remaining_seconds, warning_seconds=0):
+        """切换模式并开始倒计时
+
+        Args:
+            mode: 显示模式（work / warning / break）
+            remaining_seconds: 剩余秒数
+            warning_seconds: 工作模式下剩余时间少于该值时自动切换为提醒模式
+        """
+        self.current_seconds = max(0, math.ceil(remaining_seconds))
+        self.deadline = time.monotonic() + remaining_seconds
+        self.warning_seconds = warning_seconds
+        self.set_mode(mode)
+        # 统计只覆盖当前周期，没有经过 stop() 直接开始新周期时先输出上一个周期
+        if self.isVisible():
+            self.log_stats()
+        self.paint_stats.reset()
+        self.cpu_meter.reset()
+        # 每个周期开始时读取一次样式，设置窗口中的修改无需重启即可生效
+        self.reload_style()
+        self.update_time_display()
+
+        self.timer.start()
+        self.move_to_corner()
+        self.show()
+        self.raise_()
+
+    def stop(self):
+        """停止倒计时并隐藏（窗口保留以便下次复用）"""
+        self.timer.stop()
+        if self.isVisible():
+            self.log_stats()
+        self.hide()
+
+    def set_mode(self, mode):
+        if mode == self.mode:
+            return
+        self.mode = mode
+        self.caption.setText(self.CAPTIONS.get(mode, ''))
+        self.caption.prepare(font=self.caption_font)
+        self.update()
+
     def update_countdown(self):
         """更新倒计时"""
-        self.current_seconds -= 1
+        self.current_seconds = max(0, math.ceil(self.deadline - time.monotonic()))
         if self.current_seconds <= 0:
-            self.timer.stop()
-            self.close()
+            self.stop()
+            return
+        if self.mode == self.MODE_WORK and self.current_seconds <= self.warning_seconds:
+            self.set_mode(self.MODE_WARNING)
         self.update_time_display()
-    
+
     def update_time_display(self):
-        """更新显示的时间"""
+        """更新显示的时间，只重绘发生变化的字符"""
         minutes = self.current_seconds // 60
         seconds = self.current_seconds % 60
-        self.time_label.setText(f"{minutes:02d}:{seconds:02d}")
-    
+        text = f"{minutes:02d}:{seconds:02d}"
+        if text == self.text:
+            return
+
+        old_text, old_cells = self.text, self.cells
+        self.text = text
+        self.cells = self.layout_cells(text)
+
+        if len(old_text) != len(text):
+            self.update()
+            return
+        for i, (old, new) in enumerate(zip(old_text, text)):
+            if old != new:
+                self.update(self.cells[i].united(old_cells[i]))
+
+    def layout_cells(self, text):
+        """计算每个字符在窗口中的位置（整体居中）"""
+        glyphs = self.glyphs()
+        total = sum(glyphs.cell_width(ch) for ch in text)
+        x = (self.width() - total) // 2
+        y = (self.height() - glyphs.height) // 2
+        cells = []
+        for ch in text:
+            width = glyphs.cell_width(ch)
+            cells.append(QRect(x, y, width, glyphs.height))
+            x += width
+        return cells
+
+    def paintEvent(self, event):
+        with self.paint_stats.measure():
+            glyphs = self.glyphs()
+            painter = QPainter(self)
+            region = event.region()
+            for ch, rect in zip(self.text, self.cells):
+                if region.intersects(rect):
+                    painter.drawPixmap(rect.topLeft(), glyphs.pixmaps[ch])
+
+            if self.caption.text() and self.cells:
+                size = self.caption.size()
+                x = (self.width() - size.width()) / 2
+                y = self.cells[0].bottom() + 4
+                if region.intersects(QRect(int(x), int(y), int(size.width()) + 1, int(size.height()) + 1)):
+                    painter.setFont(self.caption_font)
+                    painter.setPen(self.color)
+                    painter.drawStaticText(QPointF(x, y), self.caption)
+            painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.text:
+            self.cells = self.layout_cells(self.text)
+
     def move_to_corner(self):
-        """移动到屏幕右上角"""
-        screen = self.screen()
+        """移动到所在屏幕右上角"""
+        screen = self.target_screen or self.screen()
         screen_geometry = screen.geometry()
-        
+
         # 计算位置（右上角，留出一定边距）
-        x = screen_geometry.width() - self.width() - 40
-        y = 40
-        
+        x = screen_geometry.x() + screen_geometry.width() - self.width() - 40
+        y = screen_geometry.y() + 40
+
         self.move(x, y)
-    
+
+    def log_stats(self):
+        """输出绘制耗时和 CPU 占用"""
+        self.logger.debug(f'{self.paint_stats.summary()}, {self.cpu_meter.summary()}')
+
     def closeEvent(self, event):
         """窗口关闭时停止计时器"""
         if hasattr(self, 'timer'):
             self.timer.stop()
-        event.accept() 
\ No newline at end of file
+        self.log_stats()
+        event.accept()
@@ -0,0 +1,47 @@
+from PySide6.QtWidgets import QApplication, QCompleter
+from PySide6.QtCore import Qt, QStringListModel
+from PySide6.QtGui import QFontDatabase
+
+# 常用字体排在列表前面
+PREFERRED_FONTS = [
+    "SF Pro Display",
+    "Microsoft YaHei",
+    "Arial",
+    "Helvetica Neue",
+    "PingFang SC",
+    "-apple-system"
+]
+
+_model = None
+
+
+def font_model():
+    """获取共享的系统字体列表模型
+
+    第一次调用时才读取系统字体，之后所有字体选择框共用同一个模型
+    """
+    global _model
+    if _model is None:
+        families = QFontDatabase.families()
+        available = set(families)
+        preferred = [font for font in PREFERRED_FONTS if font in available]
+        others = [font for font in families if font not in set(preferred)]
+        # 挂在 QApplication 上，生命周期与应用相同
+        _model = QStringListModel(preferred + others, QApplication.instance())
+    return _model
+
+
+def setup_font_combo(combo):
+    """让下拉框使用共享字体模型，并支持输入关键字过滤"""
+    combo.setModel(font_model())
+    combo.setEditable(True)
+    combo.setInsertPolicy(combo.InsertPolicy.NoInsert)
+    # 字体很多时避免逐项计算行高
+    if hasattr(combo.view(), 'setUniformItemSizes'):
+        combo.view().setUniformItemSizes(True)
+
+    completer = QCompleter(font_model(), combo)
+    completer.setCaseSensitivity(Qt.CaseInsensitive)
+    completer.setFilterMode(Qt.MatchContains)
+    completer.setCompletionMode(QCompleter.PopupCompletion)
+    combo.setCompleter(completer)
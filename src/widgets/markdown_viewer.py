@@ -1,12 +1,97 @@
 from PySide6.QtWidgets import QTextBrowser
-from PySide6.QtCore import Qt
-import markdown
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
+from utils.lazy import lazy_import
+from utils.paths import cache_dir
+import hashlib
+import logging
 import os
 
+markdown = lazy_import('markdown')
+
+EXTENSIONS = ['fenced_code', 'tables', 'nl2br']
+
+_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
+
+
+def decode_text(data):
+    """根据 BOM 判断编码，没有 BOM 时按 UTF-8 解码，失败则按 GBK 解码"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding)
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('gbk', errors='replace')
+
+
+def render_markdown(text):
+    """渲染 Markdown，结果按内容哈希缓存在磁盘上"""
+    key = hashlib.sha1(
+        ('|'.join(EXTENSIONS) + '\n' + text).encode('utf-8')
+    ).hexdigest()
+    path = os.path.join(cache_dir('markdown'), f'{key}.html')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    html = markdown.markdown(text, extensions=EXTENSIONS)
+    try:
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.getLogger('MarkdownViewer').warning(f'Error caching rendered markdown: {e}')
+    return html
+
+
+class _RenderSignals(QObject):
+    finished = Signal(int, str)
+
+
+class _RenderTask(QRunnable):
+    """在线程池中读取并渲染 Markdown"""
+    def __init__(self, generation, text=None, paths=(), fallback=''):
+        super().__init__()
+        self.generation = generation
+        self.text = text
+        self.paths = paths
+        self.fallback = fallback
+        self.signals = _RenderSignals()
+
+    def run(self):
+        try:
+            text = self.text
+            if text is None:
+                text = self.fallback
+                for path in self.paths:
+                    if os.path.exists(path):
+                        with open(path, 'rb') as f:
+                            text = decode_text(f.read())
+                        break
+            html = render_markdown(text)
+        except Exception as e:
+            logging.getLogger('MarkdownViewer').error(f'Error rendering markdown: {e}')
+            html = f'<h1>错误</h1><p>加载内容失败：{e}</p>'
+        self.signals.finished.emit(self.generation, html)
+
+
 class MarkdownViewer(QTextBrowser):
-    """Markdown 查看器组件"""
+    """
+    Markdown 查看器组件
+    内容在第一次显示时才在后台线程中读取和渲染，不显示的页面不产生开销
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.generation = 0
+        self.pending = None
+        self.running = {}
         self.setOpenExternalLinks(True)
         self.setStyleSheet("""
             QTextBrowser {
@@ -55,9 +140,34 @@ class MarkdownViewer(QTextBrowser):
         """)
     
     def set_markdown(self, text):
-        """设置并渲染 Markdown 内容"""
-        html = markdown.markdown(
-            text,
-            extensions=['fenced_code', 'tables', 'nl2br']
-        )
-        self.setHtml(html) 
\ No newline at end of file
+        """设置 Markdown 内容，显示时渲染"""
+        self._schedule(_RenderTask(self.generation + 1, text=text))
+
+    def set_markdown_file(self, paths, fallback=''):
+        """设置 Markdown 文件（按顺序使用第一个存在的路径），文件都不存在时显示 fallback"""
+        self._schedule(_RenderTask(self.generation + 1, paths=list(paths), fallback=fallback))
+
+    def _schedule(self, task):
+        self.generation = task.generation
+        self.pending = task
+        if self.isVisible():
+            self._start_pending()
+
+    def _start_pending(self):
+        task, self.pending = self.pending, None
+        if task is None:
+            return
+        # 保留引用，避免信号对象在任务完成前被回收
+        self.running[task.generation] = task
+        task.signals.finished.connect(self._on_rendered)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_rendered(self, generation, html):
+        self.running.pop(generation, None)
+        # 渲染期间内容又被替换时丢弃旧结果
+        if generation == self.generation:
+            self.setHtml(html)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._start_pending() 
\ No newline at end of file
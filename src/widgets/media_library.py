@@ -0,0 +1,202 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListView,
+    QFileDialog, QAbstractItemView
+)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, Signal
+from PySide6.QtGui import QPixmap
+from collections import OrderedDict
+from media.library import media_library, GRID_THUMBNAIL_SIZE
+from utils.config import Config
+import qtawesome as qta
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes}:{seconds:02d}'
+
+
+class MediaLibraryModel(QAbstractListModel):
+    """
+    媒体库列表模型
+    通过 canFetchMore/fetchMore 分页读取，只有视图请求图标（即可见）的条目才加载缩略图，
+    内存中最多保留 MAX_ICONS 个缩略图
+    """
+    PathRole = Qt.UserRole + 1
+    KindRole = Qt.UserRole + 2
+
+    BATCH_SIZE = 200
+    MAX_ICONS = 500
+
+    def __init__(self, library, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.rows = []
+        self.row_of_id = {}
+        self.total = library.count()
+        self.icons = OrderedDict()
+        self.placeholders = {
+            'image': qta.icon('fa5s.image', color='#CCCCCC').pixmap(GRID_THUMBNAIL_SIZE),
+            'video': qta.icon('fa5s.film', color='#CCCCCC').pixmap(GRID_THUMBNAIL_SIZE),
+        }
+        library.changed.connect(self.reload)
+        library.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        batch = self.library.fetch(len(self.rows), self.BATCH_SIZE)
+        if not batch:
+            self.total = len(self.rows)
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        for offset, row in enumerate(batch):
+            self.row_of_id[row[0]] = first + offset
+        self.rows.extend(batch)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        media_id, path, name, kind, width, height, duration, codec = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.DecorationRole:
+            icon = self.icons.get(media_id)
+            if icon is not None:
+                self.icons.move_to_end(media_id)
+                return icon
+            self.library.request_thumbnail(media_id, path)
+            return self.placeholders[kind]
+        if role == Qt.ToolTipRole:
+            parts = [path, f'{width} x {height}']
+            if duration:
+                parts.append(format_duration(duration))
+            if codec:
+                parts.append(codec)
+            return '\n'.join(parts)
+        if role == self.PathRole:
+            return path
+        if role == self.KindRole:
+            return kind
+        return None
+
+    def reload(self):
+        """媒体库扫描完成后从第一页重新读取（每次扫描只触发一次）"""
+        self.beginResetModel()
+        self.rows = []
+        self.row_of_id = {}
+        self.icons.clear()
+        self.total = self.library.count()
+        self.endResetModel()
+
+    def on_thumbnail_ready(self, media_id, image):
+        row = self.row_of_id.get(media_id)
+        if row is None:
+            return
+        kind = self.rows[row][3]
+        # 无法生成缩略图时保留占位图，不再重复请求
+        self.icons[media_id] = self.placeholders[kind] if image.isNull() else QPixmap.fromImage(image)
+        while len(self.icons) > self.MAX_ICONS:
+            self.icons.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class MediaLibraryDialog(QDialog):
+    """媒体库窗口，双击或点击“使用”选择屏保文件"""
+    media_selected = Signal(str, str)  # path, kind
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config = Config()
+        self.library = media_library()
+        self.setWindowTitle("媒体库")
+        self.resize(720, 520)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(12)
+
+        # 顶部：文件夹信息和添加按钮
+        top_layout = QHBoxLayout()
+        self.folder_label = QLabel()
+        self.folder_label.setStyleSheet("color: #666666;")
+        add_button = QPushButton("添加文件夹")
+        add_button.setIcon(qta.icon('fa5s.folder-plus', color='#333333'))
+        add_button.clicked.connect(self.add_folder)
+        top_layout.addWidget(self.folder_label)
+        top_layout.addStretch()
+        top_layout.addWidget(add_button)
+
+        # 缩略图网格，固定条目尺寸，滚动时只布局和绘制可见的条目
+        self.model = MediaLibraryModel(self.library, self)
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setMovement(QListView.Static)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.Batched)
+        self.view.setBatchSize(MediaLibraryModel.BATCH_SIZE)
+        self.view.setIconSize(GRID_THUMBNAIL_SIZE)
+        self.view.setGridSize(QSize(GRID_THUMBNAIL_SIZE.width() + 20, GRID_THUMBNAIL_SIZE.height() + 40))
+        self.view.setTextElideMode(Qt.ElideMiddle)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setModel(self.model)
+        self.view.doubleClicked.connect(self.select_index)
+        # 快速滚动时丢弃已经滚出视图的缩略图任务，之后重绘时只请求可见条目
+        self.view.verticalScrollBar().valueChanged.connect(self.library.cancel_thumbnails)
+
+        # 底部按钮
+        bottom_layout = QHBoxLayout()
+        use_button = QPushButton("使用")
+        use_button.clicked.connect(lambda: self.select_index(self.view.currentIndex()))
+        cancel_button = QPushButton("取消")
+        cancel_button.clicked.connect(self.reject)
+        bottom_layout.addStretch()
+        bottom_layout.addWidget(cancel_button)
+        bottom_layout.addWidget(use_button)
+
+        layout.addLayout(top_layout)
+        layout.addWidget(self.view)
+        layout.addLayout(bottom_layout)
+
+        self.update_folder_label()
+
+    def update_folder_label(self):
+        folders = self.library.folders
+        if folders:
+            self.folder_label.setText(f"{len(folders)} 个文件夹")
+            self.folder_label.setToolTip('\n'.join(folders))
+        else:
+            self.folder_label.setText("还没有添加文件夹")
+            self.folder_label.setToolTip("")
+
+    def add_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "添加媒体文件夹")
+        if not folder:
+            return
+        folders = list(self.config.get('media_library.folders', []) or [])
+        if folder not in folders:
+            folders.append(folder)
+            self.config.set('media_library.folders', folders)
+            self.library.set_folders(folders)
+        self.update_folder_label()
+
+    def select_index(self, index):
+        if not index.isValid():
+            return
+        self.media_selected.emit(
+            index.data(MediaLibraryModel.PathRole),
+            index.data(MediaLibraryModel.KindRole)
+        )
+        self.accept()
@@ -0,0 +1,62 @@
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+from widgets.countdown_window import CountdownWindow
+import time
+
+
+class OverlayManager(QObject):
+    """
+    屏幕浮层管理器
+    每个屏幕保留一个常驻的倒计时窗口，工作倒计时、休息提醒和休息剩余时间
+    都在同一个窗口中切换模式，周期切换时不再创建新的原生窗口
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.windows = {}
+        self.mode = None
+        self.warning_seconds = 0
+        self.deadline = None
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+
+    def window_for(self, screen):
+        """获取屏幕对应的浮层窗口，第一次使用时创建"""
+        window = self.windows.get(screen)
+        if window is None:
+            window = CountdownWindow(screen)
+            self.windows[screen] = window
+        return window
+
+    def show_countdown(self, mode, remaining_seconds, warning_seconds=0):
+        """在所有屏幕上显示倒计时"""
+        self.mode = mode
+        self.warning_seconds = warning_seconds
+        self.deadline = time.monotonic() + remaining_seconds
+        for screen in QApplication.screens():
+            self.window_for(screen).start(mode, remaining_seconds, warning_seconds)
+
+    def hide(self):
+        """隐藏所有浮层"""
+        self.mode = None
+        self.deadline = None
+        for window in self.windows.values():
+            window.stop()
+
+    def reload_style(self):
+        """倒计时样式改变后刷新"""
+        for window in self.windows.values():
+            window.reload_style()
+
+    def on_screen_added(self, screen):
+        # 新屏幕与已有浮层保持同一个截止时间
+        if self.mode is not None:
+            remaining = self.deadline - time.monotonic()
+            self.window_for(screen).start(self.mode, remaining, self.warning_seconds)
+
+    def on_screen_removed(self, screen):
+        window = self.windows.pop(screen, None)
+        if window is not None:
+            window.stop()
+            window.deleteLater()
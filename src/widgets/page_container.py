@@ -2,65 +2,181 @@ from PySide6.QtWidgets import (
     QStackedWidget, QWidget, QVBoxLayout,
     QScrollArea, QFrame
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QPoint, QParallelAnimationGroup
-from widgets.control_panel import ControlPanel
+from PySide6.QtCore import (
+    Qt, QPropertyAnimation, QEasingCurve, QPoint, QParallelAnimationGroup, QTimer,
+    QVariantAnimation, QEvent
+)
+from PySide6.QtGui import QPainter
+from utils.config import Config
+from utils.perf import FrameStats
+import logging
+import time
+
+# 页面切换方式：snapshot 移动页面截图，live 直接移动真实页面
+TRANSITION_SNAPSHOT = 'snapshot'
+TRANSITION_LIVE = 'live'
 
 class PageContainer(QStackedWidget):
-    """页面容器"""
+    """
+    页面容器
+    页面以工厂函数注册，只有第一次切换到该页面时才创建内容，
+    启动时只需要创建当前显示的页面
+    """
+    PAGES = ('break', 'todo', 'notes', 'settings')
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.logger = logging.getLogger('PageContainer')
+        self.config = Config()
+        self.factories = {}
+        self.built = set()
+        self.prebuild_started = False
         self.init_pages()
         self.current_index = 0
         self.is_animating = False
+
+        self.duration = self.config.get('appearance.animation_duration', 250)
+        self.transition_mode = self.config.get('appearance.page_transition', TRANSITION_SNAPSHOT)
+        self.frame_stats = None
+        # live 模式下按这个页面的绘制统计帧间隔
+        self.measured_page = None
+        self.overlay = TransitionOverlay(self)
         
         # 初始化所有页面位置
         for i in range(self.count()):
             self.widget(i).move(0, 0)
+
+        # 只创建默认显示的页面
+        self.ensure_page(0)
     
     def init_pages(self):
-        # 休息提醒页面
-        break_page = QWidget()
-        break_layout = QVBoxLayout(break_page)
-        break_layout.setContentsMargins(20, 0, 20, 20)
-        
+        self.register_page('break', self.create_break_page)
+        for page_id in self.PAGES[1:]:
+            self.register_page(page_id, self.create_empty_page)
+
+    def register_page(self, page_id, factory):
+        """注册页面，先放入空的占位页面，内容由 factory 在第一次显示时创建"""
+        page = QWidget()
+        page.setObjectName(page_id)
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(20, 0, 20, 20)
+        self.factories[self.addWidget(page)] = factory
+
+    def index_of(self, page_id):
+        """根据页面 ID 获取索引，未知 ID 返回第一个页面"""
+        page = self.findChild(QWidget, page_id)
+        index = self.indexOf(page) if page is not None else -1
+        return index if index >= 0 else 0
+
+    def ensure_page(self, index):
+        """确保页面内容已经创建"""
+        if index in self.built or index not in self.factories:
+            return
+        self.built.add(index)
+        started = time.perf_counter()
+        self.widget(index).layout().addWidget(self.factories[index]())
+        self.logger.debug(
+            f'Built page {self.widget(index).objectName()} '
+            f'in {(time.perf_counter() - started) * 1000:.1f} ms'
+        )
+
+    def create_break_page(self):
+        """休息提醒页面"""
         # 使用滚动区域包装 ControlPanel
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QFrame.NoFrame)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
+        from widgets.control_panel import ControlPanel
         control_panel = ControlPanel()
         control_panel.setMinimumHeight(400)
         control_panel.setMaximumHeight(800)
         
         scroll_area.setWidget(control_panel)
-        break_layout.addWidget(scroll_area)
-        
-        self.addWidget(break_page)
-        
-        # 其他页面保持类似的布局结构
-        for page_name in ['todo', 'notes', 'settings']:
-            page = QWidget()
-            layout = QVBoxLayout(page)
-            layout.setContentsMargins(20, 0, 20, 20)
-            
-            content = QWidget()
-            content.setMinimumHeight(400)
-            content.setMaximumHeight(800)
-            
-            layout.addWidget(content)
-            self.addWidget(page) 
+        return scroll_area
+
+    def create_empty_page(self):
+        """其他页面保持类似的布局结构"""
+        content = QWidget()
+        content.setMinimumHeight(400)
+        content.setMaximumHeight(800)
+        return content
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 第一次绘制完成后再开始预创建，不影响首屏显示
+        if not self.prebuild_started and self.config.get('window.prebuild_pages', True):
+            self.prebuild_started = True
+            QTimer.singleShot(0, self.prebuild_next)
+
+    def prebuild_next(self):
+        """空闲时每次创建一个页面，避免长时间阻塞事件循环"""
+        for index in sorted(self.factories):
+            if index not in self.built:
+                self.ensure_page(index)
+                QTimer.singleShot(0, self.prebuild_next)
+                return
     
     def setCurrentIndex(self, index):
         """重写切换页面方法，添加动画"""
         if self.current_index == index or self.is_animating:
             return
-            
+
+        self.ensure_page(index)
         self.is_animating = True
         
         # 获取页面移动方向
         direction = 1 if index > self.current_index else -1
-        
+
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen is not None else 60
+        self.frame_stats = FrameStats(
+            f'page transition ({self.transition_mode})', 1000 / (refresh_rate or 60)
+        )
+        if self.transition_mode == TRANSITION_LIVE:
+            self.animate_live(index, direction)
+        else:
+            self.animate_snapshot(index, direction)
+
+    def animate_snapshot(self, index, direction):
+        """把两个页面各截图一次，在浮层上移动截图，结束后再切换到真实页面"""
+        current_page = self.widget(self.current_index)
+        next_page = self.widget(index)
+
+        # 未显示过的页面先按容器大小完成布局再截图
+        next_page.setGeometry(self.rect())
+        if next_page.layout() is not None:
+            next_page.layout().activate()
+
+        self.overlay.setGeometry(self.rect())
+        # 帧间隔按浮层实际绘制的时间统计，而不是动画定时器的触发时间
+        self.overlay.frame_stats = self.frame_stats
+        self.overlay.start(current_page.grab(), next_page.grab(), direction)
+        self.overlay.show()
+        self.overlay.raise_()
+        # 动画期间只绘制浮层，真实页面不参与重绘
+        current_page.hide()
+
+        animation = QVariantAnimation(self)
+        animation.setStartValue(0.0)
+        animation.setEndValue(1.0)
+        animation.setDuration(self.duration)
+        animation.setEasingCurve(QEasingCurve.InOutQuad)
+        animation.valueChanged.connect(self.overlay.set_progress)
+
+        def on_finished():
+            super(PageContainer, self).setCurrentIndex(index)
+            self.overlay.hide()
+            self.overlay.clear()
+            self.finish_transition(index)
+            animation.deleteLater()
+
+        animation.finished.connect(on_finished)
+        animation.start()
+
+    def animate_live(self, index, direction):
+        """直接移动两个页面（每帧都会重新绘制真实页面，用于对比）"""
         # 获取当前页面和目标页面
         next_page = self.widget(index)
         current_page = self.widget(self.current_index)
@@ -74,27 +190,26 @@ class PageContainer(QStackedWidget):
         # 准备动画
         next_page.show()
         next_page.raise_()
+        self.measured_page = next_page
+        next_page.installEventFilter(self)
         offset = self.width() * direction
         next_page.move(offset, 0)
         
         # 创建动画组
         anim_group = QParallelAnimationGroup(self)
         
-        # 设置动画参数
-        duration = 250  # 稍微加快动画速度
-        
         # 当前页面动画
         current_anim = QPropertyAnimation(current_page, b"pos", self)
         current_anim.setStartValue(current_page.pos())
         current_anim.setEndValue(QPoint(-offset, 0))
-        current_anim.setDuration(duration)
+        current_anim.setDuration(self.duration)
         current_anim.setEasingCurve(QEasingCurve.InOutQuad)  # 更平滑的缓动
         
         # 下一页动画
         next_anim = QPropertyAnimation(next_page, b"pos", self)
         next_anim.setStartValue(QPoint(offset, 0))
         next_anim.setEndValue(QPoint(0, 0))
-        next_anim.setDuration(duration)
+        next_anim.setDuration(self.duration)
         next_anim.setEasingCurve(QEasingCurve.InOutQuad)  # 更平滑的缓动
         
         # 添加动画到组
@@ -103,14 +218,65 @@ class PageContainer(QStackedWidget):
         
         # 动画完成后的处理
         def on_finished():
-            self.is_animating = False
-            self.current_index = index
             # 重置其他页面
             for i in range(self.count()):
                 page = self.widget(i)
                 if page not in [current_page, next_page]:
                     page.move(0, 0)
+            next_page.removeEventFilter(self)
+            self.measured_page = None
             super(PageContainer, self).setCurrentIndex(index)
+            self.finish_transition(index)
         
         anim_group.finished.connect(on_finished)
-        anim_group.start() 
\ No newline at end of file
+        anim_group.start()
+
+    def eventFilter(self, obj, event):
+        if obj is self.measured_page and event.type() == QEvent.Paint:
+            self.frame_stats.tick()
+        return super().eventFilter(obj, event)
+
+    def finish_transition(self, index):
+        self.is_animating = False
+        self.current_index = index
+        self.logger.debug(self.frame_stats.summary())
+
+
+class TransitionOverlay(QWidget):
+    """页面切换浮层，只绘制两张页面截图"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current = None
+        self.next = None
+        self.direction = 1
+        self.progress = 0.0
+        # 切换期间由 PageContainer 设置，每次绘制记录一帧
+        self.frame_stats = None
+        self.hide()
+
+    def start(self, current, next_pixmap, direction):
+        self.current = current
+        self.next = next_pixmap
+        self.direction = direction
+        self.progress = 0.0
+        self.update()
+
+    def clear(self):
+        self.current = None
+        self.next = None
+        self.frame_stats = None
+
+    def set_progress(self, progress):
+        self.progress = progress
+        self.update()
+
+    def paintEvent(self, event):
+        if self.current is None or self.next is None:
+            return
+        if self.frame_stats is not None:
+            self.frame_stats.tick()
+        offset = round(self.width() * self.direction * self.progress)
+        painter = QPainter(self)
+        painter.drawPixmap(-offset, 0, self.current)
+        painter.drawPixmap(self.width() * self.direction - offset, 0, self.next)
+        painter.end()
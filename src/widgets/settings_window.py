@@ -4,12 +4,28 @@ from PySide6.QtWidgets import (
     QSlider, QComboBox, QTabWidget
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QFont, QFontDatabase
+from PySide6.QtGui import QColor, QFont
 from utils.config import Config
 from utils.style import StyleManager
 import qtawesome as qta
 import os
 from widgets.markdown_viewer import MarkdownViewer
+from widgets.font_catalog import setup_font_combo, font_model
+
+# 找不到 README.md 时显示的说明
+DEFAULT_ABOUT = """# 休息提醒
+
+这是一个帮助您保持健康工作节奏的小工具。
+
+## 主要功能
+
+- 自定义工作和休息时间
+- 支持图片和视频屏保
+- 友好的提醒方式
+- 多屏幕支持
+
+详细说明文件未找到。请访问项目主页了解更多信息。
+"""
 
 class ColorButton(QPushButton):
     """颜色选择按钮"""
@@ -94,49 +110,12 @@ class SettingsWindow(QWidget):
         self.markdown_viewer = MarkdownViewer()
         about_layout.addWidget(self.markdown_viewer)
         
-        # 加载 README.md 内容
-        try:
-            # 尝试多个可能的路径
-            possible_paths = [
-                os.path.join(os.path.dirname(os.path.dirname(__file__)), 'README.md'),  # src 目录上层
-                os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'README.md'),  # 项目根目录
-                'README.md'  # 当前目录
-            ]
-            
-            # 尝试不同的编码
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16', 'ascii']
-            readme_content = None
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    for encoding in encodings:
-                        try:
-                            with open(path, 'r', encoding=encoding) as f:
-                                readme_content = f.read()
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    if readme_content:
-                        break
-            
-            if readme_content:
-                self.markdown_viewer.set_markdown(readme_content)
-            else:
-                self.markdown_viewer.set_markdown("""# 休息提醒
-
-这是一个帮助您保持健康工作节奏的小工具。
-
-## 主要功能
-
-- 自定义工作和休息时间
-- 支持图片和视频屏保
-- 友好的提醒方式
-- 多屏幕支持
-
-详细说明文件未找到。请访问项目主页了解更多信息。
-""")
-        except Exception as e:
-            self.markdown_viewer.set_markdown(f"# 错误\n\n加载项目说明失败：{str(e)}")
+        # README 在关于页第一次显示时才在后台读取和渲染
+        self.markdown_viewer.set_markdown_file([
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'README.md'),  # src 目录上层
+            os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'README.md'),  # 项目根目录
+            'README.md'  # 当前目录
+        ], fallback=DEFAULT_ABOUT)
         
         # 添加标签页
         tab_widget.addTab(settings_tab, "设置")
@@ -177,36 +156,8 @@ class SettingsWindow(QWidget):
         self.font_family_combo = QComboBox()
         self.font_family_combo.setFixedWidth(200)
         
-        # 获取系统字体列表
-        font_db = QFontDatabase()
-        font_families = font_db.families()
-        
-        # 添加常用字体到前面
-        preferred_fonts = [
-            "SF Pro Display",
-            "Microsoft YaHei",
-            "Arial",
-            "Helvetica Neue",
-            "PingFang SC",
-            "-apple-system"
-        ]
-        
-        added_fonts = set()
-        
-        # 首先添加首选字体
-        for font in preferred_fonts:
-            if font in font_families and font not in added_fonts:
-                self.font_family_combo.addItem(font)
-                added_fonts.add(font)
-        
-        # 如果有首选字体被添加，添加分隔符
-        if added_fonts:
-            self.font_family_combo.insertSeparator(len(added_fonts))
-        
-        # 添加其他系统字体
-        for font in font_families:
-            if font not in added_fonts:
-                self.font_family_combo.addItem(font)
+        # 共享的字体列表模型，支持输入过滤
+        setup_font_combo(self.font_family_combo)
         
         self.font_family_combo.currentTextChanged.connect(self.preview_font)
         
@@ -362,6 +313,8 @@ class SettingsWindow(QWidget):
         index = self.font_family_combo.findText(font_family)
         if index >= 0:
             self.font_family_combo.setCurrentIndex(index)
+        else:
+            self.font_family_combo.setEditText(font_family)
         
         # 加载字体大小
         font_size = self.config.get('countdown.font_size', 48)
@@ -418,8 +371,10 @@ class SettingsWindow(QWidget):
     def save_settings(self):
         """保存设置"""
         try:
-            # 保存字体
-            self.config.set('countdown.font_family', self.font_family_combo.currentText())
+            # 保存字体（输入的名称不在字体列表中时保留原设置）
+            family = self.font_family_combo.currentText()
+            if family in font_model().stringList():
+                self.config.set('countdown.font_family', family)
             
             # 保存字体大小
             self.config.set('countdown.font_size', self.font_size_spin.value())
@@ -0,0 +1,134 @@
+from PySide6.QtWidgets import (
+    QWidget, QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+)
+from PySide6.QtCore import Qt, QRect, QRectF
+from PySide6.QtGui import QImage, QPainter, QPixmap, QColor
+import math
+
+
+class ShadowCache:
+    """
+    九宫格阴影缓存
+    每种 模糊半径/颜色/圆角/缩放比例 只模糊一次最小尺寸的圆角矩形，
+    绘制任意尺寸的阴影时拉伸四条边，不再需要离屏渲染和逐帧模糊
+    """
+    _cache = {}
+
+    @classmethod
+    def get(cls, blur_radius, color, corner_radius, dpr=1.0):
+        key = (blur_radius, color.rgba(), corner_radius, dpr)
+        if key not in cls._cache:
+            cls._cache[key] = cls(blur_radius, color, corner_radius, dpr)
+        return cls._cache[key]
+
+    def __init__(self, blur_radius, color, corner_radius, dpr):
+        # 模糊会向外扩展 blur_radius，九宫格的边距为扩展部分加圆角
+        self.padding = math.ceil(blur_radius)
+        self.margin = self.padding + corner_radius
+        size = self.margin * 2 + 1
+
+        source = QImage(
+            math.ceil(size * dpr), math.ceil(size * dpr), QImage.Format_ARGB32_Premultiplied
+        )
+        source.setDevicePixelRatio(dpr)
+        source.fill(Qt.transparent)
+        painter = QPainter(source)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        inner = size - self.padding * 2
+        painter.drawRoundedRect(self.padding, self.padding, inner, inner, corner_radius, corner_radius)
+        painter.end()
+
+        self.pixmap = self._blur(source, blur_radius * dpr) if blur_radius > 0 \
+            else QPixmap.fromImage(source)
+        self.pixmap.setDevicePixelRatio(dpr)
+        self.size = size
+
+    @staticmethod
+    def _blur(image, radius):
+        """用与 QGraphicsDropShadowEffect 相同的模糊算法处理一次"""
+        scene = QGraphicsScene()
+        item = QGraphicsPixmapItem(QPixmap.fromImage(image))
+        effect = QGraphicsBlurEffect()
+        effect.setBlurRadius(radius)
+        item.setGraphicsEffect(effect)
+        scene.addItem(item)
+
+        result = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+        result.fill(Qt.transparent)
+        painter = QPainter(result)
+        bounds = QRectF(0, 0, image.width(), image.height())
+        scene.render(painter, bounds, bounds)
+        painter.end()
+        return QPixmap.fromImage(result)
+
+    def paint(self, painter, rect):
+        """在 rect（不含阴影扩展部分）周围绘制阴影，中间部分会被内容覆盖，不绘制"""
+        outer = rect.adjusted(-self.padding, -self.padding, self.padding, self.padding)
+        m = self.margin
+        if outer.width() < m * 2 or outer.height() < m * 2:
+            return
+
+        dpr = self.pixmap.devicePixelRatio()
+        # 源图和目标的九宫格分割位置
+        src_cols = ((0, m), (m, 1), (m + 1, m))
+        src_rows = src_cols
+        dst_cols = (
+            (outer.left(), m),
+            (outer.left() + m, outer.width() - m * 2),
+            (outer.right() + 1 - m, m),
+        )
+        dst_rows = (
+            (outer.top(), m),
+            (outer.top() + m, outer.height() - m * 2),
+            (outer.bottom() + 1 - m, m),
+        )
+        for row in range(3):
+            for col in range(3):
+                if row == 1 and col == 1:
+                    continue
+                sx, sw = src_cols[col]
+                sy, sh = src_rows[row]
+                dx, dw = dst_cols[col]
+                dy, dh = dst_rows[row]
+                if dw <= 0 or dh <= 0:
+                    continue
+                painter.drawPixmap(
+                    QRect(dx, dy, dw, dh), self.pixmap,
+                    QRect(round(sx * dpr), round(sy * dpr), round(sw * dpr), round(sh * dpr))
+                )
+
+
+class ShadowContainer(QWidget):
+    """
+    带阴影的透明容器
+    在自身的 paintEvent 中为 content 绘制缓存的九宫格阴影，
+    content 的重绘（例如页面切换动画）不再触发阴影重新计算
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.content = None
+        self.set_shadow(0, QColor(Qt.transparent))
+
+    def set_content(self, widget):
+        self.content = widget
+        self.update()
+
+    def set_shadow(self, blur_radius, color, offset=(0, 0), corner_radius=0):
+        self.blur_radius = blur_radius
+        self.shadow_color = color
+        self.shadow_offset = tuple(offset)
+        self.corner_radius = corner_radius
+        self.update()
+
+    def paintEvent(self, event):
+        if self.content is None or not self.content.isVisible() or self.blur_radius <= 0:
+            return
+        shadow = ShadowCache.get(
+            self.blur_radius, self.shadow_color, self.corner_radius, self.devicePixelRatioF()
+        )
+        rect = self.content.geometry().translated(*self.shadow_offset)
+        painter = QPainter(self)
+        shadow.paint(painter, rect)
+        painter.end()
@@ -0,0 +1,50 @@
+from PySide6.QtWidgets import QSystemTrayIcon, QMenu
+from PySide6.QtCore import Signal
+import qtawesome as qta
+
+
+class TrayIcon(QSystemTrayIcon):
+    """
+    系统托盘图标
+    由 Application 持有，不依赖主窗口，仅托盘启动时主窗口在第一次打开时才创建
+    """
+    clicked = Signal()
+    showRequested = Signal()
+    toggleRequested = Signal()
+    settingsRequested = Signal()
+    quitRequested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setIcon(qta.icon('fa5s.clock', color='#333333'))
+        self.setToolTip('休息提醒')
+
+        # 创建托盘菜单
+        self.menu = QMenu()
+        show_action = self.menu.addAction("显示")
+        show_action.triggered.connect(self.showRequested)
+
+        self.toggle_action = self.menu.addAction("开始专注")
+        self.toggle_action.triggered.connect(self.toggleRequested)
+
+        settings_action = self.menu.addAction("设置")
+        settings_action.triggered.connect(self.settingsRequested)
+
+        self.menu.addSeparator()
+
+        quit_action = self.menu.addAction("退出")
+        quit_action.triggered.connect(self.quitRequested)
+
+        self.setContextMenu(self.menu)
+
+        # 连接托盘图标的点击事件
+        self.activated.connect(self.on_activated)
+
+    def on_activated(self, reason):
+        """单击托盘图标"""
+        if reason == QSystemTrayIcon.ActivationReason.Trigger:
+            self.clicked.emit()
+
+    def set_running(self, running):
+        """更新菜单中开始/停止的文字"""
+        self.toggle_action.setText("停止专注" if running else "开始专注")
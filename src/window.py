@@ -1,22 +1,24 @@
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QSpacerItem, QSizePolicy,
-    QGraphicsDropShadowEffect, QGroupBox, QRadioButton,
+    QGroupBox, QRadioButton,
     QFileDialog, QInputDialog, QGraphicsOpacityEffect,
     QSystemTrayIcon, QMenu, QApplication
 )
-from PySide6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QSize, QTimer, QEvent
+from PySide6.QtCore import Qt, QPoint, QRect, QPropertyAnimation, QEasingCurve, QSize, QTimer, QEvent
 from PySide6.QtGui import QFont, QMouseEvent, QColor, QPixmap, QPainter, QBrush
 import qtawesome as qta
 from screensaver.manager import ScreenSaverManager
-from utils.style import StyleManager
+from utils.style import StyleManager, parse_color
 from utils.config import Config
 import os
 from PySide6.QtCore import Signal
 from widgets.countdown_window import CountdownWindow
 from widgets.sidebar import Sidebar
 from widgets.page_container import PageContainer
+from widgets.shadow import ShadowContainer
 from widgets.control_panel import ControlPanel
+from utils.perf import startup_timer
 
 class CustomButton(QPushButton):
     """macOS 风格按钮"""
@@ -188,7 +190,7 @@ class TitleBar(QWidget):
     def minimize_to_tray(self):
         """最小化到托盘"""
         self.parent.hide()
-        self.parent.tray_icon.showMessage(
+        self.parent.show_tray_message(
             "休息提醒",
             "应用程序已最小化到系统托盘",
             QSystemTrayIcon.Information,
@@ -197,18 +199,91 @@ class TitleBar(QWidget):
     
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            self.parent.drag_position = event.globalPos() - self.parent.pos()
+            # 交给窗口管理器移动窗口，拖动过程中不再执行 Python 代码
+            handle = self.parent.windowHandle()
+            if handle is None or not handle.startSystemMove():
+                # 平台不支持时退回到手动移动
+                self.parent.drag_position = event.globalPos() - self.parent.pos()
             event.accept()
             
     def mouseMoveEvent(self, event):
-        if event.buttons() & Qt.LeftButton:
+        if event.buttons() & Qt.LeftButton and self.parent.drag_position is not None:
             self.parent.move(event.globalPos() - self.parent.drag_position)
             event.accept()
 
+    def mouseReleaseEvent(self, event):
+        self.parent.drag_position = None
+        super().mouseReleaseEvent(event)
+
+
+class EdgeGrip(QWidget):
+    """窗口边缘的调整大小区域，按下时交给窗口管理器调整大小"""
+    CURSORS = {
+        Qt.LeftEdge: Qt.SizeHorCursor,
+        Qt.RightEdge: Qt.SizeHorCursor,
+        Qt.TopEdge: Qt.SizeVerCursor,
+        Qt.BottomEdge: Qt.SizeVerCursor,
+        Qt.LeftEdge | Qt.TopEdge: Qt.SizeFDiagCursor,
+        Qt.RightEdge | Qt.BottomEdge: Qt.SizeFDiagCursor,
+        Qt.RightEdge | Qt.TopEdge: Qt.SizeBDiagCursor,
+        Qt.LeftEdge | Qt.BottomEdge: Qt.SizeBDiagCursor,
+    }
+
+    def __init__(self, edges, parent=None):
+        super().__init__(parent)
+        self.edges = edges
+        # 平台不支持系统调整大小时，手动调整的起点（鼠标位置, 窗口几何）
+        self.resize_origin = None
+        self.setCursor(self.CURSORS[edges])
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            window = self.window()
+            handle = window.windowHandle()
+            if handle is None or not handle.startSystemResize(self.edges):
+                # 平台不支持时（部分 X11 窗口管理器、offscreen）退回到手动调整大小
+                self.resize_origin = (event.globalPos(), window.geometry())
+            event.accept()
+
+    def mouseMoveEvent(self, event):
+        if not event.buttons() & Qt.LeftButton or self.resize_origin is None:
+            return
+        window = self.window()
+        start, rect = self.resize_origin
+        delta = event.globalPos() - start
+        left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+        min_size, max_size = window.minimumSize(), window.maximumSize()
+
+        # 左/上边移动时保持对边不动，宽高限制在窗口的尺寸范围内
+        if self.edges & Qt.LeftEdge:
+            width = min(max(rect.width() - delta.x(), min_size.width()), max_size.width())
+            left = right - width + 1
+        elif self.edges & Qt.RightEdge:
+            width = min(max(rect.width() + delta.x(), min_size.width()), max_size.width())
+            right = left + width - 1
+        if self.edges & Qt.TopEdge:
+            height = min(max(rect.height() - delta.y(), min_size.height()), max_size.height())
+            top = bottom - height + 1
+        elif self.edges & Qt.BottomEdge:
+            height = min(max(rect.height() + delta.y(), min_size.height()), max_size.height())
+            bottom = top + height - 1
+        window.setGeometry(QRect(QPoint(left, top), QPoint(right, bottom)))
+        event.accept()
+
+    def mouseReleaseEvent(self, event):
+        self.resize_origin = None
+        super().mouseReleaseEvent(event)
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # 窗口边缘可以调整大小的宽度（位于内容外的透明边距中）
+    GRIP_SIZE = 8
+
+    def __init__(self, tray_icon=None):
         super().__init__()
         self.drag_position = None
+        # 托盘图标由 Application 持有，主窗口只用来显示通知
+        self.tray_icon = tray_icon
+        self.settings_window = None
         self.style_manager = StyleManager()
         
         # 设置窗口尺寸范围
@@ -227,8 +302,9 @@ class MainWindow(QMainWindow):
         self.setAttribute(Qt.WA_TranslucentBackground)
         
         # 初始化UI
-        self.init_ui()
-        self.setSizeGripEnabled(True)
+        with startup_timer().phase('main_window.init_ui'):
+            self.init_ui()
+        self.init_grips()
         self.center_window()
         
         # 添加关闭标志
@@ -240,11 +316,6 @@ class MainWindow(QMainWindow):
         self.show_animation.setEndValue(1)
         self.show_animation.setEasingCurve(QEasingCurve.OutCubic)
         
-        # 添加系统托盘相关属性
-        self.tray_icon = None
-        self.tray_menu = None
-        self.init_tray()
-        
         # 设置窗口接收键盘焦点
         self.setFocusPolicy(Qt.StrongFocus)
         self.setAttribute(Qt.WA_KeyboardFocusChange)
@@ -255,8 +326,8 @@ class MainWindow(QMainWindow):
         self.is_fullscreen_mode = False
         
     def init_ui(self):
-        # 创建主容器
-        self.container = QWidget()
+        # 创建主容器（在透明边距中绘制内容窗口的阴影）
+        self.container = ShadowContainer()
         self.setCentralWidget(self.container)
         
         # 创建内容窗口.
@@ -297,66 +368,32 @@ class MainWindow(QMainWindow):
         # 应用样式
         self.setStyleSheet(self.style_manager.get_style('main_window'))
         
-        # 添加阴影
-        shadow = QGraphicsDropShadowEffect(self)
+        # 添加阴影（缓存的九宫格阴影，内容重绘时不再重新模糊）
         shadow_config = self.style_manager.get_global_config('shadow', {})
-        shadow.setBlurRadius(shadow_config.get('blur_radius', 20))
-        shadow.setColor(QColor(shadow_config.get('color', 'rgba(0, 0, 0, 0.1)')))
-        offset = shadow_config.get('offset', [0, 4])
-        shadow.setOffset(offset[0], offset[1])
-        self.window_content.setGraphicsEffect(shadow)
-        
-        # 添加系统托盘相关属性
-        self.tray_icon = None
-        self.tray_menu = None
-        self.init_tray()
-        
-    def init_tray(self):
-        """初始化系统托盘"""
-        # 创建托盘图标
-        self.tray_icon = QSystemTrayIcon(self)
-        icon = qta.icon('fa5s.clock', color='#333333')
-        self.tray_icon.setIcon(icon)
-        self.tray_icon.setToolTip('休息提醒')
-        
-        # 创建托盘菜单
-        self.tray_menu = QMenu()
-        show_action = self.tray_menu.addAction("显示")
-        show_action.triggered.connect(self.show_from_tray)
-        
-        settings_action = self.tray_menu.addAction("设置")
-        settings_action.triggered.connect(self.show_settings)
-        
-        self.tray_menu.addSeparator()
-        
-        quit_action = self.tray_menu.addAction("退出")
-        quit_action.triggered.connect(self.quit_application)
-        
-        self.tray_icon.setContextMenu(self.tray_menu)
-        
-        # 连接托盘图标的点击事件
-        self.tray_icon.activated.connect(self.on_tray_icon_activated)
-        self.tray_icon.show()
+        self.container.set_content(self.window_content)
+        self.container.set_shadow(
+            shadow_config.get('blur_radius', 20),
+            parse_color(shadow_config.get('color', 'rgba(0, 0, 0, 0.1)')),
+            offset=shadow_config.get('offset', [0, 4]),
+            corner_radius=self.style_manager.get_global_config('border_radius', 8)
+        )
         
     def show_from_tray(self):
         """从托盘显示窗口"""
         self.show()
         self.activateWindow()
         
+    def show_tray_message(self, title, message, icon, timeout):
+        """通过托盘图标显示通知"""
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage(title, message, icon, timeout)
+        
     def quit_application(self):
         """退出应用程序"""
         self.can_close = True
         self.close()
         QApplication.quit()
         
-    def on_tray_icon_activated(self, reason):
-        """处理托盘图标的激活事件"""
-        if reason == QSystemTrayIcon.ActivationReason.Trigger:
-            if self.isVisible():
-                self.hide()
-            else:
-                self.show_from_tray()
-        
     def showEvent(self, event):
         super().showEvent(event)
         # self.show_animation.start()  # 注释掉动画启动
@@ -377,10 +414,16 @@ class MainWindow(QMainWindow):
         self.show()  # 显示主窗口 
         
     def show_settings(self):
-        """显示设置窗口"""
-        from widgets.settings_window import SettingsWindow
-        settings = SettingsWindow(self)
-        settings.show()
+        """显示设置窗口（只创建一次，之后重新显示）"""
+        if self.settings_window is None:
+            from widgets.settings_window import SettingsWindow
+            self.settings_window = SettingsWindow(self)
+        else:
+            # 丢弃上次未保存的修改
+            self.settings_window.load_settings()
+        self.settings_window.show()
+        self.settings_window.raise_()
+        self.settings_window.activateWindow()
     
     def closeEvent(self, event):
         """处理窗口关闭事件"""
@@ -392,24 +435,41 @@ class MainWindow(QMainWindow):
     
     def on_page_changed(self, page_id):
         """处理页面切换"""
-        page_index = {
-            'break': 0,
-            'todo': 1,
-            'notes': 2,
-            'settings': 3
-        }.get(page_id, 0)
-        
-        self.page_container.setCurrentIndex(page_index)
-    
-    def setSizeGripEnabled(self, enabled):
-        """启用大小调整"""
-        if enabled:
-            self.setMouseTracking(True)
-            self.centralWidget().setMouseTracking(True)
-        else:
-            self.setMouseTracking(False)
-            self.centralWidget().setMouseTracking(False)
+        # 页面在第一次切换到时才创建
+        self.page_container.setCurrentIndex(self.page_container.index_of(page_id))
     
+    def init_grips(self):
+        """在窗口四边和四角放置调整大小的区域"""
+        edges = [
+            Qt.LeftEdge, Qt.RightEdge, Qt.TopEdge, Qt.BottomEdge,
+            Qt.LeftEdge | Qt.TopEdge, Qt.RightEdge | Qt.TopEdge,
+            Qt.LeftEdge | Qt.BottomEdge, Qt.RightEdge | Qt.BottomEdge,
+        ]
+        self.grips = [EdgeGrip(edge, self) for edge in edges]
+        self.layout_grips()
+
+    def layout_grips(self):
+        """按窗口大小摆放调整区域（只在窗口大小改变时执行）"""
+        size = self.GRIP_SIZE
+        w, h = self.width(), self.height()
+        rects = {
+            Qt.LeftEdge: QRect(0, size, size, h - size * 2),
+            Qt.RightEdge: QRect(w - size, size, size, h - size * 2),
+            Qt.TopEdge: QRect(size, 0, w - size * 2, size),
+            Qt.BottomEdge: QRect(size, h - size, w - size * 2, size),
+            Qt.LeftEdge | Qt.TopEdge: QRect(0, 0, size, size),
+            Qt.RightEdge | Qt.TopEdge: QRect(w - size, 0, size, size),
+            Qt.LeftEdge | Qt.BottomEdge: QRect(0, h - size, size, size),
+            Qt.RightEdge | Qt.BottomEdge: QRect(w - size, h - size, size, size),
+        }
+        for grip in self.grips:
+            grip.setGeometry(rects[grip.edges])
+            grip.raise_()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.layout_grips()
+
     def mousePressEvent(self, event):
         """处理鼠标按下事件"""
         if self.is_fullscreen_mode:
@@ -438,75 +498,6 @@ class MainWindow(QMainWindow):
         else:
             super().mouseDoubleClickEvent(event)
     
-    def is_resize_area(self, pos):
-        """判断是否在调整区域"""
-        margin = 5
-        # 获取窗口内容的几何信息
-        content_rect = self.window_content.geometry()
-        
-        # 检查是否在边框区域
-        return (
-            pos.x() <= content_rect.left() + margin or 
-            pos.x() >= content_rect.right() - margin or
-            pos.y() <= content_rect.top() + margin or
-            pos.y() >= content_rect.bottom() - margin
-        )
-    
-    def get_resize_mode(self, pos):
-        """获取调整模式"""
-        margin = 5
-        content_rect = self.window_content.geometry()
-        
-        # 返回调整方向
-        if pos.x() <= content_rect.left() + margin:
-            return 'left'
-        elif pos.x() >= content_rect.right() - margin:
-            return 'right'
-        elif pos.y() <= content_rect.top() + margin:
-            return 'top'
-        else:
-            return 'bottom'
-    
-    def get_resize_cursor(self, pos):
-        """获取调整光标"""
-        if not self.is_resize_area(pos):
-            return Qt.ArrowCursor
-            
-        mode = self.get_resize_mode(pos)
-        if mode in ['left', 'right']:
-            return Qt.SizeHorCursor
-        else:
-            return Qt.SizeVerCursor
-    
-    def do_resize(self, global_pos):
-        """执行大小调整"""
-        if not hasattr(self, 'resize_mode'):
-            return
-            
-        rect = self.geometry()
-        delta = global_pos - rect.topLeft()
-        
-        if self.resize_mode == 'right':
-            width = max(self.minimumWidth(), delta.x())
-            self.resize(width, rect.height())
-        elif self.resize_mode == 'bottom':
-            height = max(self.minimumHeight(), delta.y())
-            self.resize(rect.width(), height)
-        elif self.resize_mode == 'left':
-            width = max(self.minimumWidth(), rect.right() - global_pos.x())
-            self.resize(width, rect.height())
-            self.move(global_pos.x(), rect.y())
-        elif self.resize_mode == 'top':
-            height = max(self.minimumHeight(), rect.bottom() - global_pos.y())
-            self.resize(rect.width(), height)
-            self.move(rect.x(), global_pos.y())
-    
-    def leaveEvent(self, event):
-        """处理鼠标离开窗口事件"""
-        if not hasattr(self, 'resize_mode'):  # 如果不在调整大小状态
-            self.setCursor(Qt.ArrowCursor)
-        super().leaveEvent(event)
-    
     def changeEvent(self, event):
         """处理窗口状态改变事件"""
         if event.type() == QEvent.Type.WindowStateChange:
@@ -514,7 +505,7 @@ class MainWindow(QMainWindow):
                 event.accept()
                 self.hide()  # 最小化时隐藏窗口
                 # 可选：显示托盘通知
-                self.tray_icon.showMessage(
+                self.show_tray_message(
                     "休息提醒",
                     "应用程序已最小化到系统托盘",
                     QSystemTrayIcon.Information,
@@ -551,6 +542,8 @@ class MainWindow(QMainWindow):
     def set_fullscreen_mode(self, enabled=True):
         """设置全屏模式"""
         self.is_fullscreen_mode = enabled
+        for grip in self.grips:
+            grip.setVisible(not enabled)
         if enabled:
             # 设置全屏且阻止其他窗口交互的标志
             self.setWindowFlags(
@@ -0,0 +1,102 @@
+"""
+启动导入耗时检查
+
+用 `python -X importtime` 导入主窗口模块，解析每个模块的累计耗时：
+- 启动时不允许导入的重型模块（cv2、numpy、markdown、QtMultimedia）被导入时失败
+- 总导入耗时超过预算时失败
+
+用法:
+    python tools/import_budget.py [--budget-ms 800] [--module window]
+"""
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# 只允许在第一次使用时导入的模块
+FORBIDDEN_AT_STARTUP = (
+    'cv2',
+    'numpy',
+    'markdown',
+    'PySide6.QtMultimedia',
+    'PySide6.QtMultimediaWidgets',
+)
+
+DEFAULT_BUDGET_MS = 800
+
+
+def parse_importtime(output):
+    """解析 -X importtime 的输出
+
+    Returns:
+        dict: 模块名 -> (自身耗时 us, 累计耗时 us, 缩进层级)
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, raw_name = fields
+        name = raw_name.rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), level)
+    return modules
+
+
+def measure(module='window'):
+    """在子进程中导入模块并返回解析后的耗时"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    return parse_importtime(result.stderr)
+
+
+def check(module='window', budget_ms=DEFAULT_BUDGET_MS):
+    """检查导入耗时，返回错误信息列表"""
+    modules = measure(module)
+    errors = []
+
+    for name in FORBIDDEN_AT_STARTUP:
+        if name in modules:
+            errors.append(f'{name} is imported at startup ({modules[name][1] / 1000:.1f} ms)')
+
+    total_ms = sum(cumulative for _, cumulative, level in modules.values() if level == 0) / 1000
+    if total_ms > budget_ms:
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:10]
+        details = '\n'.join(f'  {name}: {self_us / 1000:.1f} ms' for name, (self_us, _, _) in slowest)
+        errors.append(f'startup imports took {total_ms:.0f} ms (budget {budget_ms} ms)\n{details}')
+
+    print(f'import {module}: {total_ms:.0f} ms total, {len(modules)} modules')
+    return errors
+
+
+def main(argv):
+    budget_ms = DEFAULT_BUDGET_MS
+    module = 'window'
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--budget-ms' and args:
+            budget_ms = float(args.pop(0))
+        elif arg == '--module' and args:
+            module = args.pop(0)
+
+    errors = check(module, budget_ms)
+    for error in errors:
+        print(f'FAIL: {error}')
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))